@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible filter plugin for listing free space extents (gaps between partitions) on a disk
+"""
+
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.size_utils import Size
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import Disk
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
+
+DOCUMENTATION = r'''
+---
+name: disk_free_extents
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Return the largest free extents on a disk
+description:
+  - This filter inspects the current partition table (from parted) and returns the free gaps between partitions,
+    including the space before the first and after the last partition, largest first.
+  - With C(fill=true) each extent also carries a partition allocation (C(num), C(part_start), C(part_end))
+    that takes up the whole gap, aligned like the plan returned by C(validate_partitions) and expressed in sectors.
+options:
+  parted_info:
+    description:
+      - Dictionary with disk and partitions metadata from parted, typically collected via C(community.general.parted).
+    type: dict
+    required: true
+  count:
+    description:
+      - Maximum number of extents to return. All extents are returned if omitted.
+    type: int
+    required: false
+  min_size:
+    description:
+      - Extents not larger than this size (in MiB) are ignored. The default skips the alignment gap parted
+        leaves in front of the first partition.
+    type: float
+    required: false
+    default: 1.0
+  fill:
+    description:
+      - If true, add a "fill remaining space" partition allocation to every returned extent.
+        Partition numbers are assigned after the highest existing one, largest extent first.
+    type: bool
+    required: false
+    default: false
+seealso:
+  - name: validate_partitions
+    description: Validates and returns action plan for aligning partition layout
+    plugin: aursu.lvm_setup.validate_partitions
+'''
+
+EXAMPLES = r'''
+- name: Show the two largest gaps on the disk
+  debug:
+    msg: "{{ parted_info | aursu.lvm_setup.disk_free_extents(count=2) }}"
+
+- name: Allocate the largest gap as a new partition
+  set_fact:
+    fill_plan: "{{ (parted_info | aursu.lvm_setup.disk_free_extents(count=1, fill=true)) | first }}"
+'''
+
+RETURN = r'''
+_value:
+  description: List of free extents ordered by size (largest first), values in MiB
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - begin: 2048.0
+      end: 4096.0
+      size: 2048.0
+      num: 3
+      part_start: 4196352s
+      part_end: 100%
+'''
+
+@memoize()
+def disk_free_extents(parted_info, count=None, min_size=1.0, fill=False):
+    if count is not None and (not isinstance(count, int) or count < 0):
+        raise AnsibleFilterError(f"Expected 'count' to be a non-negative integer. Got: {count!r}")
+
+    state = Disk.from_parted(parted_info)
+    state.validate_size()
+
+    nums = state.sorted_parts()
+    next_num = nums[-1].num + 1 if nums else 1
+
+    table = state.table or "gpt"
+    disk_end = state.last_usable(table)
+
+    result = []
+    for begin, end in state.largest_free_extents(count, Size.from_mib(min_size)):
+        extent = {
+            "begin": begin.mib,
+            "end": end.mib,
+            "size": (end - begin).mib,
+        }
+        if fill:
+            # extents start at the last sector of the previous partition (or at the start of disk)
+            start = state.align_up(begin + state.sector if begin else state.first_usable(table))
+            extent.update({
+                "num": next_num,
+                "disk_label": table,
+                "part_start": state.to_sectors(start),
+                # extent reaching the end of disk is filled by parted itself
+                "part_end": "100%" if end >= disk_end else state.to_sectors(end - state.sector),
+            })
+            next_num += 1
+        result.append(extent)
+    return result
+
+class FilterModule(object):
+    def filters(self):
+        return {
+            "disk_free_extents": disk_free_extents,
+        }
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible filter plugin to list the block devices LVM scans
+"""
+
+from typing import Any, Optional
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_devices import scanned_devices
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
+
+DOCUMENTATION = r'''
+---
+name: lvm_scan_devices
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: List the block devices LVM scans
+description:
+  - This filter applies the LVM devices file and C(devices/global_filter) reported by C(lvm_devices) to the
+    block devices of the host and returns the devices LVM still scans, to verify that scanning is restricted
+    to the physical volumes.
+  - Devices are matched by name; LVM additionally matches devices file entries by device ID and the filter
+    against every symlink of a device.
+options:
+  lvm_devices:
+    description:
+      - Result of the C(aursu.lvm_setup.lvm_devices) module (C(use_devicesfile), C(devices), C(global_filter),
+        C(block_devices)).
+    type: dict
+    required: true
+  devices:
+    description:
+      - Device paths to check instead of the C(block_devices) of O(lvm_devices).
+    type: list
+    elements: str
+    required: false
+seealso:
+  - name: lvm_devices
+    description: Restricts LVM device scanning to the physical volumes
+    module: aursu.lvm_setup.lvm_devices
+'''
+
+EXAMPLES = r'''
+- name: Restrict LVM to the physical volumes
+  aursu.lvm_setup.lvm_devices:
+    paths: "{{ partitions | aursu.lvm_setup.partition_paths_system }}"
+  register: lvm_devices
+
+- name: Fail if LVM scans other devices
+  ansible.builtin.assert:
+    that: lvm_devices | aursu.lvm_setup.lvm_scan_devices | difference(lvm_devices.paths) | length == 0
+'''
+
+RETURN = r'''
+_value:
+  description: Device paths LVM scans, in the order of the given devices.
+  type: list
+  elements: str
+  returned: always
+'''
+
+@memoize()
+def lvm_scan_devices(lvm_devices: dict[str, Any], devices: Optional[list] = None) -> list[str]:
+    if not isinstance(lvm_devices, dict):
+        raise AnsibleFilterError("lvm_scan_devices expects the result of the lvm_devices module.")
+    if devices is None:
+        devices = lvm_devices.get("block_devices") or []
+    return scanned_devices(devices, lvm_devices)
+
+class FilterModule(object):
+    def filters(self):
+        return {
+            "lvm_scan_devices": lvm_scan_devices,
+        }
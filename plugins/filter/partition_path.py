@@ -8,6 +8,7 @@ Ansible filter plugin for generating full partition paths
 
 from typing import Any
 from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import Partition
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
 
 DOCUMENTATION = r'''
 ---
@@ -48,6 +49,7 @@ _value:
   returned: always
 '''
 
+@memoize()
 def partition_path(disk: str, part: dict[str, Any]) -> str:
     return Partition(part).path(disk)
 
@@ -7,6 +7,7 @@ Ansible filter plugin for generating partition paths for all partitions on a giv
 """
 
 from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import PartitionInput
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
 
 DOCUMENTATION = r'''
 ---
@@ -49,6 +50,7 @@ _value:
   returned: always
 '''
 
+@memoize()
 def partition_paths_system(partitions):
     return ",".join(PartitionInput(partitions).paths())
 
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible filter plugin to check whether a plan has nothing to do
+"""
+
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.plan_cache import all_skip
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
+
+DOCUMENTATION = r'''
+---
+name: plan_unchanged
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Check that every action of a plan is skip
+description:
+  - This filter returns C(true) if every action of the given plan is C(skip), i.e. the storage already matches
+    the requested state and the tasks applying the plan can be skipped.
+  - Accepts the output of C(validate_partitions), C(validate_partitions_system), C(validate_pvs),
+    C(validate_volume) and C(validate_volumes). An empty plan counts as unchanged.
+options:
+  plan:
+    description:
+      - Plan dictionary, list of plans, or dictionary mapping disks to lists of plans.
+    type: raw
+    required: true
+seealso:
+  - name: validate_partitions_system
+    description: Generates partition plans for all disks
+    plugin: aursu.lvm_setup.validate_partitions_system
+'''
+
+EXAMPLES = r'''
+- name: Create missing partitions on all disks
+  aursu.lvm_setup.partition_apply:
+    plans: "{{ validated_partitions }}"
+  when: not (validated_partitions | aursu.lvm_setup.plan_unchanged)
+'''
+
+RETURN = r'''
+_value:
+  description: True if all actions are C(skip)
+  type: bool
+  returned: always
+'''
+
+@memoize()
+def plan_unchanged(plan):
+    return all_skip(plan)
+
+class FilterModule(object):
+    def filters(self):
+        return {
+            "plan_unchanged": plan_unchanged,
+        }
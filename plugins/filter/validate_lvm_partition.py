@@ -26,6 +26,7 @@ options:
   info:
     description:
       - Dictionary with device metadata, typically collected via a custom Ansible module like C(aursu.general.dev_info).
+        May also be a map of device paths to device metadata, such as the result of C(aursu.lvm_setup.dev_probe).
     type: dict
     required: true
 seealso:
@@ -48,6 +49,7 @@ _value:
   returned: always
 '''
 
+# not memoized: called per path with the whole dev_info map, whose hash costs more than the lookup
 def validate_lvm_partition(path, info):
     """
     Validate if a partition is suitable for use as a physical volume.
@@ -59,7 +61,7 @@ def validate_lvm_partition(path, info):
     - Have blkid section
     - blkid.type must be absent or 'LVM2_member'
     """
-    return Device.from_dev_info(path, info).validate_lvm()
+    return Device.from_dev_info_lookup(path, info).validate_lvm()
 
 class FilterModule(object):
     def filters(self):
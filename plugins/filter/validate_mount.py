@@ -26,6 +26,7 @@ options:
   dev_info:
     description:
       - Dictionary of device metadata for the given volume path. Should include mount information.
+        May also be a map of device paths to device metadata, such as the result of C(aursu.lvm_setup.dev_probe).
     type: dict
     required: true
 seealso:
@@ -55,9 +56,10 @@ _value:
   returned: always
 '''
 
+# not memoized: called per path with the whole dev_info map, whose hash costs more than the lookup
 def validate_mount(lv, dev_info):
     volume = LogicalVolume(lv)
-    dev = Device.from_dev_info(volume.path, dev_info)
+    dev = Device.from_dev_info_lookup(volume.path, dev_info, (volume.dm_path,))
 
     if dev.is_exists and volume.validate():
         return dev.validate_mount(volume.mount)
@@ -7,6 +7,8 @@ Ansible filter plugin for validating and planning partition layout on a disk
 """
 
 from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import Disk
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.plan_cache import cached_plan
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
 
 DOCUMENTATION = r'''
 ---
@@ -18,6 +20,9 @@ description:
   - This filter compares the current partition table (from parted) with the desired layout and returns an action plan.
     It ensures all partitions are valid, optionally requiring that they already exist.
     It also supports setting the partition table label (e.g. C(gpt), C(msdos)) if not yet defined.
+  - New partitions are aligned to the least common multiple of 1 MiB, the physical sector size and the device
+    I/O hints (C(minimum_io_size), C(optimal_io_size)), shifted by C(alignment_offset), when these are present
+    in C(parted_info.disk). Their C(part_start) and C(part_end) are exact sector values (e.g. C(2048s)).
 options:
   parted_info:
     description:
@@ -42,6 +47,19 @@ options:
     type: bool
     required: false
     default: false
+  cache_dir:
+    description:
+      - Directory of the on-disk plan cache on the controller. The plan is stored under a fingerprint of all
+        other arguments (desired spec and storage state) and reused as long as they do not change.
+        No caching if not set.
+    type: str
+    required: false
+  cache_size:
+    description:
+      - Maximum number of plans kept in O(cache_dir); the least recently used plans are removed first.
+    type: int
+    required: false
+    default: 4096
 seealso:
   - name: validate_partitions_exist
     description: Asserts that all specified partitions already exist
@@ -66,8 +84,19 @@ _value:
   type: list
   elements: dict
   returned: always
+  sample:
+    - num: 1
+      status: ok
+      action: create
+      disk_label: gpt
+      part_start: 2048s
+      part_end: 2099199s
+      warning: ""
+      error: ""
 '''
 
+@memoize()
+@cached_plan("validate_partitions")
 def validate_partitions(parted_info, parts, default_label="gpt", require_existing=False):
     state = Disk.from_parted(parted_info)
 
@@ -7,6 +7,7 @@ Ansible filter plugin to verify that a list of disk partitions exists on a given
 """
 
 from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import Disk
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
 
 DOCUMENTATION = r'''
 ---
@@ -49,6 +50,7 @@ _value:
   returned: always
 '''
 
+@memoize()
 def validate_partitions_exist(parted_info, parts):
     state = Disk.from_parted(parted_info)
 
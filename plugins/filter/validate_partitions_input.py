@@ -7,6 +7,7 @@ Ansible filter plugin for validating the structure of the input partition defini
 """
 
 from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import PartitionInput
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
 
 DOCUMENTATION = r'''
 ---
@@ -17,6 +18,7 @@ short_description: Validate the structure of input partition definitions per dis
 description:
   - This filter checks the structural correctness of a partitions dictionary that maps disk names to lists of partitions.
     It validates types, uniqueness of partition numbers, and optionally allows or disallows numbering gaps.
+  - All disks are checked in a single pass. Every problem found is reported in one error message.
 options:
   partitions:
     description:
@@ -54,11 +56,12 @@ EXAMPLES = r'''
 
 RETURN = r'''
 _value:
-  description: True if structure is valid; error is raised otherwise
+  description: True if structure is valid; an error listing all problems found is raised otherwise
   type: bool
   returned: always
 '''
 
+@memoize()
 def validate_partitions_input(partitions, allow_gaps=False):
     PartitionInput(partitions, allow_gaps=allow_gaps)
     return True
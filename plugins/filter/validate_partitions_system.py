@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible filter plugin for validating and planning partition layout on a set of disks in one pass
+"""
+
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import PartitionInput
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.plan_cache import cached_plan
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
+
+DOCUMENTATION = r'''
+---
+name: validate_partitions_system
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Validate and generate partition plans for all disks at once
+description:
+  - This filter compares the current partition tables of all disks (from parted) with the desired layout
+    defined in C(partitions) and returns one combined plan keyed by disk path.
+  - It is the batched form of C(validate_partitions) - every disk is planned in one call, so a role can gather,
+    plan and create partitions for any number of disks in a constant number of tasks.
+options:
+  parted_infos:
+    description:
+      - Parted info results for all disks. Either a dictionary mapping disk paths to C(community.general.parted)
+        info results (such as the C(disks) result of C(aursu.lvm_setup.partition_table_info)), or the registered
+        result of a looped parted task (with a C(results) list).
+    type: dict
+    required: true
+  partitions:
+    description:
+      - Dictionary mapping disk paths to lists of requested partition definitions.
+    type: dict
+    required: true
+  default_label:
+    description:
+      - Partition table label to use if none is set. Common values: C(gpt), C(msdos).
+    type: str
+    required: false
+    default: gpt
+  require_existing:
+    description:
+      - If true, all partitions must already exist on their disks.
+    type: bool
+    required: false
+    default: false
+  cache_dir:
+    description:
+      - Directory of the on-disk plan cache on the controller. The plan is stored under a fingerprint of all
+        other arguments (desired spec and storage state) and reused as long as they do not change.
+        No caching if not set.
+    type: str
+    required: false
+  cache_size:
+    description:
+      - Maximum number of plans kept in O(cache_dir); the least recently used plans are removed first.
+    type: int
+    required: false
+    default: 4096
+seealso:
+  - name: validate_partitions
+    description: Validates and returns action plan for a single disk
+    plugin: aursu.lvm_setup.validate_partitions
+'''
+
+EXAMPLES = r'''
+- name: Get current partition tables
+  community.general.parted:
+    device: "{{ item }}"
+    unit: MiB
+    state: info
+  loop: "{{ partitions.keys() | list }}"
+  register: parted_info_all
+
+- name: Plan partitions on all disks
+  set_fact:
+    partitions_plan: "{{ parted_info_all | aursu.lvm_setup.validate_partitions_system(partitions) }}"
+
+- name: Get current partition tables without parted
+  aursu.lvm_setup.partition_table_info:
+    devices: "{{ partitions.keys() | list }}"
+  register: partition_tables
+
+- name: Plan partitions on all disks
+  set_fact:
+    partitions_plan: "{{ partition_tables.disks | aursu.lvm_setup.validate_partitions_system(partitions) }}"
+'''
+
+RETURN = r'''
+_value:
+  description: Dictionary mapping disk paths to lists of partition plans (see C(validate_partitions))
+  type: dict
+  returned: always
+  sample:
+    /dev/sda:
+      - num: 6
+        status: ok
+        action: create
+        disk_label: gpt
+        part_start: 2048s
+        part_end: 838862847s
+        warning: ""
+        error: ""
+'''
+
+@memoize()
+@cached_plan("validate_partitions_system")
+def validate_partitions_system(parted_infos, partitions, default_label="gpt", require_existing=False):
+    return PartitionInput(partitions).plan(parted_infos, default_label=default_label, required=require_existing)
+
+class FilterModule(object):
+    def filters(self):
+        return {
+            "validate_partitions_system": validate_partitions_system,
+        }
@@ -7,7 +7,9 @@ Ansible filter plugin to determine required actions for physical volumes in a vo
 """
 
 from typing import Any
-from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import VolumeGroup
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import LvmInfo, VolumeGroup
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.plan_cache import cached_plan
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
 
 DOCUMENTATION = r'''
 ---
@@ -21,7 +23,7 @@ description:
 options:
   lvm_info:
     description:
-      - Dictionary returned by a module like C(aursu.general.lvm_info), containing keys C(pv), C(vg), and C(lv).
+      - Dictionary returned by a module like C(aursu.lvm_setup.lvm_report) or C(aursu.general.lvm_info), containing keys C(pv), C(vg), and C(lv).
     type: dict
     required: true
   paths:
@@ -35,6 +37,19 @@ options:
       - Target volume group name which all given PVs should belong to.
     type: str
     required: true
+  cache_dir:
+    description:
+      - Directory of the on-disk plan cache on the controller. The plan is stored under a fingerprint of all
+        other arguments (desired spec and storage state) and reused as long as they do not change.
+        No caching if not set.
+    type: str
+    required: false
+  cache_size:
+    description:
+      - Maximum number of plans kept in O(cache_dir); the least recently used plans are removed first.
+    type: int
+    required: false
+    default: 4096
 seealso:
   - name: validate_lvm_partition
     description: Validates if a single partition can be used as a physical volume
@@ -66,6 +81,8 @@ _value:
       action: skip
 '''
 
+@memoize()
+@cached_plan("validate_pvs")
 def validate_pvs(lvm_info: dict[str, Any], paths: list[str], vg_name: str) -> list[dict[str, str]]:
     """
     Determine the required LVM action for each partition path.
@@ -80,7 +97,7 @@ def validate_pvs(lvm_info: dict[str, Any], paths: list[str], vg_name: str) -> li
             - path: the device path
             - action: one of "create", "add", or "skip"
     """
-    return VolumeGroup.from_lvm_info(vg_name, lvm_info).plan_pvs(paths)
+    return VolumeGroup.from_lvm_info(vg_name, LvmInfo.from_lvm_info(lvm_info)).plan_pvs(paths)
 
 class FilterModule(object):
     def filters(self):
@@ -6,7 +6,8 @@
 Ansible filter plugin to validate that a volume group exists in the system
 """
 
-from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import VolumeGroup
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import LvmInfo, VolumeGroup
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
 
 DOCUMENTATION = r'''
 ---
@@ -26,7 +27,7 @@ options:
   lvm_info:
     description:
       - Dictionary containing output of LVM state, including the C(vg) key.
-        Typically collected via C(aursu.general.lvm_info).
+        Typically collected via C(aursu.lvm_setup.lvm_report) or C(aursu.general.lvm_info).
     type: dict
     required: true
 seealso:
@@ -49,6 +50,7 @@ _value:
   returned: always
 '''
 
+@memoize()
 def validate_vg(vg_name, lvm_info):
     """
     Validates that a given volume group name exists in lvm_info['vgs'].
@@ -63,7 +65,7 @@ def validate_vg(vg_name, lvm_info):
     Returns:
         True if VG exists.
     """
-    return VolumeGroup.from_lvm_info(vg_name, lvm_info).validate()
+    return VolumeGroup.from_lvm_info(vg_name, LvmInfo.from_lvm_info(lvm_info)).validate()
 
 class FilterModule(object):
     def filters(self):
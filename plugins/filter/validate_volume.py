@@ -6,7 +6,9 @@
 Ansible filter plugin to validate and plan a logical volume based on LVM and device state
 """
 
-from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import VolumeGroup, LogicalVolume, Device
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import LvmInfo, VolumeGroup, LogicalVolume, Device
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.plan_cache import cached_plan
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
 
 DOCUMENTATION = r'''
 ---
@@ -21,22 +23,36 @@ description:
 options:
   lv:
     description:
-      - Dictionary defining a logical volume. Required fields: C(name), C(vg), C(size).
-        Optional: C(filesystem), C(mountpoint).
+      - Dictionary defining a logical volume with the required fields C(name), C(vg) and C(size), and the
+        optional fields C(filesystem), C(mountpoint), C(stripes) and C(stripe_size).
     type: dict
     required: true
   lvm_info:
     description:
       - Dictionary of current LVM state, including C(vg), C(lv), and C(pv) sections.
-        Typically obtained via C(aursu.general.lvm_info).
+        Typically obtained via C(aursu.lvm_setup.lvm_report) or C(aursu.general.lvm_info).
     type: dict
     required: true
   dev_info:
     description:
       - Device information for the target volume path, including filesystem type and mountpoints.
-        Typically obtained from a module like C(aursu.general.dev_info).
+        Typically obtained from a module like C(aursu.general.dev_info). May also be a map of device paths
+        to device information, such as the result of C(aursu.lvm_setup.dev_probe).
     type: dict
     required: true
+  cache_dir:
+    description:
+      - Directory of the on-disk plan cache on the controller. The plan is stored under a fingerprint of all
+        other arguments (desired spec and storage state) and reused as long as they do not change.
+        No caching if not set.
+    type: str
+    required: false
+  cache_size:
+    description:
+      - Maximum number of plans kept in O(cache_dir); the least recently used plans are removed first.
+    type: int
+    required: false
+    default: 4096
 seealso:
   - name: validate_volumes_input
     description: Validates structure of input volume list
@@ -76,16 +92,18 @@ _value:
     action: create
 '''
 
+@memoize()
+@cached_plan("validate_volume")
 def validate_volume(lv, lvm_info, dev_info):
 
-    volume = LogicalVolume(lv)
+    volume = LogicalVolume(lv, validation=False)
     volume.validate()
 
-    dev = Device.from_dev_info(volume.path, dev_info)
+    dev = Device.from_dev_info_lookup(volume.path, dev_info, (volume.dm_path,))
     volume.attach_device(dev, pass_through=True)
 
     vg = VolumeGroup(volume.vg)
-    vg.set_state(lvm_info)
+    vg.set_state(LvmInfo.from_lvm_info(lvm_info))
 
     vg.validate()
 
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible filter plugin to validate and plan a list of logical volumes in one pass
+"""
+
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import VolumeInput
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.plan_cache import cached_plan
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
+
+DOCUMENTATION = r'''
+---
+name: validate_volumes
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Validate and plan all logical volumes against system state at once
+description:
+  - This filter validates a list of logical volume definitions and plans every volume against one LVM state
+    and a map of device information, returning the plans in input order.
+  - Free space of the volume group is accounted across the whole list. Each LV planned for creation is
+    subtracted from the free space, so a batch that does not fit into the volume group fails before any
+    LV is created, and C(%FREE) sizes refer to the space left by the preceding volumes.
+  - Striped volumes (C(stripes) > 1) need C(stripes) PVs with room for one stripe each; free space per PV is
+    taken from C(pv_free) of O(lvm_info) and tracked across the list as well. An existing LV whose segments
+    have other stripes or another stripe size is flagged with C(layout_mismatch) and left unchanged.
+options:
+  volumes:
+    description:
+      - List of logical volume definitions with the required fields C(name), C(vg) and C(size), and the
+        optional fields C(filesystem), C(mountpoint), C(stripes) and C(stripe_size). All volumes must belong
+        to the same volume group.
+    type: list
+    elements: dict
+    required: true
+  lvm_info:
+    description:
+      - Dictionary of current LVM state, including C(vg), C(lv), and C(pv) sections.
+        Typically obtained via C(aursu.lvm_setup.lvm_report).
+    type: dict
+    required: true
+  dev_infos:
+    description:
+      - Device information per LV. Either a dictionary mapping LV paths (C(/dev/<vg>/<name>)) to device
+        information, or the registered result of a C(aursu.general.dev_info) task looped over C(volumes)
+        or over LV paths. LVs without device information are treated as not existing.
+    type: dict
+    required: false
+  cache_dir:
+    description:
+      - Directory of the on-disk plan cache on the controller. The plan is stored under a fingerprint of all
+        other arguments (desired spec and storage state) and reused as long as they do not change.
+        No caching if not set.
+    type: str
+    required: false
+  cache_size:
+    description:
+      - Maximum number of plans kept in O(cache_dir); the least recently used plans are removed first.
+    type: int
+    required: false
+    default: 4096
+seealso:
+  - name: validate_volume
+    description: Validates and plans a single logical volume
+    plugin: aursu.lvm_setup.validate_volume
+'''
+
+EXAMPLES = r'''
+- name: Get device info for all logical volumes
+  aursu.general.dev_info:
+    dev: "/dev/{{ item.vg }}/{{ item.name }}"
+  loop: "{{ volumes }}"
+  register: dev_info
+
+- name: Plan all logical volumes
+  set_fact:
+    volumes_plan: "{{ volumes | aursu.lvm_setup.validate_volumes(lvm_info, dev_info) }}"
+'''
+
+RETURN = r'''
+_value:
+  description: List of action plans (create, format, skip), one per volume in input order
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - name: data1
+      path: /dev/data/data1
+      action: skip
+    - name: data2
+      path: /dev/data/data2
+      action: create
+    - name: data3
+      path: /dev/data/data3
+      action: skip
+      layout_mismatch: LV /dev/data/data3 has 1 stripe(s) in segment at 0m, expected 2
+'''
+
+@memoize()
+@cached_plan("validate_volumes")
+def validate_volumes(volumes, lvm_info, dev_infos=None):
+    return VolumeInput(volumes).plan(lvm_info, dev_infos)
+
+class FilterModule(object):
+    def filters(self):
+        return {
+            'validate_volumes': validate_volumes,
+        }
@@ -7,6 +7,7 @@ Ansible filter plugin to validate the structure of logical volume definitions
 """
 
 from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import VolumeInput
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import memoize
 
 DOCUMENTATION = r'''
 ---
@@ -16,8 +17,10 @@ version_added: "1.0"
 short_description: Validate the structure of logical volume input definitions
 description:
   - This filter validates that a list of logical volume definitions is structurally correct.
-    Each volume must define C(name), C(vg), and C(size). Optionally, it may include C(filesystem) and C(mountpoint).
+    Each volume must define C(name), C(vg), and C(size). Optionally, it may include C(filesystem), C(mountpoint),
+    C(stripes) (a positive integer) and C(stripe_size) (a power of 2 of at least C(4k), with C(stripes) > 1).
     All volumes must belong to the same volume group.
+  - All volumes are checked in a single pass. Every problem found is reported in one error message.
 options:
   volumes:
     description:
@@ -43,11 +46,12 @@ EXAMPLES = r'''
 
 RETURN = r'''
 _value:
-  description: True if the structure is valid; otherwise, raises an error
+  description: True if the structure is valid; otherwise, raises an error listing all problems found
   type: bool
   returned: always
 '''
 
+@memoize()
 def validate_volumes_input(volumes):
     """
     Validates the structure of the `volumes` variable.
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Dependency graph executor for storage operations.
+
+Runs operations with explicit dependencies on a bounded thread pool. Ready operations are started
+in order of their critical path (the longest chain of estimated costs they lead to), operations
+sharing a named lock never run at the same time, and a failure only cancels the operations which
+depend on the failed one.
+"""
+
+import heapq
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Optional
+
+DOCUMENTATION = r'''
+---
+module_utils: dag
+author: Alexander Ursu
+short_description: Run storage operations as a dependency graph
+description:
+  - C(run_operations) runs a list of C(Operation) objects, each with a name, a callable, the names of the
+    operations it depends on, an estimated cost and an optional lock name.
+  - Up to C(max_workers) operations run at the same time. Among the ready operations the one with the longest
+    remaining chain of costs starts first, so long jobs (e.g. mkfs of the largest volume) and whatever
+    leads to them are not left for the end.
+  - Operations with the same lock (e.g. C(lvm) for commands taking the LVM global lock) run one at a time.
+  - If an operation fails, the operations depending on it, directly or not, are skipped; all other
+    operations still run.
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> results = run_operations([
+...     Operation("lvcreate:data1", create_lv, lock="lvm"),
+...     Operation("mkfs:data1", make_fs, deps=["lvcreate:data1"], cost=1024),
+... ], max_workers=4)
+>>> results["mkfs:data1"]["status"]
+'ok'
+'''
+
+RETURN = r'''
+run_operations:
+  description:
+    - Dictionary mapping operation names to results, in input order.
+    - Each result has C(status) (C(ok), C(failed) or C(skipped)) and, for operations which ran, C(elapsed)
+      and C(result) or C(error). Skipped operations name the failed operation in C(blocked_by).
+  type: dict
+  returned: when called
+  raises:
+    - DagError if names are duplicated, dependencies are unknown or the graph has a cycle
+'''
+
+class DagError(Exception):
+    pass
+
+class Operation:
+    __slots__ = ("name", "func", "deps", "cost", "lock")
+
+    def __init__(self, name: str, func: Callable, deps: Iterable[str] = (), cost: float = 1.0,
+                 lock: Optional[str] = None):
+        self.name = name
+        self.func = func
+        self.deps = tuple(dict.fromkeys(deps))
+        self.cost = cost
+        self.lock = lock
+
+    def describe(self) -> dict:
+        return {"name": self.name, "deps": list(self.deps), "cost": self.cost, "lock": self.lock}
+
+def _graph(operations: list) -> tuple[dict, dict, list]:
+    """
+    Return (name → operation, name → dependent names, names in topological order).
+
+    Raises:
+        DagError: If the graph is invalid.
+    """
+    ops = {}
+    for op in operations:
+        if op.name in ops:
+            raise DagError(f"Duplicate operation '{op.name}'.")
+        ops[op.name] = op
+
+    dependents = {name: [] for name in ops}
+    pending = {}
+    for op in operations:
+        for dep in op.deps:
+            if dep not in ops:
+                raise DagError(f"Operation '{op.name}' depends on unknown operation '{dep}'.")
+            dependents[dep].append(op.name)
+        pending[op.name] = len(op.deps)
+
+    order = [name for name, count in pending.items() if count == 0]
+    for name in order:
+        for child in dependents[name]:
+            pending[child] -= 1
+            if pending[child] == 0:
+                order.append(child)
+    if len(order) != len(ops):
+        cycle = sorted(name for name, count in pending.items() if count)
+        raise DagError(f"Operations have circular dependencies: {', '.join(cycle)}.")
+    return ops, dependents, order
+
+def critical_path(operations: list) -> dict:
+    """
+    Return name → cost of the operation plus the most expensive chain of operations depending on it.
+    """
+    return _rank(*_graph(operations))
+
+def _rank(ops: dict, dependents: dict, order: list) -> dict:
+    rank = {}
+    for name in reversed(order):
+        rank[name] = ops[name].cost + max((rank[child] for child in dependents[name]), default=0)
+    return rank
+
+def _error_message(e: Exception) -> str:
+    # the collection's exceptions carry the message in 'msg' (or 'message' for PlanError)
+    return getattr(e, "msg", None) or getattr(e, "message", None) or str(e) or type(e).__name__
+
+def _run(op: Operation) -> dict:
+    started = time.monotonic()
+    try:
+        result = {"status": "ok", "result": op.func()}
+    except Exception as e:
+        result = {"status": "failed", "error": _error_message(e)}
+    result["elapsed"] = round(time.monotonic() - started, 3)
+    return result
+
+def run_operations(operations: list, max_workers: int = 1) -> dict:
+    """
+    Run `operations` respecting their dependencies and locks, up to `max_workers` at a time.
+
+    Raises:
+        DagError: If the graph is invalid (nothing is run then).
+    """
+    ops, dependents, order = _graph(operations)
+    rank = _rank(ops, dependents, order)
+    position = {name: i for i, name in enumerate(ops)}
+    max_workers = max(1, max_workers)
+
+    waiting = {name: len(op.deps) for name, op in ops.items()}
+    # longest critical path first, input order among equals
+    ready = [(-rank[name], position[name], name) for name, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+
+    results = {}
+    held = set()
+    running = {}
+
+    def skip_dependents(name):
+        stack = list(dependents[name])
+        while stack:
+            child = stack.pop()
+            if child not in results:
+                results[child] = {"status": "skipped", "blocked_by": name}
+                stack.extend(dependents[child])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while ready or running:
+            locked = []
+            while ready and len(running) < max_workers:
+                item = heapq.heappop(ready)
+                op = ops[item[2]]
+                if op.lock is not None and op.lock in held:
+                    locked.append(item)
+                    continue
+                if op.lock is not None:
+                    held.add(op.lock)
+                running[pool.submit(_run, op)] = op.name
+            for item in locked:
+                heapq.heappush(ready, item)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                held.discard(ops[name].lock)
+                results[name] = future.result()
+                if results[name]["status"] != "ok":
+                    skip_dependents(name)
+                    continue
+                for child in dependents[name]:
+                    if child in results:
+                        continue
+                    waiting[child] -= 1
+                    if waiting[child] == 0:
+                        heapq.heappush(ready, (-rank[child], position[child], child))
+
+    return {name: results[name] for name in ops}
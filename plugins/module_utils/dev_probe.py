@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Helpers for probing many block devices at once.
+
+Parses /proc/self/mountinfo and 'blkid -p -o export' output and stats device paths, producing
+per-path entries in the dev_info structure consumed by Device.from_dev_info (the structure
+returned by aursu.general.dev_info).
+"""
+
+import os
+import re
+import stat
+from typing import Optional
+
+DOCUMENTATION = r'''
+---
+module_utils: dev_probe
+author: Alexander Ursu
+short_description: Build dev_info entries for many device paths
+description:
+  - This utility stats device paths and combines the result with the mount table (read once from
+    C(/proc/self/mountinfo)) and with one low-level C(blkid) probe of all devices.
+  - Each entry has the C(is_exists), C(filetype), C(stat), C(blkid) and C(mount) keys of C(aursu.general.dev_info).
+    Mounts are matched to devices by device number, so C(/dev/<vg>/<lv>) and C(/dev/mapper/<vg>-<lv>)
+    resolve to the same mounts.
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> mounts = parse_mountinfo(open("/proc/self/mountinfo").read())
+>>> blkid = parse_blkid_export(out)
+>>> dev_info("/dev/data/data1", mounts, blkid)
+{'is_exists': True, 'filetype': 'b', 'stat': {...}, 'blkid': {'type': 'xfs', ...}, 'mount': [{'target': '/mnt/data1', ...}]}
+'''
+
+RETURN = r'''
+parse_mountinfo:
+  description: Dictionary mapping (major, minor) device numbers to lists of mounts.
+  type: dict
+  returned: when called
+
+parse_blkid_export:
+  description: Dictionary mapping device names to their blkid tags (lower-cased keys).
+  type: dict
+  returned: when called
+
+dev_info:
+  description: Device information in the aursu.general.dev_info format.
+  type: dict
+  returned: when called
+
+probe_devices:
+  description: Dictionary mapping every path to its device information (see C(dev_info)).
+  type: dict
+  returned: when called
+  raises:
+    - ProbeError if the mount table can not be read or blkid fails
+'''
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+STAT_FIELDS = ("atime", "ctime", "dev", "gid", "ino", "mode", "mtime", "nlink", "rdev", "size", "uid")
+
+def _unescape(value: str) -> str:
+    # mountinfo escapes space, tab, newline and backslash as octal (e.g. '\040')
+    return _OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), value)
+
+def parse_mountinfo(text: str) -> dict:
+    """
+    Parse /proc/self/mountinfo into a (major, minor) → list of mounts mapping.
+
+    Each mount is a dictionary with 'target', 'source', 'fstype' and 'options'.
+    """
+    mounts = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if "-" not in fields[6:]:
+            continue
+        sep = fields.index("-", 6)
+        if len(fields) < sep + 3:
+            continue
+        try:
+            major, minor = (int(n) for n in fields[2].split(":"))
+        except ValueError:
+            continue
+        mounts.setdefault((major, minor), []).append({
+            "target": _unescape(fields[4]),
+            "source": _unescape(fields[sep + 2]),
+            "fstype": fields[sep + 1],
+            "options": fields[5],
+        })
+    return mounts
+
+def parse_blkid_export(text: str) -> dict:
+    """
+    Parse 'blkid -o export' output of one or more devices into a device name → tags mapping.
+    """
+    result = {}
+    current = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            current = None
+            continue
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        if key == "DEVNAME":
+            current = result.setdefault(value, {"dev_name": value})
+        elif current is not None:
+            current[key.lower()] = value
+    return result
+
+def filetype(mode: int) -> str:
+    if stat.S_ISBLK(mode):
+        return "b"
+    if stat.S_ISCHR(mode):
+        return "c"
+    if stat.S_ISDIR(mode):
+        return "d"
+    if stat.S_ISLNK(mode):
+        return "l"
+    if stat.S_ISFIFO(mode):
+        return "p"
+    if stat.S_ISSOCK(mode):
+        return "s"
+    return "f"
+
+def stat_path(path: str) -> tuple[Optional[os.stat_result], dict]:
+    """
+    Return (stat result or None, stat dictionary) for `path`; errors are reported in the 'error' key.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None, {}
+    except OSError as e:
+        return None, {"error": str(e)}
+    return st, {name: getattr(st, f"st_{name}") for name in STAT_FIELDS}
+
+def dev_info(path: str, mounts: dict, blkid: dict, stat_result: Optional[tuple] = None) -> dict:
+    """
+    Return the dev_info entry for `path`, given parsed mountinfo and blkid results.
+
+    `stat_result` is the result of stat_path() for `path`, if already known.
+    """
+    st, st_info = stat_result or stat_path(path)
+    if st is None:
+        return {"is_exists": "error" in st_info, "stat": st_info}
+
+    info = {
+        "is_exists": True,
+        "filetype": filetype(st.st_mode),
+        "stat": st_info,
+    }
+    if path in blkid:
+        info["blkid"] = blkid[path]
+    if stat.S_ISBLK(st.st_mode):
+        info["mount"] = mounts.get((os.major(st.st_rdev), os.minor(st.st_rdev)), [])
+    return info
+
+MOUNTINFO = "/proc/self/mountinfo"
+
+class ProbeError(Exception):
+    def __init__(self, msg, **kwargs):
+        super().__init__(msg)
+        self.msg = msg
+        self.details = kwargs
+
+def probe_devices(module, paths) -> dict:
+    """
+    Return path → dev_info for `paths`, reading the mount table once and probing all block devices
+    with one blkid call.
+
+    Raises:
+        ProbeError: If the mount table can not be read or blkid fails.
+    """
+    paths = list(dict.fromkeys(paths))
+
+    try:
+        with open(MOUNTINFO) as f:
+            mounts = parse_mountinfo(f.read())
+    except OSError as e:
+        raise ProbeError(f"Unable to read mount table: {e}")
+
+    stats = {path: stat_path(path) for path in paths}
+
+    blkid = {}
+    block_devices = [path for path, (st, _) in stats.items() if st is not None and stat.S_ISBLK(st.st_mode)]
+    if block_devices:
+        blkid_bin = module.get_bin_path("blkid", required=True)
+        # exit code 2: no signature found on (some of) the devices
+        rc, out, err = module.run_command([blkid_bin, "-p", "-o", "export"] + block_devices)
+        if rc not in (0, 2):
+            raise ProbeError(f"blkid failed: {err.strip()}", rc=rc, stdout=out, stderr=err)
+        blkid = parse_blkid_export(out)
+
+    return {path: dev_info(path, mounts, blkid, stats[path]) for path in paths}
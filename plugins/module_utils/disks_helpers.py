@@ -0,0 +1,964 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Partition layout models: requested and actual partitions of a disk and partition planning.
+
+Used by the filter plugins on the controller and by modules planning on the managed node.
+"""
+
+import bisect
+import math
+from abc import ABC
+from typing import Optional
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.size_utils import Size
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.parted_units import DEFAULT_SECTOR_SIZE, normalize_unit
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.validation import PlanError, ValidationErrors
+
+DOCUMENTATION = r'''
+---
+module_utils: disks_helpers
+author: Alexander Ursu
+short_description: Partition layout models and planning
+description:
+  - C(PartitionInput) parses the C(partitions) input, C(Disk) and C(Partition) model requested and actual
+    partition tables, and C(Disk.plan) returns the partition plans of one disk.
+  - Errors are raised as C(PlanError) (see C(validation)).
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> PartitionInput({"/dev/sda": [{"num": 1, "size": "10GiB"}]}).paths()
+['/dev/sda1']
+'''
+
+RETURN = r'''
+PartitionInput.plan:
+  description: Disk path mapped to the list of partition plans (see C(validate_partitions_system)).
+  type: dict
+  returned: when called
+'''
+
+class SizeInterface(ABC):
+    # planning builds one object per partition; slots keep them small
+    __slots__ = ("_unit", "_sector_size", "_size", "size")
+
+    MIB = Size.from_mib(1)
+
+    def __init__(self, sector_size=DEFAULT_SECTOR_SIZE):
+        self._unit = None
+        # logical sector size used to convert values reported in sectors ('s')
+        self._sector_size = sector_size
+        # raw 'size' field from input (may be missing or malformed)
+        self._size = None
+        self.size = None
+
+    # 1. The argument 'part_start' doesn't respect required format.The size unit is case sensitive.
+    # 2. Error: You requested a partition from 60208MiB to 915715MiB (sectors 123305984..1875385007).
+    #    The closest location we can manage is 60208MiB to 915715MiB (sectors 123305992..1875384974).
+    # 3. Warning: The resulting partition is not properly aligned for best performance: 123305992s % 2048s != 0s
+    def _to_parted_size(self, value, align=0, unit="MiB"):
+        if isinstance(value, Size):
+            # exact rendering; 'align' is expressed in MiB
+            return (value + Size.from_mib(align)).format(unit)
+        if isinstance(value, str):
+            value = value.strip()
+            if value.endswith("%"):
+                return value
+            value = float(value)
+        return f"{int(value + align)}{unit}"
+
+    def _convert_to_size(self, size, unit) -> Optional[Size]:
+        if isinstance(size, Size):
+            return size
+        if isinstance(size, (int, float, str)) and not isinstance(size, bool):
+            # sizes without unit (user input, parted 'mib' output) default to MiB
+            canonical = normalize_unit(unit) if unit is not None else "MiB"
+            if canonical is None:
+                return None
+            try:
+                if isinstance(size, (int, float)) and size < 0:
+                    # Size.parse() rejects negative sizes; keep them so they are reported as not positive
+                    return Size(-Size.parse(-size, canonical, sector_size=self._sector_size).bytes)
+                return Size.parse(size, canonical, sector_size=self._sector_size)
+            except ValueError:
+                return None
+        return None
+
+    def _convert_size(self, data, name):
+        """
+        Extract a raw size field and convert it to an exact Size.
+
+        Args:
+            data (dict): Input data dictionary.
+            name (str): Field name to extract from data (e.g., "size", "size_limit").
+
+        Returns:
+            tuple: (raw_value, Size or None)
+        """
+        size_raw = data.get(name)
+        size_value = self._convert_to_size(size_raw, self._unit)
+
+        return size_raw, size_value
+
+    @property
+    def _unit_msg(self) -> str:
+        return f" in '{self._unit}'" if self._unit else ""
+
+    def _context(self) -> str:
+        """
+        Context appended to validation error messages. Built only when an error is raised.
+        """
+        return ""
+
+    def _assert_size(self, name, raw_value, converted, required=True, allow_zero=False, context=None):
+        """
+        Assert that a size field is present (if required), convertible, and positive.
+
+        Args:
+            name (str): Field name (used in error messages).
+            raw_value: Raw input value for the size field.
+            converted (Size): Converted size value.
+            required (bool): Whether the field must be present.
+            allow_zero (bool): Whether zero size is acceptable.
+            context (str): Optional context string for error messages (see _context() by default).
+        """
+        if raw_value is None:
+            if required:
+                raise PlanError(f"Missing '{name}' field{self._context() if context is None else context}.")
+            return  # Optional size, and not provided — acceptable
+
+        if converted is None:
+            raise PlanError(
+                f"Unable to convert '{name}' field to MiB{self._context() if context is None else context}. "
+                f"Got: {raw_value}{self._unit_msg}"
+            )
+
+        if converted.bytes <= 0:
+            if allow_zero and converted.bytes == 0:
+                return
+            raise PlanError(
+                f"Expected positive '{name}' field in 'MiB'{self._context() if context is None else context}. "
+                f"Got: {raw_value}{self._unit_msg}"
+            )
+
+    def _set_unit_meta(self, data):
+        self._unit = data.get("unit")
+
+    def _set_size_meta(self, data):
+        self._size, self.size = self._convert_size(data, "size")
+
+    def _clone(self):
+        """
+        Return a shallow copy of this object (all slots of the class hierarchy).
+        """
+        obj = object.__new__(type(self))
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                setattr(obj, name, getattr(self, name))
+        return obj
+
+    def validate_size(self, required=True, allow_zero=False):
+        self._assert_size("size", self._size, self.size, required, allow_zero)
+
+class Partition(SizeInterface):
+    __slots__ = (
+        "_disk", "_num", "num", "_idx", "_begin", "_end", "begin", "end", "prev", "next_part", "state", "_validated",
+    )
+
+    def __init__(self, part_data, idx=None, disk=None, sector_size=DEFAULT_SECTOR_SIZE):
+        if not isinstance(part_data, dict):
+            raise PlanError(f"Partition entry must be a dictionary. Found: {part_data}")
+
+        super().__init__(sector_size)
+
+        self._disk = None
+
+        # raw 'num' field from input (may be str or int, possibly invalid)
+        self._num = None
+        # validated and converted partition number (int or None)
+        self.num = None
+
+        # position in the input list, used in validation error reporting
+        self._idx: Optional[int] = None
+
+        # raw values from parted input
+        self._begin = None
+        self._end = None
+
+        # converted exact values
+        self.begin: Optional[Size] = None
+        self.end: Optional[Size] = None
+
+        self._set_num_meta(part_data)
+        self._set_unit_meta(part_data)
+        self._set_size_meta(part_data)
+        self._set_begin_meta(part_data)
+        self._set_end_meta(part_data)
+
+        self.set_index(idx)
+        self.set_disk(disk)
+
+        # previous and next partitions
+        self.prev: Optional["Partition"] = None
+        self.next_part: Optional["Partition"] = None
+
+        self.state: Optional["Partition"] = None
+
+        # set by validate(); the input is never changed after parsing
+        self._validated: bool = False
+
+        # num is mandatory set to int
+        self.validate_num()
+
+        # TODO: flags, fstype, name
+
+    def set_state(self, part: Optional["Partition"] = None):
+        if part is None:
+            return
+        part.validate_begin()
+        part.validate_end()
+        part.validate_size()
+        self.state = part
+
+    def _set_num_meta(self, part_data):
+        self._num = part_data.get("num")
+        try:
+            self.num = int(self._num)
+        except (ValueError, TypeError):
+            self.num = None
+
+    def _set_begin_meta(self, part_data):
+        self._begin, self.begin = self._convert_size(part_data, "begin")
+
+    def _set_end_meta(self, part_data):
+        self._end, self.end = self._convert_size(part_data, "end")
+    
+    def set_index(self, idx=None):
+        if not isinstance(idx, int):
+            return
+        self._idx = idx
+
+    def set_disk(self, disk=None):
+        if disk is None or not disk.startswith('/dev/'):
+            return
+        self._disk = disk
+
+    # context messages used in validation error reporting, built only when an error is raised
+    @property
+    def _msg_in(self) -> str:
+        return f" in partition #{self._idx+1}" if self._idx is not None else ""
+
+    @property
+    def _msg_for(self) -> str:
+        return f" for partition #{self._idx+1}" if self._idx is not None else ""
+
+    @property
+    def _disk_msg(self) -> str:
+        return f" for disk '{self._disk}'" if self._disk else ""
+
+    @property
+    def _num_msg(self) -> str:
+        try:
+            int(self._num)
+        except (ValueError, TypeError) as e:
+            return str(e)
+        return ""
+
+    def _context(self) -> str:
+        return f"{self._msg_for}{self._disk_msg}"
+
+    def is_last(self) -> bool:
+        """
+        Returns True if this partition is the last one in the list (i.e., has no next).
+        """
+        return self.next_part is None
+
+    def validate_num(self):
+        if self._num is None:
+            raise PlanError(f"Missing 'num' field{self._msg_in}{self._disk_msg}.")
+        if self.num is None:
+            raise PlanError(f"'num' must be an integer{self._msg_in}{self._disk_msg}. Got: {self._num} ({self._num_msg})")
+        return True
+    
+    def validate_begin(self):
+        self._assert_size(
+            "begin",
+            self._begin,
+            self.begin,
+            required=False,
+            allow_zero=True,
+        )
+
+    def validate_end(self):
+        self._assert_size(
+            "end",
+            self._end,
+            self.end,
+            required=False,
+        )
+
+    def validate(self):
+        # 'num' is validated by the constructor
+        if self._validated:
+            return
+        self.validate_size(required=(not self.is_last()), allow_zero=True)
+        self._validated = True
+    
+    def path(self, disk: Optional[str] = None):
+        """
+        Return full partition device path for a given disk and partition number.
+        Examples:
+        - /dev/sda, 1        → /dev/sda1
+        - /dev/nvme0n1, 1    → /dev/nvme0n1p1
+        """
+        disk = self._disk if disk is None or not disk.startswith('/dev/') else disk
+        if disk is None or self.num is None:
+            return None
+        return f"{disk}p{self.num}" if disk.startswith('/dev/nvme') else f"{disk}{self.num}"
+
+    def plan_template(self) -> dict:
+        """
+        Return a default plan dictionary for this partition,
+        including current state if available.
+        """
+        return {
+            "num": self.num,
+            "status": "ok",
+            "warning": "",
+            "error": "",
+            "action": "skip",
+            "disk_label": "",  # to be filled by caller
+            "part_start": self.state._begin if self.state else "",
+            "part_end": self.state._end if self.state else "",
+        }
+
+    def plan(self, required=False):
+        """
+        Generate a partition plan for an existing partition based on its real disk state.
+
+        If the partition exists, its size is validated (if specified). If no size is provided,
+        the partition must be the last one on the disk. If the partition is required but not found,
+        an error is raised.
+
+        Args:
+            required (bool): Whether this partition is expected to already exist.
+
+        Returns:
+            dict or None: A dictionary describing the plan, or None if not required and not present.
+
+        Raises:
+            PlanError: If the partition is required but not present, or if size-related
+                                constraints are violated.
+        """
+        if not self.state:
+            if required:
+                raise PlanError(
+                    f"Partition {self.path()} not found — expected to exist at this point (required is set)."
+                )
+            return None
+
+        self.validate()
+
+        warning = ""
+        if self.size is None:
+            if not self.state.is_last():
+                raise PlanError(
+                    f"Partition {self.num} already exists, but no 'size' is specified "
+                    f"and it is not the last partition."
+                )
+        elif self.size.round_to(self.MIB) != self.state.size.round_to(self.MIB):
+            # parted reports sizes with MiB resolution
+            warning = "size mismatch"
+
+        plan = self.plan_template()
+        plan["warning"] = warning
+        return plan
+
+class Disk(SizeInterface):
+    __slots__ = (
+        "logical_sector_size", "physical_sector_size", "alignment_offset", "minimum_io_size", "optimal_io_size",
+        "_parts", "disk", "_duplicate", "_nums", "_by_num", "_extents", "_shared", "raw_parts", "raw_disk", "_table",
+        "table", "state",
+    )
+
+    # Supported partition table types based on parted documentation
+    SUPPORTED_TABLES = {
+        "aix", "amiga", "bsd", "dvh", "gpt", "mac", "msdos", "pc98", "sun", "atari", "loop"
+    }
+
+    # parted default alignment grain (1 MiB / 2048 sectors of 512 bytes)
+    DEFAULT_GRAIN = Size.from_mib(1)
+    # I/O hints producing a larger grain are ignored as bogus (some USB bridges report 0xfffe00)
+    MAX_GRAIN = Size.from_mib(256)
+    # GPT partition entry array (128 entries x 128 bytes), kept at both ends of the disk
+    GPT_ENTRIES = Size(16384)
+
+    def __init__(self, disk, parts, validation=True, allow_gaps=False, allow_empty=False, sector_size=DEFAULT_SECTOR_SIZE,
+                 errors: Optional[ValidationErrors] = None):
+        """
+        Parse the partition list of `disk` in a single pass.
+
+        Errors of all partitions are collected and raised as one report. With `errors` given, they are
+        added to that collector instead and the caller is responsible for raising them.
+        """
+        if not isinstance(parts, list):
+            raise PlanError(f"Expected a list of partitions for device '{disk}', got {type(parts).__name__}.")
+
+        super().__init__(sector_size)
+
+        # device geometry (bytes); physical sector size and I/O hints are set from metadata
+        self.logical_sector_size: int = sector_size
+        self.physical_sector_size: int = sector_size
+        self.alignment_offset: int = 0
+        self.minimum_io_size: int = 0
+        self.optimal_io_size: int = 0
+
+        self._parts: list[Partition] = []
+        self.disk: str = disk
+
+        self._duplicate: Optional[int] = None
+
+        # ordered index of unique partition numbers and num → Partition lookup,
+        # both maintained incrementally by add_part()
+        self._nums: list[int] = []
+        self._by_num: dict[int, Partition] = {}
+        # (begin, end) of partitions with known position, ordered by begin
+        self._extents: list[tuple[Size, Size]] = []
+        # partition list and indexes are shared with a snapshot (copied on the next add_part())
+        self._shared: bool = False
+
+        report = errors if errors is not None else ValidationErrors(f"partitions of disk '{disk}'")
+        reported = len(report)
+
+        entries = []
+        for part_data in parts:
+            if isinstance(part_data, dict):
+                entries.append(part_data)
+            else:
+                report.add(f"Partition entry must be a dictionary. Found: {part_data}")
+
+        for idx, part_data in enumerate(sorted(entries, key=self._num_order)):
+            try:
+                p = Partition(part_data, idx, disk, sector_size)
+            except PlanError as e:
+                report.add(e)
+                continue
+            if self._parts:
+                p.prev = self._parts[-1]
+                self._parts[-1].next_part = p 
+            self.add_part(p)
+
+        # keep original input
+        self.raw_parts = parts
+        self.raw_disk = {}
+
+        # Raw values from parted info (if available)
+        self._table = None
+        # Default partition table (used if disk is unformatted)
+        self.table = "gpt"
+
+        # Actual disk state
+        self.state: Optional["Disk"] = None
+
+        if validation:
+            # numbering is not checked for gaps if some entries could not be parsed
+            invalid = len(report) > reported
+            self.check(report, allow_gaps or invalid, allow_empty or invalid)
+
+        if errors is None:
+            report.raise_if_any()
+
+    @staticmethod
+    def _num_order(part_data) -> tuple:
+        # integer numbers first, then anything else (strings to convert, invalid values) in input order
+        num = part_data.get("num")
+        return (False, num) if isinstance(num, int) else (True, str(num))
+
+    def from_metadata(self, disk_data):
+        self._set_unit_meta(disk_data)
+        self._set_size_meta(disk_data)
+        self._set_table_meta(disk_data)
+        self._set_geometry_meta(disk_data)
+
+        self.raw_disk = disk_data
+
+    @staticmethod
+    def _geometry_value(disk_data, name, default=0) -> int:
+        value = disk_data.get(name)
+        try:
+            value = int(value)
+        except (ValueError, TypeError):
+            return default
+        return value if value >= 0 else default
+
+    @classmethod
+    def _sector_size_meta(cls, disk_data) -> int:
+        return cls._geometry_value(disk_data, "logical_block") or DEFAULT_SECTOR_SIZE
+
+    def _set_geometry_meta(self, disk_data):
+        # keys reported by parted (logical_block, physical_block) and sysfs queue limits
+        self.physical_sector_size = self._geometry_value(disk_data, "physical_block") or self.logical_sector_size
+        self.alignment_offset = self._geometry_value(disk_data, "alignment_offset")
+        self.minimum_io_size = self._geometry_value(disk_data, "minimum_io_size")
+        self.optimal_io_size = self._geometry_value(disk_data, "optimal_io_size")
+
+    @classmethod
+    def from_parted(cls, parted_info):
+        # extract disk and parts from parted_info
+        disk_data = parted_info.get("disk", {})
+
+        disk = disk_data.get("dev")
+        parts = parted_info.get("partitions", [])
+
+        disk_obj = cls(disk, parts, allow_gaps=True, allow_empty=True, sector_size=cls._sector_size_meta(disk_data))
+        disk_obj.from_metadata(disk_data)
+
+        return disk_obj
+
+    @classmethod
+    def from_disk(cls, disk: "Disk"):
+        """
+        Rebuild a disk from the raw partitions and metadata of `disk`, parsing and validating them again.
+        Use snapshot() to copy an already validated disk state.
+        """
+        disk_obj = cls(disk.disk, disk.raw_parts, allow_gaps=True, allow_empty=True, sector_size=disk.logical_sector_size)
+
+        raw_disk = disk.raw_disk if disk.raw_disk else {
+            "unit": disk._unit,
+            "size": disk._size,
+            "table": disk._table,
+            "logical_block": disk.logical_sector_size,
+            "physical_block": disk.physical_sector_size,
+            "alignment_offset": disk.alignment_offset,
+            "minimum_io_size": disk.minimum_io_size,
+            "optimal_io_size": disk.optimal_io_size,
+        }
+        disk_obj.from_metadata(raw_disk)
+
+        return disk_obj
+
+    def snapshot(self) -> "Disk":
+        """
+        Return a copy-on-write snapshot of this disk.
+
+        The snapshot shares the already validated Partition objects, the partition list and the lookup
+        indexes with this disk. Whichever of the two adds a partition first copies the list and the
+        indexes (not the partitions), so tentative partitions added while planning never show up in
+        the original, and nothing is parsed or validated again.
+        """
+        obj = self._clone()
+        obj.state = None
+        self._shared = obj._shared = True
+        return obj
+
+    def _unshare(self):
+        if self._shared:
+            self._parts = list(self._parts)
+            self._nums = list(self._nums)
+            self._by_num = dict(self._by_num)
+            self._extents = list(self._extents)
+            self._shared = False
+
+    @property
+    def sector(self) -> Size:
+        """
+        Logical sector size of the device.
+        """
+        return Size(self.logical_sector_size)
+
+    def alignment_grain(self) -> Size:
+        """
+        Return the partition alignment grain: the least common multiple of parted's default
+        1 MiB alignment, the logical and physical sector sizes and the device I/O hints
+        (minimum_io_size, optimal_io_size, e.g. RAID chunk and stripe width).
+
+        Hints that are not a multiple of the logical sector size, or that would push the grain
+        above MAX_GRAIN, are ignored.
+        """
+        grain = math.lcm(self.DEFAULT_GRAIN.bytes, self.logical_sector_size, self.physical_sector_size)
+        for hint in (self.minimum_io_size, self.optimal_io_size):
+            if hint and hint % self.logical_sector_size == 0:
+                candidate = math.lcm(grain, hint)
+                if candidate <= self.MAX_GRAIN.bytes:
+                    grain = candidate
+        return Size(grain)
+
+    def align_up(self, pos: Size) -> Size:
+        """
+        Return the first aligned position at or after `pos`, honoring the device alignment offset.
+        """
+        offset = Size(self.alignment_offset)
+        return offset + (pos - offset).align_up(self.alignment_grain())
+
+    def align_down(self, pos: Size) -> Size:
+        """
+        Return the last aligned position at or before `pos`, honoring the device alignment offset.
+        """
+        offset = Size(self.alignment_offset)
+        return offset + (pos - offset).align_down(self.alignment_grain())
+
+    def first_usable(self, table: Optional[str] = None) -> Size:
+        """
+        First byte available for partitions (after the MBR, or after the primary GPT header and entries).
+        """
+        table = table or self.table
+        if table == "gpt":
+            return self.sector * 2 + self.GPT_ENTRIES
+        return self.sector
+
+    def last_usable(self, table: Optional[str] = None) -> Size:
+        """
+        First byte past the area available for partitions (the backup GPT is kept at the end of disk).
+        """
+        table = table or self.table
+        if table == "gpt":
+            return self.size - self.sector - self.GPT_ENTRIES
+        return self.size
+
+    def to_sectors(self, pos: Size) -> str:
+        """
+        Render a byte position as a parted sector value (e.g. '2048s').
+        """
+        return f"{pos.sectors(self.logical_sector_size)}s"
+
+    def set_state_disk(self, state: "Disk"):
+        self.state = state.snapshot()
+
+        for p in self._parts:
+            p.set_state(self.state.parts_by_num(p.num))
+        
+        self.set_table(self.state._table)
+
+    def parts_by_num(self, num=None):
+        """
+        Return a dictionary mapping partition numbers to Partition objects,
+        or a single Partition if a number is specified.
+
+        Only partitions with a valid (non-null) 'num' field are included.
+        Useful for quick lookup by partition number.
+
+        Args:
+            num (int, optional): If specified, return only the matching Partition object.
+
+        Returns:
+            dict[int, Partition] or Partition or None: Partition dictionary or a single entry.
+        """
+        if isinstance(num, int):
+            return self._by_num.get(num)
+        return dict(self._by_num)
+
+    def sorted_parts(self) -> list[Partition]:
+        """
+        Return the list of Partition objects sorted by partition number.
+
+        Returns:
+            list[Partition]: List of partitions sorted by number.
+        """
+        return [self._by_num[n] for n in self._nums]
+
+    def neighbours(self, num: int) -> tuple[Optional[Partition], Optional[Partition]]:
+        """
+        Return the partitions with the closest lower and higher numbers than `num`.
+
+        Uses binary search over the ordered partition number index.
+
+        Returns:
+            tuple: (previous partition or None, next partition or None)
+        """
+        lo = bisect.bisect_left(self._nums, num)
+        hi = bisect.bisect_right(self._nums, num, lo)
+
+        prev = self._by_num[self._nums[lo - 1]] if lo > 0 else None
+        next_part = self._by_num[self._nums[hi]] if hi < len(self._nums) else None
+
+        return prev, next_part
+
+    def free_extents(self) -> list[tuple[Size, Size]]:
+        """
+        Return free gaps between partitions ordered by position.
+
+        Each gap is a (begin, end) pair. The space before the first partition and
+        after the last one (up to the disk size, if known) is included.
+
+        Returns:
+            list[tuple[Size, Size]]: Free extents ordered by begin.
+        """
+        gaps = []
+        pos = Size(0)
+        for begin, end in self._extents:
+            if begin > pos:
+                gaps.append((pos, begin))
+            pos = max(pos, end)
+
+        if self.size is not None and self.size > pos:
+            gaps.append((pos, self.size))
+
+        return gaps
+
+    def largest_free_extents(self, count: Optional[int] = None, min_size: Size = Size(0)) -> list[tuple[Size, Size]]:
+        """
+        Return free extents larger than `min_size`, largest first.
+
+        Args:
+            count (int, optional): Maximum number of extents to return.
+            min_size (Size): Gaps not larger than this size are ignored.
+
+        Returns:
+            list[tuple[Size, Size]]: (begin, end) pairs ordered by size, descending.
+        """
+        gaps = [g for g in self.free_extents() if g[1] - g[0] > min_size]
+        gaps.sort(key=lambda g: (g[0] - g[1], g[0]))
+        return gaps if count is None else gaps[:count]
+
+    def _set_table_meta(self, disk_data):
+        # Extract partition table from raw disk metadata and assign if valid
+        table = disk_data.get("table")
+        self._set_table(table)
+
+    def _set_table(self, table):
+        if isinstance(table, str) and table in self.SUPPORTED_TABLES:
+            self._table = table
+            self.table = table
+        else:
+            self._table = None
+            self.table = None
+
+    # Sets the partition table type only if it has not already been defined.
+    # This method will not override a value provided by system metadata (e.g., parted).
+    def set_table(self, table="gpt", force=False):
+        if self._table and not force:
+            # Do not override the partition table if it was already set from parted info
+            return
+        if table in self.SUPPORTED_TABLES:
+            self._set_table(table)
+
+    def add_part(self, part: Partition):
+        self._unshare()
+        self._parts.append(part)
+
+        if part.num in self._by_num:
+            self._duplicate = part.num
+        else:
+            bisect.insort(self._nums, part.num)
+        self._by_num[part.num] = part
+
+        if part.begin is not None and part.end is not None:
+            bisect.insort(self._extents, (part.begin, part.end))
+
+    def check(self, errors: ValidationErrors, allow_gaps=False, allow_empty=False) -> bool:
+        """
+        Validate the partition layout, adding every problem found to `errors`.
+
+        Returns:
+            bool: True if no error was found.
+        """
+        count = len(errors)
+
+        if not allow_empty and not self._nums:
+            errors.add(f"Expected at least one partition to be provided for device '{self.disk}'.")
+
+        for part in self._parts:
+            errors.collect(part.validate)
+
+        if self._duplicate:
+            errors.add(f"Duplicate partition number {self._duplicate} detected on disk '{self.disk}'.")
+
+        if not allow_gaps and self._nums:
+            num_min = self._nums[0]
+            num_max = self._nums[-1]
+
+            if len(self._nums) <= (num_max - num_min):
+                errors.add(f"Partition numbers on disk '{self.disk}' contain gaps: {self._nums}.")
+
+        return len(errors) == count
+
+    def validate(self, allow_gaps=False, allow_empty=False):
+        errors = ValidationErrors(f"partitions of disk '{self.disk}'")
+        self.check(errors, allow_gaps, allow_empty)
+        errors.raise_if_any()
+        return True
+
+    def paths(self):
+        """
+        Generate full partition paths for a given disk and list of partition entries.
+
+        Each entry in `parts` must be a dictionary containing the key 'num' (partition number).
+        The resulting path is generated using standard naming conventions:
+        - For SATA/SCSI disks: /dev/sda + 1 → /dev/sda1
+        - For NVMe disks: /dev/nvme0n1 + 1 → /dev/nvme0n1p1
+
+        Args:
+            disk (str): Base disk path (e.g. /dev/sda or /dev/nvme0n1).
+            parts (list): List of partition dictionaries, each with a 'num' key.
+
+        Returns:
+            list[str]: List of full partition paths.
+        """
+        return [p.path() for p in self._parts if p.path()]
+
+    def prev_next_lookup(self, state: "Disk", num: int) -> tuple[Optional[Partition], Optional[Partition]]:
+        return state.neighbours(num)
+
+    def plan(self, required: bool = False) -> list[dict]:
+        """
+        Generate a full plan of actions required to align the requested partitions with the actual disk state.
+
+        New partitions start at the first position after the previous partition that is aligned to the
+        device alignment grain (see alignment_grain()); start and end are emitted as exact sectors.
+        Partition 'end' values are treated as the position of the last (inclusive) sector.
+
+        Args:
+            required (bool): If True, raises errors for partitions that are missing in actual state.
+
+        Returns:
+            list[dict]: List of action plans per partition.
+        """
+
+        result = []
+
+        # copy-on-write view of the state: new partitions are tracked without touching self.state
+        state = self.state.snapshot()
+        state.validate_size()
+
+        sector = state.sector
+
+        for p in self._parts:
+            plan = p.plan(required)
+            if plan:
+                plan["disk_label"] = self.table
+                result.append(plan)
+                continue
+
+            prev, next_part = self.prev_next_lookup(state, p.num)
+
+            next_begin = next_part.begin if next_part else state.last_usable(self.table)
+            part_start = state.align_up(prev.end + sector if prev else state.first_usable(self.table))
+            available_space = next_begin - part_start
+
+            plan = p.plan_template()
+
+            if p.size is None:
+                if next_part:
+                    raise PlanError(
+                        f"Partition {p.num}: no 'size' specified and another partition {next_part.num} follows"
+                    )
+
+                part_end = next_begin - sector
+                parted_end = "100%"
+            else:
+                if available_space < p.size:
+                    raise PlanError(
+                        f"Partition {p.num}: requested size {p.size} exceeds available space ({available_space})"
+                    )
+
+                if next_part and (next_part.num == p.num + 1):
+                    # fill up to the next partition
+                    part_end = next_begin - sector
+                else:
+                    part_end = part_start + p.size.align_up(sector) - sector
+                parted_end = state.to_sectors(part_end)
+
+            part_data = {
+                "num": p.num,
+                "begin": part_start,
+                "end": part_end,
+                "size": part_end + sector - part_start,
+            }
+
+            plan.update({
+                "action": "create",
+                "disk_label": self.table,
+                "part_start": state.to_sectors(part_start),
+                "part_end": parted_end,
+            })
+            result.append(plan)
+
+            # add newly created partition to tracking structures
+            new_part = Partition(part_data, disk=self.disk, sector_size=state.logical_sector_size)
+            new_part.prev = prev
+            new_part.next_part = next_part if next_part and next_part.num == p.num + 1 else None
+            state.add_part(new_part)
+        return result
+
+class PartitionInput:
+    def __init__(self, partitions, allow_gaps=False):
+        if not isinstance(partitions, dict):
+            raise PlanError("Expected 'partitions' to be a dictionary.")
+
+        # all disks are parsed and validated once, errors of all disks are reported together
+        errors = ValidationErrors("'partitions'")
+        disks = []
+        for disk, parts in partitions.items():
+            if not isinstance(parts, list):
+                errors.add(f"Expected a list of partitions for device '{disk}', got {type(parts).__name__}.")
+                continue
+            disks.append(Disk(disk, parts, allow_gaps=allow_gaps, errors=errors))
+        errors.raise_if_any()
+
+        self._disks: tuple[Disk, ...] = tuple(disks)
+    
+    def paths(self):
+        result = []
+        for d in self._disks:
+            result.extend(d.paths())
+        return result
+
+    @staticmethod
+    def parted_by_disk(parted_infos) -> dict:
+        """
+        Return parted info results keyed by disk path.
+
+        Accepts either a dictionary mapping disk paths to parted info results, or the result
+        of a looped parted task (a dictionary with a 'results' list), where each entry is
+        matched by its 'disk.dev' field or by the loop item.
+        """
+        if not isinstance(parted_infos, dict):
+            raise PlanError(
+                f"Expected parted information to be a dictionary, got {type(parted_infos).__name__}."
+            )
+
+        results = parted_infos.get("results")
+        if not isinstance(results, list):
+            return parted_infos
+
+        mapping = {}
+        for res in results:
+            if not isinstance(res, dict):
+                continue
+            item = res.get(res.get("ansible_loop_var", "item"))
+            if isinstance(item, dict):
+                item = item.get("key")
+            disk_data = res.get("disk")
+            disk = (disk_data.get("dev") if isinstance(disk_data, dict) else None) or item
+            if disk:
+                mapping[disk] = res
+        return mapping
+
+    def plan(self, parted_infos, default_label="gpt", required=False) -> dict[str, list[dict]]:
+        """
+        Generate partition plans for all disks in one pass.
+
+        Args:
+            parted_infos (dict): Parted info results for all disks (see parted_by_disk()).
+            default_label (str): Partition table label used for disks without one.
+            required (bool): If True, all requested partitions must already exist.
+
+        Returns:
+            dict[str, list[dict]]: disk path → list of partition plans (see Disk.plan()).
+        """
+        states = self.parted_by_disk(parted_infos)
+
+        result = {}
+        for req in self._disks:
+            parted_info = states.get(req.disk)
+            if not isinstance(parted_info, dict):
+                raise PlanError(f"No parted information found for disk '{req.disk}'.")
+
+            state = Disk.from_parted(parted_info)
+            req.set_state_disk(state)
+            req.set_table(default_label)
+
+            result[req.disk] = req.plan(required=required)
+        return result
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Helpers for keeping /etc/fstab entries of logical volumes.
+
+Adds or updates one line per mount point and leaves every other line (comments included) untouched.
+"""
+
+DOCUMENTATION = r'''
+---
+module_utils: fstab
+author: Alexander Ursu
+short_description: Update fstab entries of mount points
+description:
+  - C(update_fstab) ensures one fstab line per requested mount point. An existing line for the mount point
+    is replaced if any of its fields differ, otherwise a new line is appended.
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> update_fstab("", [fstab_entry("/dev/data/data1", "/mnt/data1", "xfs")])
+('/dev/data/data1 /mnt/data1 xfs defaults 0 0\n', ['/mnt/data1'])
+'''
+
+RETURN = r'''
+fstab_entry:
+  description: fstab fields (C(src), C(target), C(fstype), C(opts), C(dump), C(passno)).
+  type: dict
+  returned: when called
+
+update_fstab:
+  description: Tuple of the new fstab content and the mount points whose lines were added or changed.
+  type: tuple
+  returned: when called
+'''
+
+def _escape(value: str) -> str:
+    # fstab fields are separated by whitespace; see fstab(5)
+    return value.replace("\\", "\\134").replace(" ", "\\040").replace("\t", "\\011").replace("\n", "\\012")
+
+def fstab_entry(src: str, target: str, fstype: str, opts: str = "defaults", dump: int = 0, passno: int = 0) -> dict:
+    return {"src": src, "target": target, "fstype": fstype, "opts": opts, "dump": dump, "passno": passno}
+
+def format_entry(entry: dict) -> str:
+    return " ".join((
+        _escape(entry["src"]), _escape(entry["target"]), entry["fstype"], entry["opts"],
+        str(entry["dump"]), str(entry["passno"]),
+    ))
+
+def update_fstab(text: str, entries: list) -> tuple[str, list]:
+    """
+    Return (new content, changed mount points) of an fstab `text` with a line for every entry.
+    """
+    wanted = {_escape(e["target"]): e for e in entries}
+    lines = text.splitlines()
+
+    changed = []
+    seen = set()
+    for i, line in enumerate(lines):
+        fields = line.split()
+        if not fields or fields[0].startswith("#") or len(fields) < 2:
+            continue
+        entry = wanted.get(fields[1])
+        if entry is None or fields[1] in seen:
+            continue
+        seen.add(fields[1])
+        new = format_entry(entry)
+        if fields != new.split():
+            lines[i] = new
+            changed.append(entry["target"])
+
+    for target, entry in wanted.items():
+        if target not in seen:
+            lines.append(format_entry(entry))
+            changed.append(entry["target"])
+
+    return ("\n".join(lines) + "\n" if lines else ""), changed
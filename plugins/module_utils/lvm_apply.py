@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+LVM command lines for physical volume, volume group and logical volume plans.
+
+Turns the plans of VolumeGroup.plan_pvs() and VolumeInput.plan() into pvcreate, vgcreate/vgextend
+and lvcreate argument lists, and runs them through the lvm binary: one by one, or in lvm shell
+sessions, which load the configuration and scan the devices once for many commands.
+"""
+
+import json
+import shlex
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.size_utils import Size
+
+DOCUMENTATION = r'''
+---
+module_utils: lvm_apply
+author: Alexander Ursu
+short_description: Build and run LVM commands from PV and LV plans
+description:
+  - C(pv_commands) returns the C(pvcreate) and C(vgcreate) or C(vgextend) commands converging a volume group
+    to a PV plan. C(lvcreate_args) returns the C(lvcreate) command of a requested volume, striped across
+    C(stripes) PVs (C(-i), C(-I)) if requested.
+  - Commands are argument lists for the C(lvm) binary (e.g. C(["pvcreate", "/dev/sdb1"])), so they can be run
+    as C(lvm <command>) without resolving every LVM tool.
+  - C(run_lvm_batch) runs many commands in C(lvm) shell processes. Every command reports its outcome in a
+    JSON command log (C(--reportformat json) with C(log/report_command_log=1)), which is parsed per command.
+  - A batch stops at the first failure. Since the shell runs every line it is given, only consecutive
+    C(lvcreate) commands of absolute sizes share a shell session; commands later ones depend on
+    (C(pvcreate), C(vgcreate), C(vgextend), C(lvcreate) of relative sizes) run in a session of their own.
+requirements:
+  - lvm2
+'''
+
+EXAMPLES = r'''
+>>> pv_commands("data", [{"path": "/dev/sdb1", "action": "create"}, {"path": "/dev/sdc1", "action": "add"}], True)
+[['pvcreate', '/dev/sdb1'], ['vgextend', 'data', '/dev/sdb1', '/dev/sdc1']]
+
+>>> lvcreate_args({"name": "data1", "vg": "data", "size": "100%FREE"})
+['lvcreate', '--yes', '-n', 'data1', '-l', '100%FREE', 'data']
+
+>>> lvcreate_args({"name": "data2", "vg": "data", "size": "1t", "stripes": 4, "stripe_size": "256k"})
+['lvcreate', '--yes', '-n', 'data2', '-L', '1t', '-i', '4', '-I', '256k', 'data']
+'''
+
+RETURN = r'''
+pv_commands:
+  description: List of lvm commands (argument lists without the lvm binary), in execution order.
+  type: list
+  elements: list
+  returned: when called
+
+lvcreate_args:
+  description: lvcreate command (argument list without the lvm binary).
+  type: list
+  elements: str
+  returned: when called
+
+run_lvm:
+  description: Standard output of the command.
+  type: str
+  returned: when called
+  raises:
+    - LvmError if the command fails
+
+batch_sessions:
+  description: Commands grouped into lvm shell sessions, in command order.
+  type: list
+  elements: list
+  returned: when called
+
+run_lvm_batch:
+  description:
+    - One result per command (C(command), C(ok), C(messages)), in command order.
+    - Commands which did not run because an earlier one failed have C(skipped) set.
+  type: list
+  elements: dict
+  returned: when called
+  raises:
+    - LvmError if the lvm shell output can not be attributed to the commands
+'''
+
+# every command run in the shell reports its outcome as a JSON command log
+REPORT_OPTIONS = ["--reportformat", "json", "--config", "log/report_command_log=1"]
+
+class LvmError(Exception):
+    def __init__(self, msg, rc=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.rc = rc
+
+def pv_commands(vg_name: str, pv_plan: list, vg_exists: bool) -> list:
+    """
+    Return the commands converging `vg_name` to `pv_plan` (see PhysicalVolume.plan()).
+
+    New devices are initialized with pvcreate first; a missing VG is created with all planned PVs,
+    an existing one is extended with the PVs which are not in it yet.
+    """
+    created = [p["path"] for p in pv_plan if p.get("action") == "create"]
+    added = [p["path"] for p in pv_plan if p.get("action") in ("create", "add")]
+
+    commands = []
+    if created:
+        commands.append(["pvcreate"] + created)
+    if not vg_exists:
+        commands.append(["vgcreate", vg_name] + [p["path"] for p in pv_plan])
+    elif added:
+        commands.append(["vgextend", vg_name] + added)
+    return commands
+
+def lvcreate_args(volume: dict) -> list:
+    # relative sizes ('100%FREE', '50%VG') are extents (-l), absolute sizes are -L
+    option = "-l" if Size.relative(volume["size"]) else "-L"
+    args = ["lvcreate", "--yes", "-n", volume["name"], option, volume["size"]]
+
+    stripes = int(volume.get("stripes") or 1)
+    if stripes > 1:
+        args += ["-i", str(stripes)]
+        if volume.get("stripe_size"):
+            # lvcreate reads -I in KiB
+            args += ["-I", f"{Size.parse(volume['stripe_size']).bytes // 1024}k"]
+    return args + [volume["vg"]]
+
+def run_lvm(module, lvm, args):
+    """
+    Run `lvm <args>` and return its output.
+
+    Raises:
+        LvmError: If the command fails.
+    """
+    rc, out, err = module.run_command([lvm] + list(args), environ_update={"LC_ALL": "C"})
+    if rc != 0:
+        raise LvmError(f"lvm {args[0]} failed: {(err or out).strip()}", rc)
+    return out
+
+def shell_script(commands: list) -> str:
+    """
+    Return the lvm shell input running `commands`, each with a JSON command log.
+    """
+    lines = [shlex.join([args[0]] + REPORT_OPTIONS + list(args[1:])) for args in commands]
+    lines.append("exit")
+    return "\n".join(lines) + "\n"
+
+def parse_command_logs(output: str) -> list:
+    """
+    Return (ok, messages) for every JSON command log in `output`, in order.
+
+    Text between the JSON documents (shell prompts, messages printed outside the log) is skipped.
+    """
+    decoder = json.JSONDecoder()
+    results = []
+    pos = output.find("{")
+    while pos != -1:
+        try:
+            doc, end = decoder.raw_decode(output, pos)
+        except ValueError:
+            pos = output.find("{", pos + 1)
+            continue
+        pos = output.find("{", end)
+        log = doc.get("log") if isinstance(doc, dict) else None
+        if not isinstance(log, list):
+            continue
+
+        messages = [e.get("log_message", "") for e in log if e.get("log_type") in ("error", "warn")]
+        status = [e for e in log if e.get("log_type") == "status" and e.get("log_object_type") == "cmd"]
+        if status:
+            ok = status[-1].get("log_ret_code") == "1"
+        else:
+            ok = not any(e.get("log_type") == "error" for e in log)
+        results.append((ok, [m for m in messages if m]))
+    return results
+
+def batch_sessions(commands: list) -> list:
+    """
+    Split `commands` into the groups which can run in one lvm shell session.
+
+    Commands depending on the outcome of the previous ones must not run after a failure, and the shell runs every
+    line it is given, so only consecutive lvcreate commands of absolute sizes share a session. pvcreate, vgcreate,
+    vgextend and lvcreate of relative sizes ('100%FREE', '50%VG') run in a session of their own.
+    """
+    sessions = []
+    shared = False
+    for args in commands:
+        independent = args[0] == "lvcreate" and "-L" in args
+        if independent and shared:
+            sessions[-1].append(list(args))
+        else:
+            sessions.append([list(args)])
+        shared = independent
+    return sessions
+
+def run_lvm_shell(module, lvm, commands):
+    """
+    Run `commands` in one lvm shell process and return their results, or None if the shell can not be started.
+
+    Raises:
+        LvmError: If the lvm shell produced no command logs.
+    """
+    rc, out, err = module.run_command([lvm], data=shell_script(commands), environ_update={"LC_ALL": "C"})
+    logs = parse_command_logs(out)
+    if not logs:
+        if rc == 0:
+            raise LvmError(f"Unable to read the command logs of the lvm shell: {(err or out).strip()}", rc)
+        module.warn(f"lvm shell is not available ({(err or out).strip()}), running the commands one by one")
+        return None
+
+    results = [
+        {"command": list(args), "ok": ok, "messages": messages}
+        for args, (ok, messages) in zip(commands, logs)
+    ]
+    # the shell stopped early; the remaining commands have no outcome
+    for args in commands[len(logs):]:
+        results.append({"command": list(args), "ok": False, "messages": ["no result reported by lvm shell"]})
+    return results
+
+def run_lvm_batch(module, lvm, commands, shell=True) -> list:
+    """
+    Run `commands` and return one result per command with 'command', 'ok' and 'messages' keys.
+
+    With `shell` the commands run in lvm shell sessions (see batch_sessions(); a single command runs directly);
+    if the shell can not be started (e.g. lvm is built without readline support) they run one by one.
+    The batch stops at the first failed session or command; the commands which did not run are reported
+    with 'skipped' set.
+
+    Raises:
+        LvmError: If the lvm shell produced no command logs.
+    """
+    sessions = batch_sessions(commands) if shell else [[list(args)] for args in commands]
+
+    results = []
+    for session in sessions:
+        session_results = None
+        if shell and len(session) > 1:
+            session_results = run_lvm_shell(module, lvm, session)
+            shell = session_results is not None
+        if session_results is None:
+            session_results = []
+            for args in session:
+                try:
+                    run_lvm(module, lvm, args)
+                    session_results.append({"command": list(args), "ok": True, "messages": []})
+                except LvmError as e:
+                    session_results.append({"command": list(args), "ok": False, "messages": [e.msg]})
+                    break
+        results.extend(session_results)
+        if not all(r["ok"] for r in session_results):
+            break
+
+    for args in commands[len(results):]:
+        results.append({"command": list(args), "ok": False, "skipped": True,
+                        "messages": ["not run, an earlier lvm command failed"]})
+    return results
+
+def batch_error(results: list) -> "LvmError":
+    """
+    Return an LvmError describing the failed commands of `results`, or None if all succeeded.
+    """
+    failed = [r for r in results if not r["ok"] and not r.get("skipped")]
+    if not failed:
+        return None
+    details = "; ".join(f"{' '.join(r['command'])}: {' '.join(r['messages']) or 'failed'}" for r in failed)
+    skipped = len(results) - len(failed) - sum(1 for r in results if r["ok"])
+    msg = f"{len(failed)} of {len(results)} lvm commands failed: {details}"
+    if skipped:
+        msg += f" ({skipped} not run)"
+    return LvmError(msg)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Helpers restricting the devices LVM scans to the physical volumes of the collection.
+
+Either the LVM devices file (maintained with lvmdevices) or a generated devices/global_filter lists
+the allowed devices; scanned_devices() tells which of the block devices of a host LVM would still scan.
+"""
+
+import os
+import re
+
+DOCUMENTATION = r'''
+---
+module_utils: lvm_devices
+author: Alexander Ursu
+short_description: Manage the LVM devices file or global_filter
+description:
+  - C(parse_devices_file) reads the entries of an LVM devices file (C(/etc/lvm/devices/system.devices)).
+    C(devices_file_commands) returns the C(lvmdevices --adddev) and C(--deldev) commands converging it to a
+    list of device paths.
+  - C(global_filter) returns a C(devices/global_filter) accepting exactly the given device paths.
+    C(update_config_block) keeps it in a marked block of an LVM configuration file (C(lvmlocal.conf)).
+  - C(scanned_devices) applies the devices file and global_filter to a list of device paths the way LVM
+    does, matching device names only (LVM also matches the entries by device ID and the filter against
+    every symlink of a device).
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> global_filter(["/dev/sdb1", "/dev/mapper/mpath.a"])
+['a|^/dev/sdb1$|', 'a|^/dev/mapper/mpath[.]a$|', 'r|.*|']
+
+>>> scanned_devices(["/dev/sda1", "/dev/sdb1"], {"use_devicesfile": False, "global_filter": ["a|^/dev/sdb1$|", "r|.*|"]})
+['/dev/sdb1']
+'''
+
+RETURN = r'''
+parse_devices_file:
+  description: Devices file entries (C(IDTYPE), C(IDNAME), C(DEVNAME), C(PVID), ...), in file order.
+  type: list
+  elements: dict
+  returned: when called
+
+devices_file_commands:
+  description: lvmdevices commands (argument lists without the lvm binary).
+  type: list
+  elements: list
+  returned: when called
+
+update_config_block:
+  description: Tuple of the new configuration file content and whether it differs from the old one.
+  type: tuple
+  returned: when called
+
+scanned_devices:
+  description: Device paths LVM would scan, in input order.
+  type: list
+  elements: str
+  returned: when called
+'''
+
+DEVICES_DIR = "/etc/lvm/devices"
+DEVICES_FILE = "system.devices"
+LVMLOCAL_CONF = "/etc/lvm/lvmlocal.conf"
+SYS_BLOCK = "/sys/class/block"
+
+BLOCK_BEGIN = "# BEGIN aursu.lvm_setup global_filter"
+BLOCK_END = "# END aursu.lvm_setup global_filter"
+
+# characters with a meaning in LVM filter regexes; bracketed so the config string needs no backslashes
+_SPECIAL = set(".[]()*+?^$|{}")
+
+def parse_devices_file(text: str) -> list:
+    """
+    Return the device entries of a devices file `text`; comments and the VERSION line are skipped.
+    """
+    entries = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = dict(field.split("=", 1) for field in line.split() if "=" in field)
+        if "IDTYPE" in fields:
+            entries.append(fields)
+    return entries
+
+def read_devices_file(name: str = DEVICES_FILE, devices_dir: str = DEVICES_DIR):
+    """
+    Return the entries of the devices file `name` (devices/devicesfile), or None if there is no devices file.
+    """
+    try:
+        with open(os.path.join(devices_dir, name)) as f:
+            return parse_devices_file(f.read())
+    except FileNotFoundError:
+        return None
+
+def devices_file_commands(entries: list, paths: list, exclusive: bool = False, devicesfile: str = None) -> list:
+    """
+    Return the lvmdevices commands adding the `paths` missing in the devices file `entries` and, if `exclusive`,
+    removing the entries of other devices.
+    """
+    options = ["--yes"] + (["--devicesfile", devicesfile] if devicesfile else [])
+    present = [e.get("DEVNAME") for e in entries or []]
+
+    commands = [["lvmdevices"] + options + ["--adddev", path] for path in dict.fromkeys(paths) if path not in present]
+    if exclusive:
+        commands += [
+            ["lvmdevices"] + options + ["--deldev", name]
+            for name in present if name and name not in paths
+        ]
+    return commands
+
+def _literal(path: str) -> str:
+    if '"' in path or "\\" in path:
+        raise ValueError(f"Device path '{path}' can not be used in an LVM filter.")
+    return "".join(f"[{c}]" if c in _SPECIAL else c for c in path)
+
+def global_filter(paths: list) -> list:
+    """
+    Return a global_filter accepting exactly `paths` and rejecting every other device.
+    """
+    return [f"a|^{_literal(path)}$|" for path in dict.fromkeys(paths)] + ["r|.*|"]
+
+def config_block(patterns: list) -> str:
+    items = ", ".join(f'"{p}"' for p in patterns)
+    return f"{BLOCK_BEGIN}\ndevices {{\n\tglobal_filter = [ {items} ]\n}}\n{BLOCK_END}\n"
+
+def update_config_block(text: str, patterns: list) -> tuple[str, bool]:
+    """
+    Return (new content, changed) of an LVM configuration `text` with the marked global_filter block.
+
+    The block is replaced in place if it exists, otherwise appended; the rest of the file is kept as is.
+    """
+    block = config_block(patterns)
+    start = text.find(BLOCK_BEGIN)
+    end = text.find(BLOCK_END, start) if start != -1 else -1
+    if start != -1 and end != -1:
+        end = text.find("\n", end)
+        end = len(text) if end == -1 else end + 1
+        content = text[:start] + block + text[end:]
+    else:
+        content = text + ("\n" if text and not text.endswith("\n") else "") + block
+    return content, content != text
+
+def parse_lvmconfig(output: str) -> dict:
+    """
+    Return the settings printed by `lvmconfig`: integers as int, arrays as lists of strings.
+    """
+    settings = {}
+    for line in output.splitlines():
+        key, sep, value = line.strip().partition("=")
+        # unset settings are printed commented out
+        if not sep or key.startswith("#"):
+            continue
+        value = value.strip()
+        if value.startswith("["):
+            settings[key.strip()] = [m.replace('\\"', '"') for m in re.findall(r'"((?:[^"\\]|\\.)*)"', value)]
+        elif value.startswith('"'):
+            settings[key.strip()] = value.strip('"')
+        else:
+            try:
+                settings[key.strip()] = int(value)
+            except ValueError:
+                settings[key.strip()] = value
+    return settings
+
+def _accepted(path: str, patterns: list) -> bool:
+    # the first matching pattern decides; devices matching no pattern are accepted
+    for pattern in patterns or []:
+        if len(pattern) < 3 or pattern[0] not in "ar":
+            continue
+        end = pattern.rfind(pattern[1], 2)
+        if re.search(pattern[2:end] if end != -1 else pattern[2:], path):
+            return pattern[0] == "a"
+    return True
+
+def scanned_devices(devices: list, config: dict) -> list:
+    """
+    Return the `devices` LVM scans with `config` (C(use_devicesfile), devices file C(devices), C(global_filter)).
+
+    A devices file only restricts scanning if it is enabled and exists (C(devices) is not None).
+    """
+    allowed = None
+    if config.get("use_devicesfile") and config.get("devices") is not None:
+        allowed = set(config["devices"])
+
+    return [
+        path for path in devices
+        if (allowed is None or path in allowed) and _accepted(path, config.get("global_filter"))
+    ]
+
+def block_devices(sys_block: str = SYS_BLOCK) -> list:
+    """
+    Return the /dev paths of all block devices of the host; device-mapper devices by their /dev/mapper name.
+    """
+    try:
+        names = sorted(os.listdir(sys_block))
+    except FileNotFoundError:
+        return []
+
+    paths = []
+    for name in names:
+        try:
+            with open(os.path.join(sys_block, name, "dm", "name")) as f:
+                paths.append("/dev/mapper/" + f.read().strip())
+                continue
+        except OSError:
+            pass
+        paths.append("/dev/" + name.replace("!", "/"))
+    return paths
@@ -0,0 +1,1318 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+LVM models: devices, physical volumes, volume groups and logical volumes, and their planning.
+
+Used by the filter plugins on the controller and by modules planning on the managed node.
+"""
+
+import os.path
+import re
+from abc import ABC
+from typing import Any, Optional
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.size_utils import LVM_UNITS, Size
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.validation import PlanError, ValidationErrors
+
+DOCUMENTATION = r'''
+---
+module_utils: lvm_helpers
+author: Alexander Ursu
+short_description: LVM models and planning
+description:
+  - C(LvmInfo) indexes C(lvm_report) results, C(Device) wraps C(dev_probe) results, and C(PhysicalVolume),
+    C(VolumeGroup), C(LogicalVolume) and C(VolumeInput) plan physical and logical volumes against them.
+  - Errors are raised as C(PlanError) (see C(validation)).
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> VolumeGroup.from_lvm_info("data", lvm_info).plan_pvs(["/dev/sdb1"])
+[{'path': '/dev/sdb1', 'action': 'create'}]
+
+>>> VolumeInput([{"name": "data1", "vg": "data", "size": "10g"}]).plan(lvm_info, dev_infos)
+[{'name': 'data1', 'path': '/dev/data/data1', 'action': 'create'}]
+'''
+
+RETURN = r'''
+VolumeInput.plan:
+  description: One plan per volume with C(name), C(path) and C(action) (see C(validate_volumes)).
+  type: list
+  elements: dict
+  returned: when called
+'''
+
+# +---------------------------------------+--------------------------------------------------------+
+# | Empty dev_info & lvm_info             | Formatted dev_info & lvm_info                          |
+# +---------------------------------------+--------------------------------------------------------+
+# | "dev_info": {                         | "dev_info": {                                          |
+# |     "changed": false,                 |     "blkid": {                                         |
+# |     "failed": false,                  |         "block_size": "4096",                          |
+# |     "filetype": "b",                  |         "dev_name": "/dev/data/data1",                 |
+# |     "is_exists": true,                |         "type": "xfs",                                 |
+# |     "stat": {                         |         "uuid": "66310f17-f78d-421e-ae23-154fd646d32f" |
+# |         "atime": 1747406171.799727,   |     },                                                 |
+# |         "ctime": 1747406109.8289678,  |     "changed": false,                                  |
+# |         "dev": 5,                     |     "failed": false,                                   |
+# |         "gid": 6,                     |     "filetype": "b",                                   |
+# |         "ino": 2283,                  |     "is_exists": true,                                 |
+# |         "mode": 25008,                |     "stat": {                                          |
+# |         "mtime": 1747406109.8289678,  |         "atime": 1747406302.2787282,                   |
+# |         "nlink": 1,                   |         "ctime": 1747406302.275689,                    |
+# |         "rdev": 64513,                |         "dev": 5,                                      |
+# |         "size": 0,                    |         "gid": 6,                                      |
+# |         "uid": 0                      |         "ino": 2270,                                   |
+# |     }                                 |         "mode": 25008,                                 |
+# | }                                     |         "mtime": 1747406302.275689,                    |
+# |                                       |         "nlink": 1,                                    |
+# |                                       |         "rdev": 64512,                                 |
+# |                                       |         "size": 0,                                     |
+# |                                       |         "uid": 0                                       |
+# |                                       |     }                                                  |
+# |                                       | }                                                      |
+# +---------------------------------------+--------------------------------------------------------+
+# | "lvm_info": {                         | "lvm_info": {                                          |
+# |     "changed": false,                 |     "changed": false,                                  |
+# |     "failed": false,                  |     "failed": false,                                   |
+# |     "lv": [],                         |     "lv": [                                            |
+# |     "pv": [],                         |         {                                              |
+# |     "vg": [                           |             "convert_lv": "",                          |
+# |         {                             |             "copy_percent": "",                        |
+# |             "lv_count": "0",          |             "data_percent": "",                        |
+# |             "pv_count": "2",          |             "lv_attr": "-wi-a-----",                   |
+# |             "snap_count": "0",        |             "lv_name": "data1",                        |
+# |             "vg_attr": "wz--n-",      |             "lv_size": "204800.00m",                   |
+# |             "vg_free": "1710944.00m", |             "metadata_percent": "",                    |
+# |             "vg_name": "data",        |             "mirror_log": "",                          |
+# |             "vg_size": "1710944.00m"  |             "move_pv": "",                             |
+# |         }                             |             "origin": "",                              |
+# |     ]                                 |             "pool_lv": "",                             |
+# | }                                     |             "vg_name": "data"                          |
+# |                                       |         },                                             |
+# |                                       |         {                                              |
+# |                                       |             "convert_lv": "",                          |
+# |                                       |             "copy_percent": "",                        |
+# |                                       |             "data_percent": "",                        |
+# |                                       |             "lv_attr": "-wi-a-----",                   |
+# |                                       |             "lv_name": "data2",                        |
+# |                                       |             "lv_size": "204800.00m",                   |
+# |                                       |             "metadata_percent": "",                    |
+# |                                       |             "mirror_log": "",                          |
+# |                                       |             "move_pv": "",                             |
+# |                                       |             "origin": "",                              |
+# |                                       |             "pool_lv": "",                             |
+# |                                       |             "vg_name": "data"                          |
+# |                                       |         }                                              |
+# |                                       |     ],                                                 |
+# |                                       |     "pv": [],                                          |
+# |                                       |     "vg": [                                            |
+# |                                       |         {                                              |
+# |                                       |             "lv_count": "2",                           |
+# |                                       |             "pv_count": "2",                           |
+# |                                       |             "snap_count": "0",                         |
+# |                                       |             "vg_attr": "wz--n-",                       |
+# |                                       |             "vg_free": "1301344.00m",                  |
+# |                                       |             "vg_name": "data",                         |
+# |                                       |             "vg_size": "1710944.00m"                   |
+# |                                       |         }                                              |
+# |                                       |     ]                                                  |
+# |                                       | }                                                      |
+# +---------------------------------------+--------------------------------------------------------+
+def to_size(value: Optional[str], name: str = "size") -> Size:
+    """
+    Convert an LVM size string (e.g. '204800.00m', '<1.82t', '200g') into an exact Size.
+
+    Missing or empty values are treated as zero.
+
+    Raises:
+        PlanError: If the value can not be converted.
+    """
+    if not value:
+        return Size(0)
+    try:
+        # LVM marks values rounded down for display with a leading '<'
+        return Size.parse(value.lstrip("<") if isinstance(value, str) else value)
+    except ValueError as e:
+        raise PlanError(f"Invalid '{name}' value {value!r}: {e}")
+
+_REPORTED_SIZE_RE = re.compile(r"^\s*<?([0-9]*\.?[0-9]+)([bkmgtpe])\s*$", re.IGNORECASE)
+
+def same_reported_size(value: Optional[str], size: Size) -> bool:
+    """
+    Return True if the LVM size string `value` is how LVM reports `size`.
+
+    LVM prints sizes with two decimals in the report unit, so small sizes are rounded
+    (a 64KiB stripe size is reported as '0.06m' with '--units m').
+    """
+    match = _REPORTED_SIZE_RE.match(value) if isinstance(value, str) else None
+    if match is None:
+        return to_size(value) == size
+    unit = LVM_UNITS[match.group(2).lower()]
+    return f"{float(match.group(1)):.2f}" == f"{size.bytes / unit:.2f}"
+
+class Device:
+    __slots__ = ("_path", "_is_exists", "_stat_error", "_filetype", "_fs_type", "_mount", "raw_info")
+
+    def __init__(self, path):
+        """
+        Represents a device with a given absolute path.
+
+        Args:
+            path (str): The absolute path to the device (e.g., /dev/sda).
+
+        Raises:
+            PlanError: If the path is not a string or not an absolute path.
+        """
+        if isinstance(path, str) and os.path.isabs(path):
+            self._path = path
+        else:
+            raise PlanError(f"Invalid device path: {path!r}. Must be an absolute path string.")
+
+        # Initially assume the device does not exist
+        self._is_exists: bool = False
+        self._stat_error: Optional[str] = None
+        self._filetype: Optional[str] = None
+        self._fs_type: Optional[str] = None
+        self._mount: list[dict[str, str]] = []
+
+        # No device info available at instantiation
+        self.raw_info: dict[str, Any] = {}
+
+    @classmethod
+    def from_dev_info(cls, path: str, dev_info: dict[str, Any]) -> "Device":
+        """
+        Create a Device instance from a given path and device information.
+
+        Args:
+            path (str): The absolute path to the device (e.g., "/dev/sda1").
+            dev_info (dict[str, Any]): Dictionary containing device metadata.
+
+        Returns:
+            Device: An initialized Device object.
+
+        Raises:
+            PlanError: If dev_info is not a dictionary.
+        """
+        if not isinstance(dev_info, dict):
+            raise PlanError(f"Expected device information 'dev_info' to be a dictionary for {path}, got {type(dev_info).__name__}")
+
+        obj = cls(path)
+        obj.from_metadata(dev_info)
+
+        return obj
+    
+    @staticmethod
+    def is_dev_info_map(dev_info: Any) -> bool:
+        """
+        Return True if `dev_info` maps device paths to device information (e.g. the result of
+        aursu.lvm_setup.dev_probe, or its 'devices' entry) rather than describing a single device.
+        """
+        if not isinstance(dev_info, dict):
+            return False
+        if isinstance(dev_info.get("devices"), dict):
+            return True
+        return any(isinstance(key, str) and key.startswith("/") for key in dev_info)
+
+    @classmethod
+    def from_dev_info_map(cls, dev_infos: dict[str, Any], paths: Optional[list[str]] = None) -> dict[str, "Device"]:
+        """
+        Create Device instances for many paths from a path → dev_info map.
+
+        Args:
+            dev_infos (dict): Device information keyed by path, or a dev_probe result with a 'devices' map.
+            paths (list[str], optional): Paths to create devices for (all paths of the map by default).
+                                         Paths missing from the map get a non-existing device.
+
+        Returns:
+            dict[str, Device]: path → Device
+
+        Raises:
+            PlanError: If dev_infos is not a dictionary.
+        """
+        if not isinstance(dev_infos, dict):
+            raise PlanError(f"Expected device information map to be a dictionary, got {type(dev_infos).__name__}")
+
+        devices = dev_infos.get("devices")
+        if not isinstance(devices, dict):
+            devices = dev_infos
+
+        if paths is None:
+            paths = list(devices)
+        return {path: cls.from_dev_info(path, devices.get(path) or {}) for path in paths}
+
+    @classmethod
+    def from_dev_info_lookup(cls, path: str, dev_info: dict[str, Any], aliases: tuple = ()) -> "Device":
+        """
+        Create a Device from either the device information of `path` itself or a path → dev_info map.
+
+        In a map, `path` is looked up first and then each of `aliases` (e.g. the device mapper path of an LV).
+        """
+        if not cls.is_dev_info_map(dev_info):
+            return cls.from_dev_info(path, dev_info)
+
+        devices = cls.from_dev_info_map(dev_info, [path, *aliases])
+        return next((dev for dev in devices.values() if dev.raw_info), devices[path])
+
+    def _set_existence_flag(self, dev_info: dict[str, Any]) -> None:
+        """Set the internal existence flag based on dev_info."""
+        self._is_exists = bool(dev_info.get("is_exists", False))
+
+    def _set_stat_error(self, dev_info: dict[str, Any]) -> None:
+        """Set the internal existence flag based on dev_info."""
+        self._stat_error = dev_info.get('stat', {}).get('error')
+    
+    def _set_filetype(self, dev_info: dict[str, Any]) -> None:
+        self._filetype = dev_info.get('filetype')
+    
+    def _set_filesystem_type(self, dev_info: dict[str, Any]) -> None:
+        self._fs_type = dev_info.get('blkid', {}).get('type')
+
+    def _set_mount_points(self, dev_info: dict[str, Any]) -> None:
+        self._mount = dev_info.get('mount', [])
+
+    def from_metadata(self, dev_info: dict[str, Any]) -> None:
+        self._set_existence_flag(dev_info)
+        self._set_stat_error(dev_info)
+        self._set_filetype(dev_info)
+        self._set_filesystem_type(dev_info)
+        self._set_mount_points(dev_info)
+
+        self.raw_info = dev_info
+
+    @property
+    def is_exists(self) -> bool:
+        return self._is_exists
+    
+    @property
+    def path(self) -> str:
+        return self._path
+    
+    @property
+    def fs_type(self) -> str:
+        return self._fs_type
+    
+    def is_stat_error(self) -> bool:
+        return bool(self._stat_error)
+    
+    def is_block_device(self) -> bool:
+        return self._filetype == "b"
+    
+    def has_filesystem(self) -> bool:
+        return bool(self.fs_type)
+
+    def is_lvm2_member(self) -> bool:
+        return self.fs_type == "LVM2_member"
+    
+    def validate_lvm(self) -> bool:
+        """
+        Validate the device for use as an LVM physical volume.
+
+        Raises:
+            PlanError: If the device is invalid for LVM use.
+        """
+        if not self.is_exists:
+            raise PlanError(f"Partition {self.path} does not exist.")
+        
+        if self.is_stat_error():
+            raise PlanError(f"Partition file {self.path} stat error: {self._stat_error}")
+        
+        if not self.is_block_device():
+            raise PlanError(f"Partition {self.path} is not a block device (actual filetype is {self._filetype}).")
+        
+        if self.has_filesystem() and not self.is_lvm2_member():
+            raise PlanError(f"Partition {self.path} contains unexpected filesystem: {self.fs_type}")
+
+        return True
+
+    def validate_mount(self, mountpoint: str):
+        if self.is_exists and mountpoint:
+            for mount in self._mount:
+                target = mount.get("target")
+                if target and target == mountpoint:
+                    return True
+        return False
+
+class LvmInfo:
+    def __init__(self, lvm_info: dict[str, Any], context: str = ""):
+        """
+        Parsed and indexed snapshot of an lvm_info payload.
+
+        The payload is scanned once; PV, VG and LV entries are then looked up through
+        dictionaries keyed by pv_name, vg_name and (vg_name, lv_name).
+
+        Args:
+            lvm_info (dict): LVM info structure with "pv", "vg" and "lv" entries.
+            context (str): Optional context string for error messages.
+
+        Raises:
+            PlanError: If lvm_info is not a dictionary.
+        """
+        if not isinstance(lvm_info, dict):
+            raise PlanError(
+                f"Expected LVM information 'lvm_info' to be a dictionary{context}, "
+                f"got {type(lvm_info).__name__}"
+            )
+
+        self._pvs: dict[str, dict[str, str]] = {}
+        self._vgs: dict[str, dict[str, str]] = {}
+        # (vg_name, lv_name) → (position in "lv" list, raw entry)
+        self._lvs: dict[tuple[str, str], tuple[int, dict[str, str]]] = {}
+        # (vg_name, lv_name) → segment entries in report order
+        self._segs: dict[tuple[str, str], list[dict[str, str]]] = {}
+
+        # vg_name → ordered member names
+        self._vg_pvs: dict[str, list[str]] = {}
+        self._vg_lvs: dict[str, list[str]] = {}
+
+        for pv in lvm_info.get("pv", []):
+            pv_name = pv.get("pv_name")
+            if pv_name is None or pv_name in self._pvs:
+                continue
+            self._pvs[pv_name] = pv
+            vg_name = pv.get("vg_name")
+            if vg_name:
+                self._vg_pvs.setdefault(vg_name, []).append(pv_name)
+
+        for vg in lvm_info.get("vg", []):
+            self._vgs.setdefault(vg.get("vg_name"), vg)
+
+        for idx, lv in enumerate(lvm_info.get("lv", [])):
+            vg_name = lv.get("vg_name")
+            lv_name = lv.get("lv_name")
+            if lv_name is None or (vg_name, lv_name) in self._lvs:
+                continue
+            self._lvs[(vg_name, lv_name)] = (idx, lv)
+            self._vg_lvs.setdefault(vg_name, []).append(lv_name)
+
+        for seg in lvm_info.get("seg", []):
+            self._segs.setdefault((seg.get("vg_name"), seg.get("lv_name")), []).append(seg)
+
+        self.raw_info = lvm_info
+
+    @classmethod
+    def from_lvm_info(cls, lvm_info: Any, context: str = "") -> "LvmInfo":
+        """
+        Return lvm_info as an LvmInfo object, parsing it only if it is a raw payload.
+        """
+        if isinstance(lvm_info, cls):
+            return lvm_info
+        return cls(lvm_info, context)
+
+    def pv(self, pv_name: str) -> Optional[dict[str, str]]:
+        return self._pvs.get(pv_name)
+
+    def vg(self, vg_name: str) -> Optional[dict[str, str]]:
+        return self._vgs.get(vg_name)
+
+    def lv(self, vg_name: str, lv_name: str) -> Optional[tuple[int, dict[str, str]]]:
+        """
+        Return (index, raw entry) of the LV within the "lv" list, or None if not found.
+        """
+        return self._lvs.get((vg_name, lv_name))
+
+    def segments(self, vg_name: str, lv_name: str) -> list[dict[str, str]]:
+        return self._segs.get((vg_name, lv_name), [])
+
+    def vg_pv_names(self, vg_name: str) -> list[str]:
+        return self._vg_pvs.get(vg_name, [])
+
+    def vg_lv_names(self, vg_name: str) -> list[str]:
+        return self._vg_lvs.get(vg_name, [])
+
+class PhysicalVolume:
+    __slots__ = ("_path", "_is_exists", "_vg_name", "_pv_attr", "_pv_fmt", "_pv_size", "_pv_free", "raw_info", "_lvm_info")
+
+    def __init__(self, path: str):
+        if isinstance(path, str) and os.path.isabs(path):
+            self._path = path
+        else:
+            raise PlanError(f"Invalid PV path: {path!r}. Must be an absolute path string.")
+
+        self._is_exists: bool = False
+        self._vg_name: Optional[str] = None
+        self._pv_attr: Optional[str] = None
+        self._pv_fmt: Optional[str] = None
+        self._pv_size: Optional[str] = None
+        self._pv_free: Optional[str] = None
+
+        # No device info available at instantiation
+        self.raw_info: dict[str, str] = {}
+        self._lvm_info: Optional[LvmInfo] = None
+
+    def from_metadata(self, lvm_info: LvmInfo) -> None:
+        """
+        Populate PV information from lvm_info, if available.
+
+        Args:
+            lvm_info (LvmInfo): Indexed LVM info structure.
+        """
+        pv = lvm_info.pv(self._path)
+        if pv is not None:
+            self._is_exists = True
+            self._vg_name = pv.get("vg_name")
+            self._pv_attr = pv.get("pv_attr")
+            self._pv_fmt =  pv.get("pv_fmt")
+            self._pv_size = pv.get("pv_size")
+            self._pv_free = pv.get("pv_free")
+            self.raw_info = pv
+        self._lvm_info = lvm_info
+
+    @classmethod
+    def from_lvm_info(cls, path: str, lvm_info: Any) -> "PhysicalVolume":
+        lvm = LvmInfo.from_lvm_info(lvm_info, f" for {path}")
+
+        obj = cls(path)
+        obj.from_metadata(lvm)
+
+        return obj
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def pv_free(self) -> Optional[Size]:
+        if self._pv_free is None:
+            return None
+        return to_size(self._pv_free, "pv_free")
+
+    def validate_group(self, vg_name: str) -> bool:
+        """
+        Validate whether the PV is suitable for use in the given VG.
+
+        Returns:
+            True if PV exists and is already in the correct VG.
+            False if PV does not exist or is not yet in any VG.
+
+        Raises:
+            PlanError: If PV is already in a different VG.
+        """
+        if self._is_exists:
+            if self._vg_name:
+                if self._vg_name == vg_name:
+                    return True
+                raise PlanError(
+                    f"Persistent volume {self._path} is already part of another volume group: {self._vg_name}"
+                )
+        return False
+
+    def plan(self, vg_name: str) -> dict[str, str]:
+        """
+        Determine the required action for this PV with respect to the target volume group.
+
+        Args:
+            vg_name (str): Name of the target volume group.
+
+        Returns:
+            dict: Plan with keys "path", "action".
+
+        Raises:
+            PlanError: If vg_name is not provided or PV is already in another VG.
+        """
+        if not vg_name:
+            raise PlanError(
+                f"Volume group name ('vg_name') must be specified to determine action for physical volume {self._path}."
+            )
+
+        if self.validate_group(vg_name):
+            action = "skip"
+        elif self._is_exists:
+            action = "add"
+        else:
+            action = "create"
+        return {
+            "path": self._path,
+            "action": action
+        }
+
+class LogicalVolume:
+    # planning builds one object per requested and per existing LV; slots keep them small
+    __slots__ = (
+        "_index", "_name", "_vg", "_size", "_fs", "_mount", "_stripes", "_stripe_size", "raw_data", "_lvm_info",
+        "state", "_device", "_is_exists", "_validated",
+    )
+
+    SUPPORTED_FS = {"ext4", "xfs", "btrfs"}
+
+    def __init__(self, lv_data, idx=None, validation=True):
+        """
+        Parse a logical volume definition (user input or an lvm_info 'lv' entry).
+
+        With `validation` the required fields (name, vg, size) are checked right away; otherwise the
+        definition is only parsed and validate() or check() must be called before planning.
+        """
+        self._index: Optional[int] = None
+        self.set_index(idx)
+
+        self._name: Optional[str] = None
+        self._vg: Optional[str] = None
+        self._size: Optional[str] = None
+        self._fs: Optional[str] = None
+        self._mount: Optional[str] = None
+        self._stripes = None
+        self._stripe_size = None
+
+        self.raw_data: dict[str, str] = {}
+        self._lvm_info: Optional[LvmInfo] = None
+
+        self.state: Optional["LogicalVolume"] = None
+
+        self._device: Optional[Device] = None
+        self._is_exists: bool = False
+
+        # set once all fields passed validation; the definition is never changed after parsing
+        self._validated: bool = False
+
+        self.from_metadata(lv_data)
+
+        if validation:
+            self.validate_name()
+            self.validate_group()
+            self.validate_size()
+
+    def set_index(self, idx=None):
+        if not isinstance(idx, int):
+            return
+        self._index = idx
+
+    @property
+    def index(self) -> Optional[int]:
+        return self._index
+
+    # context messages used in validation error reporting, built only when an error is raised
+    @property
+    def _msg_in(self) -> str:
+        return f" in logical volume #{self._index+1}" if self._index is not None else ""
+
+    @property
+    def _msg_for(self) -> str:
+        return f" for logical volume #{self._index+1}" if self._index is not None else ""
+
+    def _get_field_meta(self, lv_data, name, alt_name=None):
+        raw_field = None
+        if name in lv_data:
+            raw_field = lv_data.get(name)
+        elif alt_name and alt_name in lv_data:
+            raw_field = lv_data.get(alt_name)
+        return raw_field
+    
+    def _get_property(self, raw_field):
+        if isinstance(raw_field, str) and raw_field:
+            return raw_field
+        return None
+    
+    def _validate_field(self, raw_field, field, name, alt_name=None):
+        if raw_field is None:
+            alt_msg_and = f" (and '{alt_name}')" if alt_name else ""
+            raise PlanError(f"Missing '{name}'{alt_msg_and} field{self._msg_in}.")
+        if field is None:
+            alt_msg_or = f" (or '{alt_name}')" if alt_name else ""
+            raise PlanError(f"'{name}'{alt_msg_or} must be non empty string{self._msg_in}. Got: {raw_field}")
+        return True
+
+    def _set_name_meta(self, lv_data):
+        self._name = self._get_field_meta(lv_data, "name", "lv_name")
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._get_property(self._name)
+
+    def validate_name(self):
+        return self._validate_field(self._name, self.name, "name", "lv_name")
+    
+    def _set_group_meta(self, lv_data):
+        self._vg = self._get_field_meta(lv_data, "vg", "vg_name")
+
+    @property
+    def vg(self) -> Optional[str]:
+        return self._get_property(self._vg)
+
+    def validate_group(self):
+        return self._validate_field(self._vg, self.vg, "vg", "vg_name")
+
+    def _set_size_meta(self, lv_data):
+        self._size = self._get_field_meta(lv_data, "size", "lv_size")
+
+    @property
+    def size(self) -> Optional[str]:
+        return self._get_property(self._size)
+
+    def validate_size(self):
+        return self._validate_field(self._size, self.size, "size", "lv_size")
+
+    @property
+    def lv_size(self) -> Size:
+        return to_size(self.size)
+
+    def _set_filesystem_meta(self, lv_data):
+        self._fs = self._get_field_meta(lv_data, "filesystem")
+
+    @property
+    def fs(self) -> Optional[str]:
+        return self._get_property(self._fs)
+
+    def validate_filesystem(self):
+        fs = self.fs
+        if fs and self._validate_field(self._fs, fs, "filesystem") and fs not in self.SUPPORTED_FS:
+            raise PlanError(
+                f"Unsupported filesystem '{fs}' in volume '{self.name}'. Supported: {', '.join(sorted(self.SUPPORTED_FS))}."
+            )
+        return True
+
+    @property
+    def is_exists(self) -> bool:
+        return self._is_exists
+    
+    def has_filesystem(self) -> bool:
+        return self.is_device_attached() and self.is_exists and self._device.has_filesystem()
+
+    def has_same_filesystem(self):
+        if self.has_filesystem():
+            fs = self.fs
+            if fs:
+                return fs == self._device.fs_type
+        return False
+
+    def _set_mountpoint_meta(self, lv_data):
+        self._mount = self._get_field_meta(lv_data, "mountpoint")
+
+    def validate_mountpoint(self):
+        mount = self.mount
+        if mount and self._validate_field(self._mount, mount, "mountpoint") and not os.path.isabs(mount):
+            raise PlanError(f"Volume '{self.name}': 'mountpoint' must be an absolute path.")
+        return True
+
+    def _set_stripes_meta(self, lv_data):
+        self._stripes = self._get_field_meta(lv_data, "stripes")
+        self._stripe_size = self._get_field_meta(lv_data, "stripe_size")
+
+    @property
+    def stripes(self) -> Optional[int]:
+        stripes = self._stripes
+        if isinstance(stripes, str) and stripes.isdigit():
+            stripes = int(stripes)
+        if isinstance(stripes, int) and not isinstance(stripes, bool) and stripes > 0:
+            return stripes
+        return None
+
+    def validate_stripes(self):
+        if self._stripes is not None and self.stripes is None:
+            raise PlanError(f"'stripes' must be a positive integer{self._msg_in}. Got: {self._stripes}")
+        return True
+
+    @property
+    def stripe_size(self) -> Optional[str]:
+        return self._get_property(self._stripe_size)
+
+    @property
+    def lv_stripe_size(self) -> Size:
+        return to_size(self.stripe_size, "stripe_size")
+
+    def validate_stripe_size(self):
+        if self._stripe_size is None:
+            return True
+        self._validate_field(self._stripe_size, self.stripe_size, "stripe_size")
+        # lvcreate reads a bare number as KiB, the other sizes of a volume as MiB; require the unit
+        if self.stripe_size.strip()[-1:].isdigit():
+            raise PlanError(f"'stripe_size' must have a unit suffix (e.g. '64k'){self._msg_in}. Got: {self.stripe_size}")
+        size = self.lv_stripe_size
+        if size.bytes < 4096 or size.bytes & (size.bytes - 1):
+            raise PlanError(f"'stripe_size' must be a power of 2 of at least 4k{self._msg_in}. Got: {self.stripe_size}")
+        if (self.stripes or 1) < 2:
+            raise PlanError(f"'stripe_size' requires 'stripes' greater than 1{self._msg_in}.")
+        return True
+
+    @property
+    def segments(self) -> list[dict[str, str]]:
+        if self._lvm_info is None:
+            return []
+        return self._lvm_info.segments(self.vg, self.name)
+
+    def layout_mismatch(self, volume: "LogicalVolume") -> Optional[str]:
+        """
+        Return why the segments of this (existing) LV do not have the stripes requested by `volume`, or None.
+        """
+        for seg in self.segments:
+            stripes = int(seg.get("stripes") or 1)
+            if volume.stripes is not None and stripes != volume.stripes:
+                return (
+                    f"LV {self.path} has {stripes} stripe(s) in segment at {seg.get('seg_start', '0')}, "
+                    f"expected {volume.stripes}"
+                )
+            if volume.stripe_size and stripes > 1 and not same_reported_size(seg.get("stripe_size"), volume.lv_stripe_size):
+                return (
+                    f"LV {self.path} has stripe size {seg.get('stripe_size')} in segment at {seg.get('seg_start', '0')}, "
+                    f"expected {volume.stripe_size}"
+                )
+        return None
+
+    def from_metadata(self, lv_data: dict[str, str]) -> None:
+        if not isinstance(lv_data, dict):
+            raise PlanError(f"Volume entry must be a dictionary{self._msg_for}. Found: {lv_data}")
+
+        self._set_name_meta(lv_data)
+        self._set_group_meta(lv_data)
+        self._set_size_meta(lv_data)
+        self._set_filesystem_meta(lv_data)
+        self._set_mountpoint_meta(lv_data)
+        self._set_stripes_meta(lv_data)
+
+        self.raw_data = lv_data
+
+    def check(self, errors: ValidationErrors) -> bool:
+        """
+        Validate all fields, adding every problem found to `errors`.
+
+        Returns:
+            bool: True if the volume definition is valid.
+        """
+        valid = True
+        for check in (
+            self.validate_name, self.validate_group, self.validate_size, self.validate_filesystem,
+            self.validate_mountpoint, self.validate_stripes, self.validate_stripe_size,
+        ):
+            valid = errors.collect(check) and valid
+        self._validated = valid
+        return valid
+
+    def validate(self):
+        if self._validated:
+            return True
+
+        errors = ValidationErrors(f"logical volume #{self._index+1}" if self._index is not None else "logical volume")
+        self.check(errors)
+        errors.raise_if_any()
+
+        return True
+
+    @property
+    def mount(self) -> Optional[str]:
+        return self._get_property(self._mount)
+
+    @property
+    def path(self) -> str:
+        return f"/dev/{self.vg}/{self.name}"
+    
+    @property
+    def dm_path(self) -> str:
+        return f"/dev/mapper/{self.vg}-{self.name}"
+    
+    @property
+    def paths(self) -> set[str]:
+        return {self.path, self.dm_path}
+
+    @classmethod
+    def from_lvm_info(cls, name: str, vg_name: str, lvm_info: Any) -> Optional["LogicalVolume"]:
+        lvm = LvmInfo.from_lvm_info(lvm_info, f" for {vg_name}/{name}")
+
+        entry = lvm.lv(vg_name, name)
+        if entry is None:
+            return None
+
+        idx, lv_data = entry
+        lv = cls(lv_data, idx)
+        lv._lvm_info = lvm
+        return lv
+
+    @classmethod
+    def from_volume(cls, volume: "LogicalVolume", include_state: bool = False) -> "LogicalVolume":
+        lv = volume.snapshot()
+
+        if include_state and volume.has_state():
+            lv.set_state(volume.state)
+
+        return lv
+
+    def snapshot(self) -> "LogicalVolume":
+        """
+        Return a copy of this volume without its state.
+
+        The volume is validated at construction and its fields are never changed afterwards, so the
+        copy shares the raw data, lvm_info and attached device instead of parsing raw_data again.
+        """
+        lv = object.__new__(type(self))
+        for name in LogicalVolume.__slots__:
+            setattr(lv, name, getattr(self, name))
+        lv.state = None
+        return lv
+
+    def set_state(self, volume: Optional["LogicalVolume"] = None):
+        if volume is None:
+            return
+        if self.name == volume.name and self.vg == volume.vg:
+            self.state = volume.snapshot()
+
+    def is_device_attached(self) -> bool:
+        return self._device is not None
+
+    def has_state(self) -> bool:
+        return self.state is not None
+
+    def attach_device(self, device: Device, pass_through=False):
+        if pass_through:
+            if device.path in self.paths:
+                self._device = device
+                self._is_exists = device.is_exists
+        else:
+            dev = Device.from_dev_info(self.path, device.raw_info)
+            self.attach_device(dev, pass_through=True)
+
+    def plan_template(self) -> dict:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "action": "",
+        }
+
+    def plan(self):
+        plan = self.plan_template()
+        if self.is_exists:
+            plan["action"] = "skip"
+            if self.fs:
+                if self.has_filesystem():
+                    if not self.has_same_filesystem():
+                        raise PlanError(f"Filesystem mismatch: actual={self._device.fs_type}, expected={self.fs}")
+                else:
+                    plan["action"] = "format"
+        else:
+            plan["action"] = "create" 
+        return plan
+
+class VolumeGroup:
+    def __init__(self, vg_name: str, volumes = []):
+        """
+        Initialize a VolumeGroup object with a given name.
+
+        Args:
+            vg_name (str): Name of the volume group.
+
+        Raises:
+            PlanError: If vg_name is not a string or is empty.
+        """
+        if not isinstance(vg_name, str) or not vg_name.strip():
+            raise PlanError(f"Expected 'vg_name' to be a non-empty string, got: {vg_name!r}")
+
+        self._name: str = vg_name
+        self._is_exists: bool = False
+
+        self._pvs: list[PhysicalVolume] = [] # Internal: ordered PVs attached to this VG
+        self._volumes: list[LogicalVolume] = []
+        # Internal: name → LV index, kept in sync with self._volumes
+        self._lvs: dict[str, LogicalVolume] = {}
+
+        self._tracked_names = set()
+        self._duplicate: Optional[str] = None
+
+        for idx, lv_data in enumerate(volumes):
+            lv = LogicalVolume(lv_data, idx)
+            self.add_volume(lv)
+
+        self.raw_info: dict[str, str] = {}
+        self._lvm_info: Optional[LvmInfo] = None
+
+        self._vg_free: Optional[str] = None
+        self._vg_size: Optional[str] = None
+
+        # Actual volume group state
+        self.state: Optional["VolumeGroup"] = None
+
+    def add_volume(self, volume: LogicalVolume):
+        volume.validate()
+
+        self._volumes.append(volume)
+        self._lvs[volume.name] = volume
+
+        if volume.name in self._tracked_names:
+            self._duplicate = volume.name
+        else:
+            self._tracked_names.add(volume.name)
+
+    def from_metadata(self, lvm_info: Any):
+        """
+        Populate VG metadata from lvm_info if this VG is present.
+
+        Args:
+            lvm_info: LvmInfo object or raw dictionary containing "vg", "pv" and "lv" keys.
+        """
+        lvm = LvmInfo.from_lvm_info(lvm_info, f" for {self._name!r}")
+
+        # Find VG entry
+        vg = lvm.vg(self._name)
+        if vg is not None:
+            self._is_exists = True
+            self._vg_free = vg["vg_free"]
+            self._vg_size = vg.get("vg_size")
+            self.raw_info = vg
+
+        # Collect PVs belonging to this VG
+        self._pvs = [PhysicalVolume.from_lvm_info(pv_name, lvm) for pv_name in lvm.vg_pv_names(self._name)]
+
+        self._volumes = [
+            LogicalVolume.from_lvm_info(lv_name, self._name, lvm)
+            for lv_name in lvm.vg_lv_names(self._name)
+        ]
+        self._lvs = {lv.name: lv for lv in self._volumes}
+
+        self._lvm_info = lvm
+
+    def set_state(self, lvm_info: Any):
+        group = VolumeGroup.from_lvm_info(self.name, lvm_info)
+        self.state = group
+        state_lvs = self.state.lvs
+        for lv in self._volumes:
+            if lv.name in state_lvs:
+                lv.set_state(state_lvs[lv.name])
+
+    def has_state(self) -> bool:
+        return self.state is not None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def duplicate(self) -> Optional[str]:
+        return self._duplicate
+
+    @property
+    def pvs(self) -> dict[str, PhysicalVolume]:
+        """
+        Return a dictionary mapping PV paths to PhysicalVolume objects.
+
+        Returns:
+            dict[str, PhysicalVolume]: path → PV object
+        """
+        return {pv.path: pv for pv in self._pvs}
+
+    @property
+    def lvs(self) -> dict[str, LogicalVolume]:
+        """
+        Return a dictionary mapping LV names to LogicalVolume objects.
+
+        Returns:
+            dict[str, LogicalVolume]: name → LV object
+        """
+        return self._lvs
+
+    @property
+    def vg_free(self) -> Size:
+        if self.has_state():
+            return self.state.vg_free
+        return to_size(self._vg_free, "vg_free")
+
+    @property
+    def vg_size(self) -> Size:
+        if self.has_state():
+            return self.state.vg_size
+        return to_size(self._vg_size, "vg_size")
+
+    @property
+    def extent_size(self) -> Size:
+        if self.has_state():
+            return self.state.extent_size
+        return to_size(self.raw_info.get("vg_extent_size"), "vg_extent_size")
+
+    def pv_free(self) -> dict[str, Size]:
+        """
+        Return PV path → free space of the PVs whose free space is reported (pv_free of lvm_info).
+        """
+        if self.has_state():
+            return self.state.pv_free()
+        return {pv.path: pv.pv_free for pv in self._pvs if pv.pv_free is not None}
+
+    @property
+    def is_exists(self) -> bool:
+        if self.has_state():
+            return self.state.is_exists
+        return self._is_exists
+    
+    @property
+    def lvm_info(self) -> Optional[LvmInfo]:
+        if self.has_state():
+            return self.state.lvm_info
+        return self._lvm_info
+
+    @classmethod
+    def from_lvm_info(cls, vg_name: str, lvm_info: Any) -> "VolumeGroup":
+        vg = cls(vg_name)
+        vg.from_metadata(lvm_info)
+        return vg
+
+    def validate(self):
+        if not self.is_exists:
+            raise PlanError(f"Volume group '{self.name}' not found in system.")
+        return True
+
+    def plan_pvs(self, paths: list[str]):
+        if not isinstance(paths, list):
+            raise PlanError("Expected 'paths' to be a list.")
+
+        return [
+            PhysicalVolume.from_lvm_info(path, self.lvm_info).plan(self.name)
+            for path in paths
+        ]
+
+    def requested_size(self, volume: LogicalVolume, free: Optional[Size] = None,
+                       pv_free: Optional[dict[str, Size]] = None) -> Size:
+        """
+        Return the size requested for `volume`, resolving LVM percentages
+        (e.g. '100%FREE', '50%VG') against this volume group.
+
+        Percentages are an upper limit for lvcreate: a striped LV gets at most `stripes` times
+        the free space of the PV it can use least of.
+
+        Args:
+            volume (LogicalVolume): Requested logical volume.
+            free (Size): Free space '%FREE' refers to (defaults to vg_free).
+            pv_free (dict): Free space per PV (defaults to pv_free()).
+
+        Raises:
+            PlanError: If the size can not be resolved.
+        """
+        relative = Size.relative(volume.size)
+        if relative is None:
+            return volume.lv_size
+
+        _, base = relative
+        free = self.vg_free if free is None else free
+        totals = {"FREE": free, "VG": self.vg_size, "PVS": self.vg_size}
+        if base not in totals:
+            raise PlanError(
+                f"Unsupported relative size '{volume.size}' for LV '{volume.name}' in VG '{self.name}'"
+            )
+        size = Size.parse(volume.size, total=totals[base])
+
+        stripes = volume.stripes or 1
+        pv_free = self.pv_free() if pv_free is None else pv_free
+        if stripes > 1 and len(pv_free) >= stripes:
+            size = min(size, sorted(pv_free.values(), reverse=True)[stripes - 1] * stripes)
+        return size
+
+    def stripe_size_needed(self, size: Size, stripes: int) -> Size:
+        """
+        Return the space one stripe of an LV of `size` takes on each of its PVs.
+        """
+        per_stripe = Size(-(-size.bytes // stripes))
+        extent = self.extent_size
+        return per_stripe.align_up(extent) if extent else per_stripe
+
+    def check_stripes(self, volume: LogicalVolume, size: Size, pv_free: dict[str, Size]) -> None:
+        """
+        Check that `stripes` PVs of the volume group have room for one stripe of `volume` each.
+
+        Without per-PV free space (lvm_info without 'pv' entries) only the number of PVs is checked.
+
+        Raises:
+            PlanError: If the volume group has not enough PVs with enough free space.
+        """
+        stripes = volume.stripes or 1
+        if stripes < 2:
+            return
+
+        if not pv_free:
+            group = self.state if self.has_state() else self
+            pv_count = int(group.raw_info.get("pv_count") or len(group.pvs))
+            if pv_count < stripes:
+                raise PlanError(
+                    f"Not enough physical volumes ({pv_count}) in VG '{self.name}' "
+                    f"to create LV '{volume.name}' with {stripes} stripes"
+                )
+            return
+
+        needed = self.stripe_size_needed(size, stripes)
+        usable = [path for path, free in pv_free.items() if free >= needed]
+        if len(usable) < stripes:
+            raise PlanError(
+                f"Not enough physical volumes with free space in VG '{self.name}' to create LV '{volume.name}' "
+                f"with size {volume.size} and {stripes} stripes: {len(usable)} of {len(pv_free)} PVs have "
+                f"{needed} free"
+            )
+
+    def allocate(self, pv_free: dict[str, Size], volume: LogicalVolume, size: Size) -> dict[str, Size]:
+        """
+        Return `pv_free` after creating `volume` with `size`: a striped LV takes one stripe from each of
+        the PVs with the most free space, a linear LV fills the PVs in order.
+        """
+        pv_free = dict(pv_free)
+        stripes = volume.stripes or 1
+        if stripes > 1:
+            needed = self.stripe_size_needed(size, stripes)
+            for path in sorted(pv_free, key=lambda p: pv_free[p], reverse=True)[:stripes]:
+                pv_free[path] = max(pv_free[path] - needed, Size(0))
+            return pv_free
+
+        remaining = size
+        for path, free in pv_free.items():
+            if not remaining:
+                break
+            taken = min(free, remaining)
+            pv_free[path] = free - taken
+            remaining -= taken
+        return pv_free
+
+    def plan_volume(self, volume: LogicalVolume, free: Optional[Size] = None,
+                    pv_free: Optional[dict[str, Size]] = None) -> Optional[dict[str, str]]:
+        """
+        Plan the action for `volume` against the volume group state.
+
+        An existing LV whose segments do not have the requested stripes is flagged with
+        'layout_mismatch'; it is not changed.
+
+        Args:
+            volume (LogicalVolume): Requested logical volume.
+            free (Size): Free space left for new LVs (defaults to vg_free of the state).
+            pv_free (dict): Free space left per PV (defaults to pv_free() of the state).
+
+        Raises:
+            PlanError: If a new LV does not fit into the free space or onto enough PVs.
+        """
+        plan = volume.plan() if volume.is_device_attached() else volume.plan_template()
+
+        if self.has_state():
+            if volume.name not in self.state.lvs:
+                available = self.state.vg_free if free is None else free
+                pv_free = self.state.pv_free() if pv_free is None else pv_free
+                size = self.requested_size(volume, available, pv_free)
+                if size > available:
+                    raise PlanError(
+                        f"Not enough free space ({available}) in VG '{self.name}' "
+                        f"to create LV '{volume.name}' with size {volume.size}"
+                    )
+                self.check_stripes(volume, size, pv_free)
+                plan["action"] = "create"
+            elif volume.stripes is not None or volume.stripe_size:
+                mismatch = self.state.lvs[volume.name].layout_mismatch(volume)
+                if mismatch:
+                    plan["layout_mismatch"] = mismatch
+        return plan
+
+class VolumeInput:
+    def __init__(self, volumes: list[dict]):
+        if not isinstance(volumes, list):
+            raise PlanError("Expected 'volumes' to be a list.")
+
+        # every volume is parsed and validated once, errors of all volumes are reported together
+        errors = ValidationErrors("'volumes'")
+        parsed = []
+        names = set()
+        for idx, lv_data in enumerate(volumes):
+            try:
+                lv = LogicalVolume(lv_data, idx, validation=False)
+            except PlanError as e:
+                errors.add(e)
+                continue
+            if not lv.check(errors):
+                continue
+            if lv.name in names:
+                errors.add(f"Duplicate LV name detected: '{lv.name}'")
+            names.add(lv.name)
+            parsed.append(lv)
+
+        self._volumes: tuple[LogicalVolume, ...] = tuple(parsed)
+        self._vg_names = {vol.vg for vol in self._volumes}
+
+        if len(self._vg_names) > 1:
+            errors.add(f"Expected 'volumes' to be a set of volumes within single group. Got: {self._vg_names}.")
+        errors.raise_if_any()
+
+        self.vg_name = next(iter(self._vg_names), None)
+
+    def validate(self):
+        # validated while parsing
+        return True
+
+    @staticmethod
+    def dev_info_by_path(dev_infos) -> dict:
+        """
+        Return device info results keyed by device path.
+
+        Accepts a dictionary mapping device paths to dev_info results, the result of
+        aursu.lvm_setup.dev_probe, or the result of a looped dev_info task (a dictionary with
+        a 'results' list), where each entry is matched by its loop item: a device path or
+        a volume definition with 'name' and 'vg'.
+        """
+        if dev_infos is None:
+            return {}
+        if not isinstance(dev_infos, dict):
+            raise PlanError(
+                f"Expected device information to be a dictionary, got {type(dev_infos).__name__}."
+            )
+
+        # dev_probe result
+        if isinstance(dev_infos.get("devices"), dict):
+            return dev_infos["devices"]
+
+        results = dev_infos.get("results")
+        if not isinstance(results, list):
+            return dev_infos
+
+        mapping = {}
+        for res in results:
+            if not isinstance(res, dict):
+                continue
+            item = res.get(res.get("ansible_loop_var", "item"))
+            if isinstance(item, dict):
+                item = LogicalVolume(item).path
+            if isinstance(item, str):
+                mapping[item] = res
+        return mapping
+
+    def plan(self, lvm_info: Any, dev_infos=None, extending: bool = False) -> list[dict[str, str]]:
+        """
+        Plan all volumes against one LVM state in input order.
+
+        Free space of the volume group and of its PVs is tracked across the batch: every
+        LV planned for creation is subtracted from it, so '%FREE' sizes and space and
+        stripe checks of the following volumes see what is left.
+
+        Args:
+            lvm_info: LvmInfo object or raw lvm_info payload.
+            dev_infos (dict): Device info per LV path (see dev_info_by_path()).
+            extending (bool): The VG is about to be extended by PVs which are not in `lvm_info` yet.
+                From the first new LV which does not fit into the current free space on, new LVs are
+                planned for creation without space and stripe checks, which are left to lvcreate.
+
+        Returns:
+            list[dict]: One plan per volume (see LogicalVolume.plan()).
+
+        Raises:
+            PlanError: If the VG does not exist, the volumes do not fit, or device
+                                information of an existing LV is missing.
+        """
+        devices = Device.from_dev_info_map(self.dev_info_by_path(dev_infos))
+
+        vg = VolumeGroup(self.vg_name)
+        vg.set_state(LvmInfo.from_lvm_info(lvm_info))
+        vg.validate()
+
+        free = vg.vg_free
+        pv_free = vg.pv_free()
+        # free space is unknown once a volume needs the PVs the VG is extended by
+        unchecked = False
+        result = []
+        for volume in self._volumes:
+            device = devices.get(volume.path) or devices.get(volume.dm_path)
+            if device is None:
+                if volume.name in vg.state.lvs:
+                    raise PlanError(f"No device information found for logical volume {volume.path}.")
+                device = Device(volume.path)
+            volume.attach_device(device, pass_through=True)
+
+            if unchecked and volume.name not in vg.state.lvs:
+                result.append(dict(volume.plan(), action="create"))
+                continue
+            try:
+                plan = vg.plan_volume(volume, free, pv_free)
+            except PlanError:
+                if not extending or volume.name in vg.state.lvs:
+                    raise
+                unchecked = True
+                result.append(dict(volume.plan(), action="create"))
+                continue
+            if plan["action"] == "create":
+                size = vg.requested_size(volume, free, pv_free)
+                free -= size
+                pv_free = vg.allocate(pv_free, volume, size)
+            result.append(plan)
+        return result
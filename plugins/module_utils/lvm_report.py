@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Helpers for collecting LVM state with a single 'lvm fullreport' call.
+
+Builds the fullreport command line and converts its JSON output into the "pv", "vg" and "lv"
+lists used by LvmInfo (the structure returned by aursu.general.lvm_info).
+"""
+
+import json
+from typing import Iterable, Optional
+
+DOCUMENTATION = r'''
+---
+module_utils: lvm_report
+author: Alexander Ursu
+short_description: Collect PV, VG, LV and segment information from one lvm fullreport
+description:
+  - This utility builds the C(lvm fullreport --reportformat json) command line with the columns used by
+    the planning filters, and flattens its per-VG JSON output into C(pv), C(vg), C(lv) and C(seg) lists.
+  - Sizes are reported in MiB with the C(m) suffix (e.g. C(204800.00m)), like C(aursu.general.lvm_info).
+  - Volume groups, logical volumes and segments can be restricted to a set of volume groups. Every PV is
+    kept, since PVs of other VGs must not be planned for C(pvcreate) and PVs which are not in any VG are
+    candidates for C(vgextend).
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> fullreport_command("/usr/sbin/lvm")
+['/usr/sbin/lvm', 'fullreport', '--reportformat', 'json', '--units', 'm', ...]
+
+>>> parse_fullreport(out, vgs=["data"])["vg"]
+[{'vg_name': 'data', 'vg_size': '1710944.00m', 'vg_free': '1301344.00m', ...}]
+'''
+
+RETURN = r'''
+fullreport_command:
+  description: Command line (list of arguments) running lvm fullreport.
+  type: list
+  returned: when called
+
+parse_fullreport:
+  description: Dictionary with C(pv), C(vg), C(lv) and C(seg) lists of report rows (all values are strings).
+  type: dict
+  returned: when called
+  raises:
+    - ValueError if the output is not a valid fullreport JSON document
+
+lvm_fullreport:
+  description: Same as C(parse_fullreport), for a report run on the managed node.
+  type: dict
+  returned: when called
+  raises:
+    - ReportError if lvm fails or its output can not be parsed
+'''
+
+# columns collected per report section
+REPORT_FIELDS = {
+    "pv": ["pv_name", "vg_name", "pv_fmt", "pv_attr", "pv_size", "pv_free", "pv_uuid", "dev_size",
+           "pv_pe_count", "pv_pe_alloc_count"],
+    "vg": ["vg_name", "vg_attr", "vg_size", "vg_free", "vg_extent_size", "vg_extent_count", "vg_free_count",
+           "pv_count", "lv_count", "snap_count", "vg_uuid"],
+    "lv": ["lv_name", "vg_name", "lv_attr", "lv_size", "lv_path", "lv_dm_path", "pool_lv", "origin",
+           "data_percent", "metadata_percent", "move_pv", "mirror_log", "copy_percent", "convert_lv", "lv_uuid"],
+    "seg": ["lv_name", "vg_name", "segtype", "stripes", "stripe_size", "seg_start", "seg_size", "devices"],
+    # physical segments are always part of fullreport; keep them minimal
+    "pvseg": ["pv_name", "pvseg_start", "pvseg_size"],
+}
+
+SECTIONS = ("pv", "vg", "lv", "seg")
+
+def fullreport_command(lvm: str, vgs: Optional[Iterable[str]] = None) -> list:
+    """
+    Return the lvm fullreport command line.
+
+    Args:
+        lvm (str): Path to the lvm binary.
+        vgs (list): Optional volume group names to report on (all VGs and orphan PVs if omitted).
+    """
+    cmd = [lvm, "fullreport", "--reportformat", "json", "--units", "m"]
+    for section, fields in REPORT_FIELDS.items():
+        cmd.extend(["--configreport", section, "-o", ",".join(fields)])
+    if vgs:
+        cmd.extend(vgs)
+    return cmd
+
+def parse_fullreport(output: str, vgs: Optional[Iterable[str]] = None, include_orphans: bool = True) -> dict:
+    """
+    Flatten lvm fullreport JSON output into "pv", "vg", "lv" and "seg" lists.
+
+    Args:
+        output (str): JSON printed by lvm fullreport.
+        vgs (list): If given, only VG, LV and segment entries of these volume groups are kept;
+            PVs of all volume groups are kept.
+        include_orphans (bool): Keep PVs which do not belong to any volume group.
+
+    Raises:
+        ValueError: If the output can not be parsed.
+    """
+    try:
+        data = json.loads(output)
+    except ValueError as e:
+        raise ValueError(f"Unable to parse lvm fullreport output: {e}")
+
+    reports = data.get("report") if isinstance(data, dict) else None
+    if not isinstance(reports, list):
+        raise ValueError("Unexpected lvm fullreport output: missing 'report' list")
+
+    wanted = set(vgs) if vgs else None
+
+    result = {section: [] for section in SECTIONS}
+    # orphan PVs may be listed in more than one report
+    pv_names = set()
+    for report in reports:
+        for section in SECTIONS:
+            for row in report.get(section, []):
+                vg_name = row.get("vg_name")
+                if section == "pv":
+                    # PVs of other VGs are kept so that they are not mistaken for unused devices
+                    if not vg_name and not include_orphans:
+                        continue
+                elif not vg_name or (wanted is not None and vg_name not in wanted):
+                    continue
+
+                if section == "pv":
+                    if row.get("pv_name") in pv_names:
+                        continue
+                    pv_names.add(row.get("pv_name"))
+                result[section].append(row)
+    return result
+
+class ReportError(Exception):
+    def __init__(self, msg, **kwargs):
+        super().__init__(msg)
+        self.msg = msg
+        self.details = kwargs
+
+def lvm_fullreport(module, lvm: str, vgs: Optional[Iterable[str]] = None, include_orphans: bool = True) -> dict:
+    """
+    Run lvm fullreport with the running AnsibleModule and return the parsed report (see parse_fullreport()).
+
+    Raises:
+        ReportError: If lvm fails or its output can not be parsed.
+    """
+    # orphan PVs are only reported when fullreport is not restricted to named VGs
+    cmd = fullreport_command(lvm, None if include_orphans else vgs)
+
+    rc, out, err = module.run_command(cmd, environ_update={"LC_ALL": "C"})
+    if rc != 0:
+        raise ReportError(f"lvm fullreport failed: {err.strip()}", rc=rc, stdout=out, stderr=err)
+
+    try:
+        return parse_fullreport(out, vgs, include_orphans)
+    except ValueError as e:
+        raise ReportError(str(e), stdout=out, stderr=err)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Helpers for creating filesystems on planned logical volumes.
+
+Selects the volumes whose plan requires a filesystem (actions 'create' and 'format'), builds the
+mkfs command lines for them and runs them concurrently.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DOCUMENTATION = r'''
+---
+module_utils: mkfs
+author: Alexander Ursu
+short_description: Build mkfs jobs from logical volume plans
+description:
+  - This utility pairs volume definitions with the plans returned by C(validate_volumes) and returns one
+    mkfs job for every volume with a C(filesystem) and action C(create) or C(format).
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> filesystem_jobs(
+...     [{"name": "data1", "vg": "data", "filesystem": "xfs"}, {"name": "data2", "vg": "data"}],
+...     [{"name": "data1", "path": "/dev/data/data1", "action": "create"},
+...      {"name": "data2", "path": "/dev/data/data2", "action": "create"}],
+... )
+[{'name': 'data1', 'path': '/dev/data/data1', 'fstype': 'xfs'}]
+
+>>> mkfs_command("/usr/sbin/mkfs.xfs", "/dev/data/data1")
+['/usr/sbin/mkfs.xfs', '/dev/data/data1']
+'''
+
+RETURN = r'''
+filesystem_jobs:
+  description: List of mkfs jobs with C(name), C(path) and C(fstype), in volume order.
+  type: list
+  elements: dict
+  returned: when called
+  raises:
+    - ValueError if volumes and plans do not match
+
+mkfs_command:
+  description: Command line creating the filesystem.
+  type: list
+  elements: str
+  returned: when called
+'''
+
+# mkfs programs per supported filesystem (see LogicalVolume.SUPPORTED_FS)
+MKFS_PROGRAMS = {
+    "btrfs": "mkfs.btrfs",
+    "ext4": "mkfs.ext4",
+    "xfs": "mkfs.xfs",
+}
+
+FORMAT_ACTIONS = ("create", "format")
+
+def filesystem_jobs(volumes: list, plan: list) -> list:
+    """
+    Return the mkfs jobs for all volumes planned for creation or formatting.
+    """
+    if len(volumes) != len(plan):
+        raise ValueError(f"Got {len(volumes)} volumes but {len(plan)} plans.")
+
+    jobs = []
+    for volume, entry in zip(volumes, plan):
+        if volume.get("name") != entry.get("name"):
+            raise ValueError(f"Plan for '{entry.get('name')}' does not match volume '{volume.get('name')}'.")
+        fstype = volume.get("filesystem")
+        if not fstype or entry.get("action") not in FORMAT_ACTIONS:
+            continue
+        if fstype not in MKFS_PROGRAMS:
+            raise ValueError(f"Unsupported filesystem '{fstype}' in volume '{volume.get('name')}'.")
+        jobs.append({"name": volume["name"], "path": entry["path"], "fstype": fstype})
+    return jobs
+
+def mkfs_command(mkfs: str, path: str) -> list:
+    # ext4 asks for confirmation on some devices; -F keeps it non-interactive
+    if mkfs.endswith(".ext4"):
+        return [mkfs, "-F", path]
+    return [mkfs, path]
+
+class MkfsError(Exception):
+    def __init__(self, msg, rc=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.rc = rc
+
+def current_fstype(module, blkid, path):
+    # exit code 2: no signature found
+    rc, out, err = module.run_command([blkid, "-p", "-o", "value", "-s", "TYPE", path])
+    if rc == 2:
+        return None
+    if rc != 0:
+        raise MkfsError(f"blkid failed on {path}: {err.strip()}", rc)
+    return out.strip() or None
+
+def make_filesystem(module, blkid, job):
+    """
+    Create the filesystem of one job, returning (changed, rc).
+
+    Raises:
+        MkfsError: If the device has another filesystem or mkfs fails.
+    """
+    path, fstype = job["path"], job["fstype"]
+
+    found = current_fstype(module, blkid, path)
+    if found == fstype:
+        return False, 0
+    if found:
+        raise MkfsError(f"{path} already contains a {found} filesystem")
+
+    if module.check_mode:
+        return True, 0
+
+    mkfs = module.get_bin_path(MKFS_PROGRAMS[fstype], required=True)
+    rc, out, err = module.run_command(mkfs_command(mkfs, path))
+    if rc != 0:
+        raise MkfsError(f"{MKFS_PROGRAMS[fstype]} failed on {path}: {(err or out).strip()}", rc)
+    return True, rc
+
+def apply_jobs(module, blkid, jobs, max_workers=1):
+    """
+    Run all mkfs jobs, up to `max_workers` at a time.
+
+    Returns:
+        tuple: (path → result, path → error message)
+    """
+    results, errors = {}, {}
+
+    def run(job):
+        result = dict(name=job["name"], fstype=job["fstype"], changed=False)
+        started = time.monotonic()
+        try:
+            result["changed"], result["rc"] = make_filesystem(module, blkid, job)
+        except MkfsError as e:
+            result.update(rc=e.rc, error=e.msg)
+            errors[job["path"]] = e.msg
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        results[job["path"]] = result
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+            list(pool.map(run, jobs))
+
+    # keep the volume order in the report
+    return {job["path"]: results[job["path"]] for job in jobs}, errors
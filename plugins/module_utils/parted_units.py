@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Native size/unit conversion engine for parted units.
+
+Provides a precompiled unit table covering all units parted reports and accepts
+(B, KB, KiB, MB, MiB, GB, GiB, TB, TiB, s, %) and a bounded LRU memo of parsed
+(value, unit) pairs. Does not depend on community.general at runtime.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from typing import Optional
+
+DOCUMENTATION = r'''
+---
+module_utils: parted_units
+author: Alexander Ursu
+short_description: Convert sizes expressed in parted units into bytes or MiB
+description:
+  - This utility converts a size with a parted unit (e.g. C(100) C(GB), C(2048s), C(1.5TiB), C(50%))
+    into bytes or MiB using exact rational arithmetic.
+  - Units are looked up case-insensitively in a precompiled table; parsed (value, unit) pairs are
+    memoized in a bounded LRU cache, so repeated conversions of the same fields are cheap.
+  - Sector (C(s)) values are converted using the given logical sector size (512 bytes by default).
+    Percent values require the total size they refer to.
+requirements: []
+'''
+
+EXAMPLES = r'''
+# Convert "100" GB to MiB
+>>> convert_to_mib("100", "GB")
+95367.431640625
+
+# Unit suffix in the value takes precedence
+>>> convert_to_bytes("2048s", None)
+1048576
+
+# Normalize known unit
+>>> normalize_unit("gib")
+"GiB"
+
+# Unknown unit
+>>> convert_to_mib("100", "FOOBYTES")
+None
+'''
+
+RETURN = r'''
+normalize_unit:
+  description: Canonical parted unit string (e.g. 'MiB') or None if the unit is unknown.
+  type: str
+  returned: when called
+
+convert_to_bytes:
+  description: Size in bytes (int, rounded down) or None if the value or unit is invalid.
+  type: int
+  returned: when called
+
+convert_to_mib:
+  description: Size in MiB (float) or None if the value or unit is invalid.
+  type: float
+  returned: when called
+'''
+
+KiB = 1024
+MiB = 1024 ** 2
+GiB = 1024 ** 3
+TiB = 1024 ** 4
+
+DEFAULT_SECTOR_SIZE = 512
+
+SECTOR_UNIT = "s"
+PERCENT_UNIT = "%"
+
+# canonical unit → multiplier in bytes; sectors and percent are resolved at conversion time
+PARTED_UNITS = {
+    "B": 1,
+    "KB": 1000,
+    "MB": 1000 ** 2,
+    "GB": 1000 ** 3,
+    "TB": 1000 ** 4,
+    "KiB": KiB,
+    "MiB": MiB,
+    "GiB": GiB,
+    "TiB": TiB,
+    SECTOR_UNIT: None,
+    PERCENT_UNIT: None,
+}
+
+# lower-cased alias → canonical unit
+_UNIT_TABLE = {u.lower(): u for u in PARTED_UNITS}
+
+# longest suffixes first, so that 'kib' is tried before 'b'
+_SUFFIXES = sorted(_UNIT_TABLE, key=len, reverse=True)
+
+PARSE_CACHE_SIZE = 4096
+
+def normalize_unit(unit) -> Optional[str]:
+    """
+    Return the canonical parted unit for `unit` (case-insensitive), or None if unknown.
+    """
+    if not isinstance(unit, str):
+        return None
+    return _UNIT_TABLE.get(unit.strip().lower())
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(value: str, unit: Optional[str]) -> Optional[tuple[Fraction, str]]:
+    text = value.strip().lower()
+
+    suffix = next((s for s in _SUFFIXES if text.endswith(s)), None)
+    if suffix is not None:
+        text = text[:-len(suffix)].strip()
+        canonical = _UNIT_TABLE[suffix]
+    else:
+        canonical = normalize_unit(unit)
+
+    if canonical is None or not text:
+        return None
+
+    try:
+        number = Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+    return number, canonical
+
+def parse_size(size, unit=None) -> Optional[tuple[Fraction, str]]:
+    """
+    Parse a size value into an exact (number, canonical unit) pair.
+
+    A unit suffix in the value (e.g. '100GiB', '2048s') takes precedence over `unit`.
+
+    Returns:
+        tuple or None: (Fraction, unit) or None if the value or unit is invalid.
+    """
+    if isinstance(size, bool) or not isinstance(size, (int, float, str)):
+        return None
+    if not isinstance(unit, (str, type(None))):
+        return None
+    return _parse(str(size), unit)
+
+def _to_bytes(size, unit, sector_size=DEFAULT_SECTOR_SIZE, total=None) -> Optional[Fraction]:
+    parsed = parse_size(size, unit)
+    if parsed is None:
+        return None
+
+    number, canonical = parsed
+    if canonical == SECTOR_UNIT:
+        return number * sector_size
+    if canonical == PERCENT_UNIT:
+        if total is None:
+            return None
+        return number * Fraction(total) / 100
+    return number * PARTED_UNITS[canonical]
+
+def convert_to_bytes(size, unit, sector_size=DEFAULT_SECTOR_SIZE, total=None) -> Optional[int]:
+    """
+    Convert a size with unit (e.g. '100', 'GB') to an integer number of bytes.
+
+    Args:
+        size: Numeric value or string, optionally with a unit suffix.
+        unit (str): Parted unit used when `size` carries no suffix.
+        sector_size (int): Logical sector size used for the 's' unit.
+        total (int): Size in bytes that percent values refer to.
+
+    Returns:
+        int or None: Size in bytes rounded down, or None if conversion is not possible.
+    """
+    value = _to_bytes(size, unit, sector_size, total)
+    if value is None:
+        return None
+    return int(value)
+
+def convert_to_mib(size, unit, sector_size=DEFAULT_SECTOR_SIZE, total=None) -> Optional[float]:
+    """
+    Convert a size with unit (e.g. '100', 'GB') to a float value in MiB.
+
+    Returns:
+        float or None: Size in MiB, or None if conversion is not possible.
+    """
+    value = _to_bytes(size, unit, sector_size, total)
+    if value is None:
+        return None
+    return float(value / MiB)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Partition table writes with sfdisk.
+
+Creates all planned partitions of a disk with one sfdisk run, tells the kernel about them and
+applies the plans of many disks concurrently.
+"""
+
+import json
+import os.path
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.parted_units import DEFAULT_SECTOR_SIZE
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.sfdisk_script import (
+    build_script,
+    partition_number,
+    sfdisk_label,
+)
+
+DOCUMENTATION = r'''
+---
+module_utils: partition_apply
+author: Alexander Ursu
+short_description: Apply partition plans with sfdisk
+description:
+  - C(apply_plan) creates every partition with action C(create) of one disk plan with a single C(sfdisk) script
+    and re-reads the partition table once. C(apply_plans) does the same for the plans of many disks concurrently.
+  - All functions take the running C(AnsibleModule) for command execution and honor its check mode.
+requirements:
+  - sfdisk (util-linux)
+'''
+
+EXAMPLES = r'''
+>>> disks, errors = apply_plans(module, "/usr/sbin/sfdisk", {"/dev/sdb": plan}, "gpt", max_workers=4)
+>>> disks["/dev/sdb"]["created"]
+[1]
+'''
+
+RETURN = r'''
+apply_plan:
+  description: Result for the disk with C(changed), C(created), C(script), C(label) and C(elapsed) keys.
+  type: dict
+  returned: when called
+  raises:
+    - ApplyError if the partition table can not be read or written
+
+apply_plans:
+  description: Tuple of results per disk and error messages per failed disk.
+  type: tuple
+  returned: when called
+'''
+
+NO_TABLE_MSG = "does not contain a recognized partition table"
+
+class ApplyError(Exception):
+    def __init__(self, msg, **kwargs):
+        super().__init__(msg)
+        self.msg = msg
+        self.details = kwargs
+
+def read_table(module, sfdisk, device):
+    """
+    Return the current partition table of `device` as reported by 'sfdisk --json', or None if there is none.
+    """
+    rc, out, err = module.run_command([sfdisk, "--json", device])
+    if rc != 0:
+        if NO_TABLE_MSG in err:
+            return None
+        raise ApplyError(f"Unable to read partition table of {device}: {err.strip()}", rc=rc)
+    try:
+        return json.loads(out).get("partitiontable", {})
+    except ValueError as e:
+        raise ApplyError(f"Unable to parse sfdisk output for {device}: {e}")
+
+def logical_sector_size(device):
+    name = os.path.basename(os.path.realpath(device))
+    try:
+        with open(f"/sys/class/block/{name}/queue/logical_block_size") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return DEFAULT_SECTOR_SIZE
+
+def reread_table(module, device):
+    """
+    Tell the kernel about the new partitions with one partx update (or BLKRRPART as a fallback).
+    """
+    partx = module.get_bin_path("partx")
+    if partx:
+        rc, _, err = module.run_command([partx, "--update", device])
+        if rc == 0:
+            return
+        module.warn(f"partx --update {device} failed: {err.strip()}")
+
+    blockdev = module.get_bin_path("blockdev", required=True)
+    rc, _, err = module.run_command([blockdev, "--rereadpt", device])
+    if rc != 0:
+        raise ApplyError(f"Unable to re-read partition table of {device}: {err.strip()}", rc=rc)
+
+def udev_settle(module, timeout):
+    udevadm = module.get_bin_path("udevadm")
+    if udevadm:
+        module.run_command([udevadm, "settle", f"--timeout={timeout}"])
+
+def apply_plan(module, sfdisk, device, plan, default_label=None):
+    """
+    Create all partitions with action 'create' from `plan` on `device` with one sfdisk run.
+
+    Returns:
+        dict: Result for the disk with 'changed', 'created', 'script', 'label' and 'elapsed' keys.
+
+    Raises:
+        ApplyError: If the partition table can not be read or written.
+    """
+    started = time.monotonic()
+    creates = [p for p in plan if p.get("action") == "create"]
+
+    table = read_table(module, sfdisk, device)
+    if table is None:
+        label = default_label or next((p.get("disk_label") for p in creates if p.get("disk_label")), "gpt")
+        sector_size = logical_sector_size(device)
+    else:
+        label = table.get("label")
+        sector_size = table.get("sectorsize") or logical_sector_size(device)
+
+    # partitions already present (e.g. after an interrupted run) are not created again
+    existing = {partition_number(p.get("node")) for p in (table or {}).get("partitions", [])}
+    creates = [p for p in creates if p.get("num") not in existing]
+
+    result = dict(changed=False, created=[], script="", label=label)
+    if not creates:
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        return result
+
+    try:
+        script = build_script(device, creates, label, sector_size, new_table=(table is None))
+    except ValueError as e:
+        raise ApplyError(str(e))
+
+    result.update(changed=True, created=[int(p["num"]) for p in creates], script=script)
+    if not module.check_mode:
+        cmd = [sfdisk, "--no-reread", "--no-tell-kernel"]
+        if table is not None:
+            cmd.append("--append")
+        else:
+            cmd.extend(["--label", sfdisk_label(label)])
+        cmd.append(device)
+
+        rc, out, err = module.run_command(cmd, data=script)
+        if rc != 0:
+            raise ApplyError(f"sfdisk failed on {device}: {err.strip()}", rc=rc, stdout=out, stderr=err)
+
+        reread_table(module, device)
+
+    result["elapsed"] = round(time.monotonic() - started, 3)
+    return result
+
+def apply_plans(module, sfdisk, plans, default_label=None, max_workers=1):
+    """
+    Apply the plans of all disks, up to `max_workers` disks at a time.
+
+    Returns:
+        tuple: (disk → result, disk → error message)
+    """
+    results, errors = {}, {}
+
+    def run(device):
+        try:
+            results[device] = apply_plan(module, sfdisk, device, plans[device], default_label)
+        except ApplyError as e:
+            errors[device] = e.msg
+
+    devices = [d for d in plans if any(p.get("action") == "create" for p in plans[d])]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(devices) or 1))) as pool:
+        list(pool.map(run, devices))
+
+    for device in plans:
+        if device not in errors:
+            results.setdefault(device, dict(changed=False, created=[], script="", label=None, elapsed=0.0))
+    return results, errors
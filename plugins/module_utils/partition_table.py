@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Native GPT/MBR partition table reader.
+
+Reads the partition table of a disk (or disk image) with positioned reads of its first sectors
+(and of the backup GPT header only if the primary one is damaged) and reports it in the
+structure returned by parted 'state: info' (see Disk.from_parted).
+"""
+
+import os
+import struct
+import uuid
+import zlib
+from fractions import Fraction
+from typing import Optional
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.parted_units import (
+    DEFAULT_SECTOR_SIZE,
+    PARTED_UNITS,
+    SECTOR_UNIT,
+    normalize_unit,
+)
+
+DOCUMENTATION = r'''
+---
+module_utils: partition_table
+author: Alexander Ursu
+short_description: Read GPT and MBR partition tables without parted
+description:
+  - This utility parses the protective/legacy MBR (including logical partitions in an extended partition)
+    and the GPT header and partition entries of a disk.
+  - The primary GPT is read together with the MBR in one positioned read of the beginning of the disk;
+    the backup GPT at the last LBA is read only if the primary header or entries fail the CRC check.
+  - The result uses the same keys as parted 'state: info' (C(disk) and C(partitions)), so it can be passed
+    to C(Disk.from_parted) and to the partition planning filters.
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> with open("/dev/sda", "rb") as f:
+...     table = read_partition_table(f.fileno(), 512, 1953525168)
+>>> table["table"]
+'gpt'
+>>> parted_info("/dev/sda", table, 512, 1953525168, unit="s")["partitions"][0]
+{'num': 1, 'begin': 2048, 'end': 2099199, 'size': 2097152, 'unit': 's', 'fstype': '', 'name': 'EFI', 'flags': ['boot', 'esp']}
+'''
+
+RETURN = r'''
+read_partition_table:
+  description: >
+    Dictionary with the table type (C(gpt), C(msdos) or C(unknown)) and a list of partitions
+    with number, first and last sector, name and flags.
+  type: dict
+  returned: when called
+  raises:
+    - OSError if the device can not be read
+
+parted_info:
+  description: Partition table in the parted 'state: info' format, with positions in the requested unit.
+  type: dict
+  returned: when called
+
+disk_info:
+  description: C(parted_info) of a disk read from the device, with geometry and model from sysfs.
+  type: dict
+  returned: when called
+  raises:
+    - OSError if the device can not be read
+'''
+
+# bytes read from the start of disk in one go: MBR, GPT header and the default 128-entry array
+# for any sector size up to 4 KiB
+INITIAL_READ = 1024 * 1024
+
+GPT_SIGNATURE = b"EFI PART"
+GPT_HEADER = struct.Struct("<8sIIIIQQQQ16sQIII")
+GPT_ENTRY = struct.Struct("<16s16sQQQ72s")
+
+MBR_SIGNATURE = b"\x55\xaa"
+MBR_ENTRY = struct.Struct("<B3sB3sII")
+MBR_ENTRIES_OFFSET = 446
+MBR_PROTECTIVE = 0xEE
+MBR_EXTENDED = {0x05, 0x0F, 0x85}
+# logical partitions in an extended partition are limited to guard against EBR loops
+MAX_LOGICAL = 256
+
+# partition type → parted flags
+GPT_FLAGS = {
+    "E6D6D379-F507-44C2-A23C-238F2A3DF928": ["lvm"],
+    "A19D880F-05FC-4D3B-A006-743F0F84911E": ["raid"],
+    "0657FD6D-A4AB-43C4-84E5-0933C84B4F4F": ["swap"],
+    "C12A7328-F81F-11D2-BA4B-00A0C93EC93B": ["boot", "esp"],
+    "21686148-6449-6E6F-744E-656564454649": ["bios_grub"],
+    "E3C9E316-0B5C-4DB8-817D-F92DF00215AE": ["msftres"],
+}
+MBR_FLAGS = {
+    0x8E: ["lvm"],
+    0xFD: ["raid"],
+    0xEF: ["esp"],
+}
+
+def _pread(fd: int, size: int, offset: int) -> bytes:
+    data = os.pread(fd, size, offset)
+    return data if len(data) == size else b""
+
+def _gpt_header(data: bytes) -> Optional[dict]:
+    if len(data) < GPT_HEADER.size:
+        return None
+    (signature, _, header_size, header_crc, _, current_lba, backup_lba, first_lba, last_lba,
+     disk_guid, entries_lba, num_entries, entry_size, entries_crc) = GPT_HEADER.unpack_from(data)
+    if signature != GPT_SIGNATURE or not GPT_HEADER.size <= header_size <= len(data):
+        return None
+    if entry_size < GPT_ENTRY.size or num_entries == 0:
+        return None
+
+    raw = bytearray(data[:header_size])
+    raw[16:20] = b"\0\0\0\0"
+    if zlib.crc32(raw) != header_crc:
+        return None
+
+    return {
+        "current_lba": current_lba,
+        "backup_lba": backup_lba,
+        "first_lba": first_lba,
+        "last_lba": last_lba,
+        "disk_guid": str(uuid.UUID(bytes_le=disk_guid)).upper(),
+        "entries_lba": entries_lba,
+        "num_entries": num_entries,
+        "entry_size": entry_size,
+        "entries_crc": entries_crc,
+    }
+
+def _gpt_entries(data: bytes, header: dict) -> Optional[list]:
+    if zlib.crc32(data) != header["entries_crc"]:
+        return None
+
+    parts = []
+    for idx in range(header["num_entries"]):
+        type_guid, part_guid, first, last, attrs, name = GPT_ENTRY.unpack_from(data, idx * header["entry_size"])
+        if type_guid == b"\0" * 16:
+            continue
+        part_type = str(uuid.UUID(bytes_le=type_guid)).upper()
+        parts.append({
+            "num": idx + 1,
+            "first": first,
+            "last": last,
+            "type": part_type,
+            "uuid": str(uuid.UUID(bytes_le=part_guid)).upper(),
+            "name": name.decode("utf-16-le", errors="replace").split("\0", 1)[0],
+            "flags": list(GPT_FLAGS.get(part_type, [])),
+        })
+    return parts
+
+def _read_gpt(fd: int, head: bytes, header_lba: int, sector_size: int) -> Optional[list]:
+    offset = header_lba * sector_size
+    header = _gpt_header(head[offset:offset + sector_size] if head else _pread(fd, sector_size, offset))
+    if header is None or header["current_lba"] != header_lba:
+        return None
+
+    start = header["entries_lba"] * sector_size
+    length = header["num_entries"] * header["entry_size"]
+    if head and start + length <= len(head):
+        data = head[start:start + length]
+    else:
+        data = _pread(fd, length, start)
+    if len(data) != length:
+        return None
+
+    return _gpt_entries(data, header)
+
+def _mbr_entries(sector: bytes) -> list:
+    entries = []
+    for idx in range(4):
+        status, _, part_type, _, first, count = MBR_ENTRY.unpack_from(sector, MBR_ENTRIES_OFFSET + idx * MBR_ENTRY.size)
+        if part_type == 0 or count == 0:
+            continue
+        entries.append((idx + 1, status, part_type, first, count))
+    return entries
+
+def _mbr_part(num: int, status: int, part_type: int, first: int, count: int) -> dict:
+    flags = ["boot"] if status == 0x80 else []
+    flags.extend(MBR_FLAGS.get(part_type, []))
+    return {
+        "num": num,
+        "first": first,
+        "last": first + count - 1,
+        "type": f"{part_type:x}",
+        "name": "",
+        "flags": flags,
+    }
+
+def _read_mbr(fd: int, mbr: bytes, sector_size: int) -> list:
+    parts = []
+    for num, status, part_type, first, count in _mbr_entries(mbr):
+        parts.append(_mbr_part(num, status, part_type, first, count))
+        if part_type not in MBR_EXTENDED:
+            continue
+
+        # walk the chain of extended boot records; logical partitions are numbered from 5
+        ebr_lba, logical = first, 5
+        while ebr_lba and logical < 5 + MAX_LOGICAL:
+            ebr = _pread(fd, sector_size, ebr_lba * sector_size)
+            if ebr[510:512] != MBR_SIGNATURE:
+                break
+            entries = _mbr_entries(ebr)
+            if not entries:
+                break
+            _, l_status, l_type, l_first, l_count = entries[0]
+            parts.append(_mbr_part(logical, l_status, l_type, ebr_lba + l_first, l_count))
+            logical += 1
+            ebr_lba = first + entries[1][3] if len(entries) > 1 and entries[1][2] in MBR_EXTENDED else 0
+    return parts
+
+def read_partition_table(fd: int, sector_size: int = DEFAULT_SECTOR_SIZE, total_sectors: Optional[int] = None) -> dict:
+    """
+    Read the partition table of an open disk.
+
+    Args:
+        fd (int): File descriptor of the disk (or disk image) opened for reading.
+        sector_size (int): Logical sector size of the disk.
+        total_sectors (int): Size of the disk in logical sectors (needed to locate the backup GPT).
+
+    Returns:
+        dict: {"table": "gpt" | "msdos" | "unknown", "partitions": [...]}
+    """
+    head = os.pread(fd, INITIAL_READ, 0)
+    mbr = head[:sector_size]
+
+    if len(mbr) < 512 or mbr[510:512] != MBR_SIGNATURE:
+        return {"table": "unknown", "partitions": []}
+
+    entries = _mbr_entries(mbr)
+    if any(part_type == MBR_PROTECTIVE for _, _, part_type, _, _ in entries):
+        parts = _read_gpt(fd, head, 1, sector_size)
+        if parts is None and total_sectors:
+            parts = _read_gpt(fd, b"", total_sectors - 1, sector_size)
+        if parts is None:
+            return {"table": "unknown", "partitions": []}
+        return {"table": "gpt", "partitions": parts}
+
+    return {"table": "msdos", "partitions": _read_mbr(fd, mbr, sector_size)}
+
+def _in_unit(sectors: int, sector_size: int, unit: str, offset: int = 0):
+    if unit == SECTOR_UNIT:
+        return sectors
+    value = Fraction(sectors * sector_size + offset, PARTED_UNITS[unit])
+    return int(value) if value.denominator == 1 else float(value)
+
+def parted_info(device: str, table: dict, sector_size: int, total_sectors: int, unit: str = SECTOR_UNIT,
+                disk_meta: Optional[dict] = None) -> dict:
+    """
+    Render a partition table read by read_partition_table() in the parted 'state: info' format.
+
+    In sectors, 'end' is the last sector of a partition; in byte units it is the position of its last byte,
+    as reported by parted.
+
+    Raises:
+        ValueError: If the unit is not supported.
+    """
+    canonical = normalize_unit(unit)
+    if canonical is None or (PARTED_UNITS.get(canonical) is None and canonical != SECTOR_UNIT):
+        raise ValueError(f"Unsupported unit {unit!r}")
+
+    disk = {
+        "dev": device,
+        "size": _in_unit(total_sectors, sector_size, canonical),
+        "unit": canonical.lower(),
+        "table": table["table"],
+        "logical_block": sector_size,
+    }
+    disk.update(disk_meta or {})
+
+    last_byte = 0 if canonical == SECTOR_UNIT else -1
+    partitions = [
+        {
+            "num": p["num"],
+            "begin": _in_unit(p["first"], sector_size, canonical),
+            "end": _in_unit(p["last"] + (0 if canonical == SECTOR_UNIT else 1), sector_size, canonical, last_byte),
+            "size": _in_unit(p["last"] - p["first"] + 1, sector_size, canonical),
+            "unit": canonical.lower(),
+            "fstype": "",
+            "name": p["name"],
+            "flags": p["flags"],
+        }
+        for p in sorted(table["partitions"], key=lambda p: p["num"])
+    ]
+
+    return {"disk": disk, "partitions": partitions}
+
+QUEUE_LIMITS = {
+    "logical_block": "queue/logical_block_size",
+    "physical_block": "queue/physical_block_size",
+    "alignment_offset": "alignment_offset",
+    "minimum_io_size": "queue/minimum_io_size",
+    "optimal_io_size": "queue/optimal_io_size",
+}
+
+def read_sysfs(sysdir, name):
+    try:
+        with open(os.path.join(sysdir, name)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def disk_geometry(device):
+    """
+    Return (size in 512-byte sectors, disk metadata) for `device` from sysfs.
+    """
+    sysdir = f"/sys/class/block/{os.path.basename(os.path.realpath(device))}"
+
+    meta = {}
+    for key, name in QUEUE_LIMITS.items():
+        value = read_sysfs(sysdir, name)
+        if value is not None and value.isdigit():
+            meta[key] = int(value)
+
+    model = " ".join(filter(None, (read_sysfs(sysdir, "device/vendor"), read_sysfs(sysdir, "device/model"))))
+    if model:
+        meta["model"] = model
+
+    size = read_sysfs(sysdir, "size")
+    return (int(size) if size and size.isdigit() else None), meta
+
+def disk_info(device, unit):
+    size_512, meta = disk_geometry(device)
+    sector_size = meta.get("logical_block") or DEFAULT_SECTOR_SIZE
+    meta["logical_block"] = sector_size
+
+    fd = os.open(device, os.O_RDONLY)
+    try:
+        if size_512 is None:
+            # not a block device known to sysfs (e.g. a disk image)
+            total_sectors = os.lseek(fd, 0, os.SEEK_END) // sector_size
+        else:
+            # sysfs reports the size in 512-byte units regardless of the sector size
+            total_sectors = size_512 * 512 // sector_size
+        table = read_partition_table(fd, sector_size, total_sectors)
+    finally:
+        os.close(fd)
+
+    return parted_info(device, table, sector_size, total_sectors, unit, meta)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Helpers for turning partition plans into a single sfdisk script.
+
+Provides conversion of plan positions (e.g. '2048s', '1024MiB', '100%') into sectors and
+generation of one sfdisk input script that creates all planned partitions at once.
+"""
+
+import re
+from typing import Optional
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.parted_units import (
+    DEFAULT_SECTOR_SIZE,
+    PERCENT_UNIT,
+    SECTOR_UNIT,
+    convert_to_bytes,
+    parse_size,
+)
+
+DOCUMENTATION = r'''
+---
+module_utils: sfdisk_script
+author: Alexander Ursu
+short_description: Build sfdisk scripts from partition plans
+description:
+  - This utility converts partition plans returned by C(validate_partitions) or C(validate_partitions_system)
+    into an sfdisk input script, so all new partitions of a disk are written with one table update.
+  - Partitions are created with the LVM partition type (the equivalent of the parted C(lvm) flag).
+requirements: []
+'''
+
+EXAMPLES = r'''
+# Partition 6 from sector 2048 to 4196351 on a GPT disk
+>>> build_script("/dev/sda", [{"num": 6, "part_start": "2048s", "part_end": "4196351s"}], "gpt")
+"/dev/sda6 : start=2048, size=4194304, type=E6D6D379-F507-44C2-A23C-238F2A3DF928\n"
+
+# Remaining space of the disk
+>>> to_sectors("100%")
+None
+'''
+
+RETURN = r'''
+build_script:
+  description: sfdisk input script (one line per partition, with a C(label) header for new tables).
+  type: str
+  returned: when called
+  raises:
+    - ValueError on invalid partition number, position or label
+
+to_sectors:
+  description: Position in sectors, or None for C(100%) (up to the end of the free space).
+  type: int
+  returned: when called
+  raises:
+    - ValueError on invalid or unaligned position
+'''
+
+# partition type GUID / MBR id sfdisk uses for Linux LVM
+LVM_PART_TYPES = {
+    "gpt": "E6D6D379-F507-44C2-A23C-238F2A3DF928",
+    "dos": "8e",
+}
+
+# parted label → sfdisk label
+SFDISK_LABELS = {
+    "gpt": "gpt",
+    "msdos": "dos",
+    "dos": "dos",
+}
+
+_PARTNO_RE = re.compile(r"(\d+)$")
+
+def sfdisk_label(label: Optional[str]) -> str:
+    """
+    Return the sfdisk label name for a parted label (e.g. 'msdos' → 'dos').
+
+    Raises:
+        ValueError: If the label is not supported by sfdisk scripts.
+    """
+    result = SFDISK_LABELS.get(label or "gpt")
+    if result is None:
+        raise ValueError(f"Unsupported partition table label {label!r}. Supported: gpt, msdos.")
+    return result
+
+def partition_node(device: str, num: int) -> str:
+    """
+    Return the partition device node for `device` and partition number `num`.
+
+    Examples:
+    - /dev/sda, 1        → /dev/sda1
+    - /dev/nvme0n1, 1    → /dev/nvme0n1p1
+    """
+    return f"{device}p{num}" if device[-1:].isdigit() else f"{device}{num}"
+
+def partition_number(node: str) -> Optional[int]:
+    """
+    Return the partition number of a device node (e.g. '/dev/nvme0n1p3' → 3), or None.
+    """
+    match = _PARTNO_RE.search(node or "")
+    return int(match.group(1)) if match else None
+
+def to_sectors(value, sector_size: int = DEFAULT_SECTOR_SIZE) -> Optional[int]:
+    """
+    Convert a plan position into a sector number.
+
+    Values without a unit are read as MiB, like parted does with 'unit: MiB'.
+    '100%' means the end of the free space and is returned as None.
+
+    Raises:
+        ValueError: If the value can not be converted or is not a whole number of sectors.
+    """
+    parsed = parse_size(value, "MiB")
+    if parsed is None:
+        raise ValueError(f"Invalid partition position {value!r}")
+
+    number, unit = parsed
+    if unit == PERCENT_UNIT:
+        if number != 100:
+            raise ValueError(f"Only '100%' is supported as a relative partition position, got {value!r}")
+        return None
+    if unit == SECTOR_UNIT:
+        if number.denominator != 1:
+            raise ValueError(f"Partition position {value!r} is not a whole number of sectors")
+        return int(number)
+
+    size = convert_to_bytes(value, "MiB", sector_size)
+    if size % sector_size:
+        raise ValueError(f"Partition position {value!r} is not a multiple of the sector size ({sector_size})")
+    return size // sector_size
+
+def script_line(device: str, part: dict, label: str, sector_size: int = DEFAULT_SECTOR_SIZE) -> str:
+    """
+    Return the sfdisk script line creating one planned partition.
+    """
+    try:
+        num = int(part.get("num"))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid partition number {part.get('num')!r} for disk '{device}'")
+
+    start = to_sectors(part.get("part_start"), sector_size)
+    end = to_sectors(part.get("part_end"), sector_size)
+    if start is None:
+        raise ValueError(f"Partition {num} on disk '{device}': start position must be absolute")
+
+    fields = [f"start={start}"]
+    if end is not None:
+        # plan end is the last (inclusive) sector
+        if end < start:
+            raise ValueError(f"Partition {num} on disk '{device}': end {end}s is before start {start}s")
+        fields.append(f"size={end - start + 1}")
+    fields.append(f"type={LVM_PART_TYPES[label]}")
+
+    return f"{partition_node(device, num)} : {', '.join(fields)}"
+
+def build_script(device: str, parts: list, label: Optional[str] = "gpt", sector_size: int = DEFAULT_SECTOR_SIZE,
+                 new_table: bool = False) -> str:
+    """
+    Build one sfdisk script creating all given partitions.
+
+    Args:
+        device (str): Disk device path.
+        parts (list): Partition plans with 'num', 'part_start' and 'part_end'.
+        label (str): Partition table label ('gpt' or 'msdos').
+        sector_size (int): Logical sector size of the disk.
+        new_table (bool): Whether a new partition table is created (adds a 'label' header).
+
+    Returns:
+        str: sfdisk input script.
+    """
+    label = sfdisk_label(label)
+
+    lines = [f"label: {label}", ""] if new_table else []
+    lines.extend(script_line(device, part, label, sector_size) for part in parts)
+
+    return "\n".join(lines) + "\n"
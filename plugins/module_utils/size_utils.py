@@ -3,21 +3,34 @@
 # SPDX-License-Identifier: MIT
 
 """
-Helper utility for converting size strings to MiB using binary units.
-
-Provides to_mib() function that supports 'm', 'g', 't' suffixes for MiB, GiB, and TiB respectively.
+Exact integer-byte Size value type shared by disk and LVM planning, and the to_mib() converter
+supporting 'm', 'g', 't' suffixes for MiB, GiB, and TiB respectively.
 """
 
-from ansible.errors import AnsibleFilterError
+import re
+from fractions import Fraction
+from functools import total_ordering
+from typing import Optional
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.parted_units import (
+    DEFAULT_SECTOR_SIZE,
+    PARTED_UNITS,
+    PERCENT_UNIT,
+    SECTOR_UNIT,
+    MiB,
+    parse_size,
+)
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.validation import PlanError
 
 DOCUMENTATION = r'''
 ---
 module_utils: size_utils
 author: Alexander Ursu
-short_description: Convert disk size strings into MiB using binary units (m, g, t)
+short_description: Exact byte sizes parsed from parted, LVM and percentage size strings
 description:
-  - This utility provides a simple converter for sizes like '400g', '512m', '1t'
-    into MiB values. It supports only binary units, not decimal (e.g., GB vs GiB).
+  - C(Size) holds an exact integer number of bytes. C(Size.parse) accepts parted units ('1.5TiB', '500GB',
+    '2048s'), LVM-style binary suffixes ('400g', '512m', '1t') and percentages ('50%', '100%FREE'); sizes
+    must not be negative.
+  - C(to_mib) converts sizes like '400g', '512m', '1t' into MiB values, with binary units only.
   - Used internally by filters and validation logic for partitioning and LVM.
 requirements: []
 '''
@@ -37,10 +50,20 @@ EXAMPLES = r'''
 
 # Raise error on invalid string
 >>> to_mib("500x")
-AnsibleFilterError
+PlanError
 '''
 
 RETURN = r'''
+Size:
+  description: >
+    Immutable size value holding an exact integer number of bytes. Parses parted units
+    (e.g. '1.5TiB', '500GB', '2048s'), LVM-style binary suffixes ('400g', '512m', '1t')
+    and percentages ('50%', '100%FREE') resolved against a given total.
+  type: Size
+  returned: when called
+  raises:
+    - ValueError on invalid format, unsupported unit, negative size or unresolved percentage
+
 to_mib:
   description: >
     Converts a string or number representing a size into MiB. Accepts units:
@@ -48,7 +71,7 @@ to_mib:
   type: float
   returned: when called
   raises:
-    - AnsibleFilterError on invalid format or unsupported unit
+    - PlanError (AnsibleFilterError on the controller) on invalid format or unsupported unit
 '''
 
 def to_mib(value):
@@ -65,7 +88,7 @@ def to_mib(value):
         return float(value)
 
     if not isinstance(value, str):
-        raise AnsibleFilterError(f"Invalid type for size: {type(value)}")
+        raise PlanError(f"Invalid type for size: {type(value)}")
 
     value = value.strip().lower()
 
@@ -79,6 +102,209 @@ def to_mib(value):
         else:
             raise ValueError(f"Unsupported unit in {value}")
     except ValueError:
-        raise AnsibleFilterError(
+        raise PlanError(
             f"Unsupported or invalid size format: '{value}'. Only 'm', 'g', and 't' binary units are supported."
         )
+
+
+# LVM-style single letter suffixes (binary multiples, case-insensitive), as accepted by lvcreate --size
+LVM_UNITS = {
+    "b": 1,
+    "k": 1024,
+    "m": 1024 ** 2,
+    "g": 1024 ** 3,
+    "t": 1024 ** 4,
+    "p": 1024 ** 5,
+    "e": 1024 ** 6,
+}
+
+# bases for percentages accepted by lvcreate --extents
+PERCENT_BASES = ("FREE", "VG", "PVS", "ORIGIN")
+
+_RELATIVE_RE = re.compile(r"^\s*([0-9]+(?:\.[0-9]*)?)\s*%\s*(FREE|VG|PVS|ORIGIN)\s*$", re.IGNORECASE)
+# lvcreate reads a leading '+' or '-' as a change of the current size, so signs are not accepted ('-' only to
+# report the value as negative)
+_LVM_RE = re.compile(r"^\s*(-?[0-9]*\.?[0-9]+)\s*([bkmgtpe])\s*$", re.IGNORECASE)
+
+@total_ordering
+class Size:
+    """
+    Immutable size value holding an exact integer number of bytes.
+    """
+    __slots__ = ("_bytes",)
+
+    def __init__(self, value: int = 0):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError(f"Size must be constructed from an integer number of bytes, got {type(value).__name__}")
+        object.__setattr__(self, "_bytes", value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Size is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Size is immutable")
+
+    def __reduce__(self):
+        return (Size, (self._bytes,))
+
+    @classmethod
+    def relative(cls, value) -> Optional[tuple[Fraction, str]]:
+        """
+        Parse an LVM percentage (e.g. '100%FREE', '50%VG') into (percent, base), or None.
+        """
+        if not isinstance(value, str):
+            return None
+        match = _RELATIVE_RE.match(value)
+        if match is None:
+            return None
+        return Fraction(match.group(1)), match.group(2).upper()
+
+    @classmethod
+    def parse(cls, value, unit: Optional[str] = "MiB", sector_size: int = DEFAULT_SECTOR_SIZE,
+              total: Optional["Size"] = None) -> "Size":
+        """
+        Parse a size value into a Size.
+
+        Accepts numbers (interpreted in `unit`), strings with a parted unit suffix
+        ('1.5TiB', '500GB', '2048s', '50%'), LVM-style binary suffixes ('400g', '512m', '1t')
+        and LVM percentages ('100%FREE'). Percentages are resolved against `total`.
+
+        Raises:
+            ValueError: If the value can not be converted or is negative.
+        """
+        if isinstance(value, Size):
+            return value
+
+        size = cls._parse(value, unit, sector_size, total)
+        if size.bytes < 0:
+            raise ValueError(f"Size must not be negative: {value!r}")
+        return size
+
+    @classmethod
+    def _parse(cls, value, unit, sector_size, total) -> "Size":
+
+        relative = cls.relative(value)
+        if relative is not None:
+            percent, _ = relative
+            if total is None:
+                raise ValueError(f"Relative size {value!r} requires a total size to resolve against")
+            return cls(int(percent * total.bytes / 100))
+
+        if isinstance(value, str):
+            match = _LVM_RE.match(value)
+            if match is not None:
+                return cls(int(Fraction(match.group(1)) * LVM_UNITS[match.group(2).lower()]))
+
+        parsed = parse_size(value, unit)
+        if parsed is None:
+            raise ValueError(f"Unsupported or invalid size: {value!r}")
+
+        number, canonical = parsed
+        if canonical == SECTOR_UNIT:
+            return cls(int(number * sector_size))
+        if canonical == PERCENT_UNIT:
+            if total is None:
+                raise ValueError(f"Relative size {value!r} requires a total size to resolve against")
+            return cls(int(number * total.bytes / 100))
+        return cls(int(number * PARTED_UNITS[canonical]))
+
+    @classmethod
+    def from_mib(cls, value) -> "Size":
+        return cls(int(Fraction(value) * MiB))
+
+    @classmethod
+    def from_sectors(cls, count: int, sector_size: int = DEFAULT_SECTOR_SIZE) -> "Size":
+        return cls(count * sector_size)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def mib(self) -> float:
+        return self._bytes / MiB
+
+    def sectors(self, sector_size: int = DEFAULT_SECTOR_SIZE) -> int:
+        """
+        Return the number of whole sectors (rounded down).
+        """
+        return self._bytes // sector_size
+
+    def align_down(self, grain: "Size") -> "Size":
+        return Size(self._bytes - self._bytes % grain.bytes)
+
+    def align_up(self, grain: "Size") -> "Size":
+        return Size(-(-self._bytes // grain.bytes) * grain.bytes)
+
+    def round_to(self, grain: "Size") -> "Size":
+        """
+        Return the nearest multiple of `grain` (halves rounded up).
+        """
+        return Size((self._bytes + grain.bytes // 2) // grain.bytes * grain.bytes)
+
+    def format(self, unit: str = "MiB", sector_size: int = DEFAULT_SECTOR_SIZE) -> str:
+        """
+        Render the size as an exact parted value (e.g. '1024MiB', '2048s').
+
+        Falls back to bytes if the size is not a whole multiple of `unit`.
+        """
+        multiplier = sector_size if unit == SECTOR_UNIT else PARTED_UNITS.get(unit)
+        if not multiplier:
+            raise ValueError(f"Unsupported unit for formatting: {unit!r}")
+        if self._bytes % multiplier:
+            return f"{self._bytes}B"
+        return f"{self._bytes // multiplier}{unit}"
+
+    def __add__(self, other):
+        if isinstance(other, Size):
+            return Size(self._bytes + other._bytes)
+        return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, Size):
+            return Size(self._bytes - other._bytes)
+        return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, int) and not isinstance(other, bool):
+            return Size(self._bytes * other)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __floordiv__(self, other):
+        if isinstance(other, Size):
+            return self._bytes // other._bytes
+        if isinstance(other, int) and not isinstance(other, bool):
+            return Size(self._bytes // other)
+        return NotImplemented
+
+    def __mod__(self, other):
+        if isinstance(other, Size):
+            return Size(self._bytes % other._bytes)
+        return NotImplemented
+
+    def __neg__(self):
+        return Size(-self._bytes)
+
+    def __bool__(self):
+        return self._bytes != 0
+
+    def __eq__(self, other):
+        if isinstance(other, Size):
+            return self._bytes == other._bytes
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Size):
+            return self._bytes < other._bytes
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._bytes)
+
+    def __repr__(self):
+        return f"Size({self._bytes})"
+
+    def __str__(self):
+        return f"{self.mib:.2f} MiB"
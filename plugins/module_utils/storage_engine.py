@@ -0,0 +1,573 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Storage convergence on the managed node.
+
+Plans the partitions, physical volumes, volume group, logical volumes, filesystems and mounts of
+one host against its live state and applies every phase in the same process, recording the time
+spent in each phase.
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import partial
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.dag import DagError, Operation, run_operations
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.dev_probe import (
+    MOUNTINFO,
+    ProbeError,
+    parse_mountinfo,
+    probe_devices,
+)
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.disks_helpers import Partition, PartitionInput
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.fstab import fstab_entry, update_fstab
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_apply import (
+    LvmError,
+    batch_error,
+    lvcreate_args,
+    pv_commands,
+    run_lvm,
+    run_lvm_batch,
+)
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_helpers import Device, VolumeGroup, VolumeInput, to_size
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_report import ReportError, lvm_fullreport
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.mkfs import (
+    MkfsError,
+    apply_jobs,
+    filesystem_jobs,
+    make_filesystem,
+)
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.partition_apply import (
+    ApplyError,
+    apply_plan,
+    apply_plans,
+    udev_settle,
+)
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.partition_table import disk_info
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.size_utils import Size
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.validation import PlanError
+
+DOCUMENTATION = r'''
+---
+module_utils: storage_engine
+author: Alexander Ursu
+short_description: Converge partitions, LVM, filesystems and mounts of a host in one process
+description:
+  - C(StorageEngine) takes the C(partitions), C(vg_name) and C(volumes) role variables, plans every phase
+    against the state read on the managed node and applies it, in the order partitions, physical volumes and
+    volume group, logical volumes, filesystems, mounts.
+  - In check mode nothing is changed; objects which would be created by an earlier phase are planned as
+    missing by the later phases. If a C(vgextend) is queued, new LVs which do not fit into the current free
+    space of the volume group are planned for creation and checked by C(lvcreate).
+  - Each phase reports C(changed), C(elapsed) (seconds) and its plan or results.
+  - C(run_graph) plans all phases first and then applies the changes as one dependency graph of operations
+    (see C(module_utils/dag.py)), reported in an additional C(apply) phase.
+requirements:
+  - sfdisk (util-linux)
+  - lvm2
+'''
+
+EXAMPLES = r'''
+>>> engine = StorageEngine(module, partitions={"/dev/sdb": [{"num": 1}]}, vg_name="data",
+...                        volumes=[{"name": "data1", "vg": "data", "size": "10g", "filesystem": "xfs"}])
+>>> result = engine.run()
+>>> result["phases"]["volumes"]["plan"]
+[{'name': 'data1', 'path': '/dev/data/data1', 'action': 'create'}]
+'''
+
+RETURN = r'''
+StorageEngine.run:
+  description: Dictionary with C(changed) and C(phases) (phase name → result).
+  type: dict
+  returned: when called
+  raises:
+    - EngineError if planning or applying a phase fails
+
+StorageEngine.run_graph:
+  description: Same as C(run), with the C(apply) phase holding the C(graph) and the C(operations) results.
+  type: dict
+  returned: when called
+  raises:
+    - EngineError if planning fails or any operation fails (after all independent operations ran)
+'''
+
+def sectors(value) -> int:
+    """
+    Return a sector count or position ('2048s' or 2048) as int, or None.
+    """
+    try:
+        return int(str(value).rstrip("s"))
+    except ValueError:
+        return None
+
+def parent_mountpoint(target: str, targets) -> str:
+    """
+    Return the longest of `targets` below which `target` is mounted, or None.
+    """
+    path = os.path.normpath(target)
+    parents = [
+        t for t in targets
+        if os.path.normpath(t) != path and os.path.commonpath([os.path.normpath(t), path]) == os.path.normpath(t)
+    ]
+    return max(parents, key=lambda t: len(os.path.normpath(t))) if parents else None
+
+class EngineError(Exception):
+    def __init__(self, msg, phase=None, **kwargs):
+        super().__init__(msg)
+        self.msg = msg
+        self.phase = phase
+        self.details = kwargs
+
+class StorageEngine:
+    def __init__(self, module, partitions=None, vg_name=None, volumes=None, label="gpt",
+                 partition_workers=8, mkfs_workers=4, settle_timeout=120, fstab="/etc/fstab", lvm_shell=True):
+        self.module = module
+        self.label = label
+        self.partition_workers = partition_workers
+        self.mkfs_workers = mkfs_workers
+        self.settle_timeout = settle_timeout
+        self.fstab = fstab
+        self.lvm_shell = lvm_shell
+
+        self.partitions = partitions or {}
+        self.volumes = volumes or []
+        self.vg_name = vg_name
+
+        # inputs are validated up front, before anything is changed
+        try:
+            self._partitions = PartitionInput(self.partitions) if self.partitions else None
+            self._volumes = VolumeInput(self.volumes) if self.volumes else None
+        except PlanError as e:
+            raise EngineError(e.message, "input")
+
+        if self._volumes is not None:
+            if self.vg_name and self._volumes.vg_name != self.vg_name:
+                raise EngineError(
+                    f"Volumes belong to volume group '{self._volumes.vg_name}', expected '{self.vg_name}'.", "input"
+                )
+            self.vg_name = self._volumes.vg_name
+        if self._partitions is not None and not self.vg_name:
+            raise EngineError("'vg_name' is required to use the partitions as physical volumes.", "input")
+
+        self.changed = False
+        self.phases = {}
+        # check mode: paths and objects that would have been created by earlier phases
+        self._pending_paths = set()
+        self._pending_vg = False
+        self._pending_extend = False
+        self._pending_space = Size(0)
+        self._deferred = module.check_mode
+        self._disk_tables = {}
+        self._partition_plans = {}
+        self._volumes_plan = None
+        self._vg_free = None
+        self._lvm = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time one phase and record its result; errors are raised as EngineError of the phase.
+        """
+        result = {"changed": False}
+        started = time.monotonic()
+        try:
+            yield result
+        except PlanError as e:
+            raise EngineError(e.message, name)
+        except (ApplyError, ProbeError, ReportError) as e:
+            raise EngineError(e.msg, name, **e.details)
+        except (LvmError, MkfsError) as e:
+            raise EngineError(e.msg, name, rc=e.rc)
+        except OSError as e:
+            raise EngineError(str(e), name)
+        finally:
+            result["elapsed"] = round(time.monotonic() - started, 3)
+            self.phases[name] = result
+            self.changed = self.changed or result["changed"]
+
+    @property
+    def lvm(self):
+        if self._lvm is None:
+            self._lvm = self.module.get_bin_path("lvm", required=True)
+        return self._lvm
+
+    def lvm_info(self):
+        return lvm_fullreport(self.module, self.lvm, [self.vg_name])
+
+    def run(self) -> dict:
+        """
+        Plan and apply the phases one after the other, reading the state again for every phase.
+        """
+        if self._partitions is not None:
+            self.apply_partitions()
+            self.apply_pvs()
+        if self._volumes is not None:
+            self.apply_volumes()
+            self.apply_filesystems()
+            self.apply_mounts()
+        return {"changed": self.changed, "phases": self.phases}
+
+    def run_graph(self, max_workers=4) -> dict:
+        """
+        Plan all phases up front, then apply them as one dependency graph of operations.
+
+        Objects created by the graph are planned as missing, as in check mode. The 'apply' phase reports
+        the graph and the result of every operation; in check mode only the graph.
+        """
+        self._deferred = True
+        creates, pv_cmds, jobs, mounts = {}, [], [], (None, [])
+        if self._partitions is not None:
+            with self.phase("partitions") as result:
+                creates = self.plan_partitions(result)
+            with self.phase("pvs") as result:
+                pv_cmds = self.plan_pvs(result)
+        if self._volumes is not None:
+            with self.phase("volumes") as result:
+                self.plan_volumes(result)
+            with self.phase("filesystems") as result:
+                jobs = self.filesystem_jobs()
+                result.update(
+                    filesystems={job["path"]: dict(name=job["name"], fstype=job["fstype"]) for job in jobs},
+                    changed=bool(jobs),
+                )
+            with self.phase("mounts") as result:
+                mounts = self.plan_mounts(result)
+
+        with self.phase("apply") as result:
+            self.apply_operations(result, self.operations(creates, pv_cmds, jobs, *mounts), max_workers)
+        return {"changed": self.changed, "phases": self.phases}
+
+    def apply_operations(self, result, operations, max_workers):
+        try:
+            result["graph"] = [op.describe() for op in operations]
+            if self.module.check_mode or not operations:
+                return
+            results = run_operations(operations, max_workers)
+        except DagError as e:
+            raise PlanError(str(e))
+
+        result.update(
+            operations=results,
+            changed=any(isinstance(r.get("result"), dict) and r["result"].get("changed") for r in results.values()),
+        )
+        failed = {name: r["error"] for name, r in results.items() if r["status"] == "failed"}
+        if failed:
+            raise ApplyError(
+                f"{len(failed)} of {len(operations)} operations failed: {', '.join(failed)}", failed=failed,
+            )
+
+    def plan_partitions(self, result) -> dict:
+        """
+        Plan the partitions of all disks; return disk → partition plans with action 'create'.
+        """
+        tables = self._disk_tables = {disk: disk_info(disk, "s") for disk in self.partitions}
+        plans = self._partitions.plan(tables, default_label=self.label)
+        result["plan"] = self._partition_plans = plans
+
+        creates = {}
+        for disk, plan in plans.items():
+            parts = [p for p in plan if p.get("action") == "create"]
+            if parts:
+                creates[disk] = parts
+        if self._deferred:
+            self._pending_paths.update(
+                Partition({"num": p["num"]}, disk=disk).path() for disk, parts in creates.items() for p in parts
+            )
+        return creates
+
+    def apply_partitions(self):
+        with self.phase("partitions") as result:
+            if not self.plan_partitions(result):
+                return
+
+            sfdisk = self.module.get_bin_path("sfdisk", required=True)
+            disks, errors = apply_plans(self.module, sfdisk, self._partition_plans, self.label, self.partition_workers)
+            result["disks"] = disks
+            result["changed"] = any(r["changed"] for r in disks.values())
+
+            if result["changed"] and not self.module.check_mode:
+                udev_settle(self.module, self.settle_timeout)
+            if errors:
+                raise ApplyError(
+                    f"Partitioning failed on {len(errors)} of {len(self._partition_plans)} disks: "
+                    f"{', '.join(sorted(errors))}",
+                    errors=errors,
+                )
+
+    def plan_pvs(self, result) -> list:
+        """
+        Plan the physical volumes of the partitions; return the lvm commands converging the volume group.
+        """
+        paths = self._partitions.paths()
+
+        devices = probe_devices(self.module, [p for p in paths if p not in self._pending_paths])
+        for path, info in devices.items():
+            Device.from_dev_info(path, info).validate_lvm()
+
+        lvm_info = self.lvm_info()
+        vg = VolumeGroup.from_lvm_info(self.vg_name, lvm_info)
+        plan = vg.plan_pvs(paths)
+        commands = pv_commands(self.vg_name, plan, vg.is_exists)
+        result.update(plan=plan, commands=commands, changed=bool(commands))
+
+        if commands and self._deferred:
+            self._pending_vg = not vg.is_exists
+            self._pending_extend = vg.is_exists
+            self._pending_space = sum(
+                (self.pv_size(p["path"], lvm_info) for p in plan if p["action"] in ("create", "add")), Size(0),
+            )
+        return commands
+
+    def pv_size(self, path, lvm_info) -> Size:
+        """
+        Estimate the size of a PV the volume group is about to get, from lvm_info or the partition plan.
+
+        Only used for operation costs; unknown sizes count as zero.
+        """
+        pv = next((pv for pv in lvm_info["pv"] if pv.get("pv_name") == path), None)
+        if pv is not None:
+            return to_size(pv.get("pv_size"), "pv_size")
+
+        for disk, plan in self._partition_plans.items():
+            table = self._disk_tables[disk]
+            for entry in plan:
+                if Partition({"num": entry["num"]}, disk=disk).path() != path:
+                    continue
+                if entry["action"] == "create":
+                    start = sectors(entry.get("part_start"))
+                    end = table["disk"]["size"] - 1 if entry.get("part_end") == "100%" else sectors(entry.get("part_end"))
+                    count = end - start + 1 if start is not None and end is not None else 0
+                else:
+                    count = next((sectors(p["size"]) or 0 for p in table["partitions"] if p["num"] == entry["num"]), 0)
+                return Size(max(count, 0) * table["disk"]["logical_block"])
+        return Size(0)
+
+    def apply_pvs(self):
+        with self.phase("pvs") as result:
+            commands = self.plan_pvs(result)
+            if not self.module.check_mode:
+                self.run_lvm_commands(result, commands)
+
+    def plan_volumes(self, result) -> list:
+        lvm_info = self.lvm_info()
+
+        if self._pending_vg:
+            # the volume group does not exist yet, every volume will be created
+            plan = [{"name": v["name"], "path": f"/dev/{v['vg']}/{v['name']}", "action": "create"}
+                    for v in self.volumes]
+        else:
+            devices = probe_devices(self.module, [f"/dev/{v['vg']}/{v['name']}" for v in self.volumes])
+            # volumes needing the PVs of a queued vgextend are checked by lvcreate
+            plan = self._volumes.plan(lvm_info, devices, extending=self._pending_extend)
+            self._vg_free = VolumeGroup.from_lvm_info(self.vg_name, lvm_info).vg_free
+        if self._pending_vg or self._pending_extend:
+            self._vg_free = (self._vg_free or Size(0)) + self._pending_space
+        result["plan"] = self._volumes_plan = plan
+
+        created = [entry["path"] for entry in plan if entry["action"] == "create"]
+        result.update(created=created, changed=bool(created))
+        return plan
+
+    def apply_volumes(self):
+        with self.phase("volumes") as result:
+            plan = self.plan_volumes(result)
+            if not self.module.check_mode:
+                commands = [lvcreate_args(volume) for volume, entry in zip(self.volumes, plan) if entry["action"] == "create"]
+                self.run_lvm_commands(result, commands)
+
+    def run_lvm_commands(self, result, commands):
+        """
+        Run the lvm commands of a phase in one batch; the result of every command is kept in the phase result.
+        """
+        if not commands:
+            return
+        result["lvm"] = run_lvm_batch(self.module, self.lvm, commands, shell=self.lvm_shell)
+        error = batch_error(result["lvm"])
+        if error:
+            raise error
+
+    def filesystem_jobs(self) -> list:
+        try:
+            return filesystem_jobs(self.volumes, self._volumes_plan)
+        except ValueError as e:
+            raise PlanError(str(e))
+
+    def apply_filesystems(self):
+        with self.phase("filesystems") as result:
+            jobs = self.filesystem_jobs()
+
+            filesystems = {}
+            if self.module.check_mode:
+                # volumes which do not exist yet can not be probed
+                for job in jobs:
+                    if job["path"] in self.phases["volumes"]["created"]:
+                        filesystems[job["path"]] = dict(name=job["name"], fstype=job["fstype"], changed=True)
+                jobs = [job for job in jobs if job["path"] not in filesystems]
+
+            errors = {}
+            if jobs:
+                blkid = self.module.get_bin_path("blkid", required=True)
+                applied, errors = apply_jobs(self.module, blkid, jobs, self.mkfs_workers)
+                filesystems.update(applied)
+
+            result.update(filesystems=filesystems, changed=any(r["changed"] for r in filesystems.values()))
+            if errors:
+                raise MkfsError(
+                    f"Filesystem creation failed on {len(errors)} of {len(jobs)} volumes: {', '.join(sorted(errors))}"
+                )
+
+    def plan_mounts(self, result) -> tuple:
+        """
+        Plan the fstab entries and mounts; return (new fstab content or None, unmounted (volume, plan) pairs).
+        """
+        wanted = [
+            (volume, entry) for volume, entry in zip(self.volumes, self._volumes_plan)
+            if volume.get("filesystem") and volume.get("mountpoint")
+        ]
+        result.update(fstab=[], mounted=[])
+        if not wanted:
+            return None, []
+
+        entries = [fstab_entry(entry["path"], volume["mountpoint"], volume["filesystem"]) for volume, entry in wanted]
+        try:
+            with open(self.fstab) as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = ""
+        content, fstab_changed = update_fstab(current, entries)
+
+        with open(MOUNTINFO) as f:
+            mounts = parse_mountinfo(f.read())
+        unmounted = [
+            (volume, entry) for volume, entry in wanted
+            if not self.is_mounted(mounts, entry["path"], volume["mountpoint"])
+        ]
+
+        result.update(
+            fstab=fstab_changed,
+            mounted=[volume["mountpoint"] for volume, _ in unmounted],
+            changed=bool(fstab_changed or unmounted),
+        )
+        return (content if fstab_changed else None), unmounted
+
+    def apply_mounts(self):
+        with self.phase("mounts") as result:
+            content, unmounted = self.plan_mounts(result)
+            if self.module.check_mode:
+                return
+            if content is not None:
+                self.write_fstab(content)
+            # parents first, so nested mount points are created on the mounted filesystem
+            for volume, entry in sorted(unmounted, key=lambda pair: len(os.path.normpath(pair[0]["mountpoint"]))):
+                self.make_mountpoint(volume["mountpoint"])
+                self.mount(entry["path"], volume["mountpoint"], volume["filesystem"])
+
+    def operations(self, creates, pv_cmds, jobs, fstab_content, unmounted) -> list:
+        """
+        Return the planned changes as operations with their dependencies (see module_utils/dag.py).
+
+        Commands of the lvm binary share the 'lvm' lock, since LVM serializes them on its global lock anyway;
+        logical volumes are created in input order.
+        Mount points nested in another requested mount point are created and mounted after it.
+        Operations are estimated to cost 1, except mkfs, which costs the volume size in MiB.
+        """
+        ops = []
+        done_by = {}
+
+        if creates:
+            sfdisk = self.module.get_bin_path("sfdisk", required=True)
+            for disk, parts in creates.items():
+                ops.append(Operation(
+                    f"partition:{disk}",
+                    partial(apply_plan, self.module, sfdisk, disk, self._partition_plans[disk], self.label),
+                    cost=len(parts),
+                ))
+            ops.append(Operation("udev_settle", partial(udev_settle, self.module, self.settle_timeout),
+                                 deps=[op.name for op in ops]))
+
+        # pvcreate, then vgcreate or vgextend
+        vg_dep = ops[-1].name if ops else None
+        for args in pv_cmds:
+            name = f"lvm:{args[0]}"
+            ops.append(Operation(name, partial(self.lvm_operation, args), deps=[vg_dep] if vg_dep else (), lock="lvm"))
+            vg_dep = name
+
+        # lvcreate in input order: the plan allocates the free space ('%FREE' sizes, stripes) in that order
+        volumes = {volume["name"]: volume for volume in self.volumes}
+        lv_dep = vg_dep
+        for volume, entry in zip(self.volumes, self._volumes_plan or ()):
+            if entry["action"] == "create":
+                name = f"lvcreate:{entry['path']}"
+                ops.append(Operation(name, partial(self.lvm_operation, lvcreate_args(volume)),
+                                     deps=[lv_dep] if lv_dep else (), lock="lvm"))
+                done_by[entry["path"]] = lv_dep = name
+
+        if jobs:
+            blkid = self.module.get_bin_path("blkid", required=True)
+        for job in jobs:
+            name = f"mkfs:{job['path']}"
+            deps = [done_by[job["path"]]] if job["path"] in done_by else ()
+            ops.append(Operation(name, partial(self.mkfs_operation, blkid, job), deps=deps,
+                                 cost=max(self.volume_mib(volumes[job["name"]]), 1)))
+            done_by[job["path"]] = name
+
+        mount_deps = []
+        if fstab_content is not None:
+            ops.append(Operation("fstab", partial(self.write_fstab, fstab_content)))
+            mount_deps.append("fstab")
+        targets = [volume["mountpoint"] for volume, _ in unmounted]
+        for volume, entry in unmounted:
+            target = volume["mountpoint"]
+            parent = parent_mountpoint(target, targets)
+            parent_deps = [f"mount:{parent}"] if parent else []
+            ops.append(Operation(f"mkdir:{target}", partial(self.make_mountpoint, target), deps=parent_deps))
+            deps = [f"mkdir:{target}"] + parent_deps + mount_deps
+            if entry["path"] in done_by:
+                deps.append(done_by[entry["path"]])
+            ops.append(Operation(f"mount:{target}", partial(self.mount, entry["path"], target, volume["filesystem"]),
+                                 deps=deps))
+        return ops
+
+    def volume_mib(self, volume) -> float:
+        try:
+            return Size.parse(volume["size"], total=self._vg_free or Size(0)).mib
+        except ValueError:
+            return 0
+
+    def lvm_operation(self, args) -> dict:
+        run_lvm(self.module, self.lvm, args)
+        return {"changed": True, "command": args}
+
+    def mkfs_operation(self, blkid, job) -> dict:
+        changed, rc = make_filesystem(self.module, blkid, job)
+        return {"changed": changed, "rc": rc, "fstype": job["fstype"]}
+
+    def make_mountpoint(self, target) -> dict:
+        changed = not os.path.isdir(target)
+        os.makedirs(target, mode=0o755, exist_ok=True)
+        return {"changed": changed}
+
+    def mount(self, path, target, fstype) -> dict:
+        mount = self.module.get_bin_path("mount", required=True)
+        rc, out, err = self.module.run_command([mount, "-t", fstype, path, target])
+        if rc != 0:
+            raise ApplyError(f"Unable to mount {path} on {target}: {(err or out).strip()}", rc=rc)
+        return {"changed": True}
+
+    @staticmethod
+    def is_mounted(mounts, path, target) -> bool:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return any(m["target"] == target for m in mounts.get((os.major(st.st_rdev), os.minor(st.st_rdev)), []))
+
+    def write_fstab(self, content) -> dict:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.fstab) or ".", prefix=".fstab.")
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        self.module.atomic_move(tmp, self.fstab)
+        return {"changed": True}
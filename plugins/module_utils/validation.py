@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Planning error type and collection of validation errors.
+
+On the controller planning errors are Ansible filter errors; modules, which only ship module_utils,
+get a plain exception with the same 'message' attribute.
+"""
+
+from typing import Callable, Optional, Union
+
+try:
+    # controller: planning errors of the filter plugins
+    from ansible.errors import AnsibleFilterError as PlanError
+except ImportError:
+    # managed node: modules only ship module_utils
+    class PlanError(Exception):
+        def __init__(self, message=""):
+            super().__init__(message)
+            self.message = message
+
+
+DOCUMENTATION = r'''
+---
+module_utils: validation
+author: Alexander Ursu
+short_description: Planning errors and single-pass error collection
+description:
+  - C(PlanError) is raised by the planning models of C(disks_helpers) and C(lvm_helpers). On the controller it is
+    C(ansible.errors.AnsibleFilterError), on the managed node a plain exception.
+  - C(ValidationErrors) collects the errors of many checks and raises them as one report.
+requirements: []
+'''
+
+EXAMPLES = r'''
+>>> errors = ValidationErrors("'volumes'")
+>>> errors.add("first")
+>>> errors.add("second")
+>>> errors.report()
+"Found 2 errors in 'volumes':\n  - first\n  - second"
+'''
+
+RETURN = r'''
+ValidationErrors.report:
+  description: None without errors, the message of a single error, or one message listing all errors.
+  type: str
+  returned: when called
+'''
+
+class ValidationErrors:
+    """
+    Collects validation errors of an input structure, so that all of them are reported at once
+    instead of one per play run.
+
+    A single error is raised with its original message; several errors are raised as one report.
+    """
+
+    __slots__ = ("subject", "_messages")
+
+    def __init__(self, subject: str = "input"):
+        self.subject = subject
+        self._messages: list[str] = []
+
+    def add(self, error: Union[str, PlanError]) -> None:
+        self._messages.append(error.message if isinstance(error, PlanError) else str(error))
+
+    def collect(self, check: Callable, *args, **kwargs) -> bool:
+        """
+        Run `check` and record the PlanError it raises.
+
+        Returns:
+            bool: True if the check passed.
+        """
+        try:
+            check(*args, **kwargs)
+        except PlanError as e:
+            self.add(e)
+            return False
+        return True
+
+    @property
+    def messages(self) -> list[str]:
+        return list(self._messages)
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __bool__(self) -> bool:
+        return bool(self._messages)
+
+    def report(self) -> Optional[str]:
+        if not self._messages:
+            return None
+        if len(self._messages) == 1:
+            return self._messages[0]
+        lines = "\n".join(f"  - {msg}" for msg in self._messages)
+        return f"Found {len(self._messages)} errors in {self.subject}:\n{lines}"
+
+    def raise_if_any(self) -> None:
+        """
+        Raises:
+            PlanError: With the report of all collected errors, if any.
+        """
+        message = self.report()
+        if message is not None:
+            raise PlanError(message)
+
+    def __repr__(self) -> str:
+        return f"ValidationErrors({self.subject!r}, {self._messages!r})"
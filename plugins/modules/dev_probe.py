@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible module to gather device information for many paths in one invocation
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.dev_probe import ProbeError, probe_devices
+
+DOCUMENTATION = r'''
+---
+module: dev_probe
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Gather device information for many paths at once
+description:
+  - This module stats every given path, reads the mount table once from C(/proc/self/mountinfo) and runs one
+    low-level C(blkid) probe over all existing block devices.
+  - It returns a map of path to device information with the same structure as C(aursu.general.dev_info),
+    which can be passed to C(validate_lvm_partition), C(validate_volume), C(validate_volumes) and C(validate_mount)
+    in place of a single device's information.
+options:
+  paths:
+    description:
+      - List of device paths (e.g. C(/dev/sda6), C(/dev/data/data1)). Missing paths are reported as not existing.
+    type: list
+    elements: str
+    required: true
+requirements:
+  - blkid (util-linux)
+notes:
+  - Supports check mode.
+seealso:
+  - name: validate_lvm_partition
+    description: Validates that a partition can be used as a physical volume
+    plugin: aursu.lvm_setup.validate_lvm_partition
+'''
+
+EXAMPLES = r'''
+- name: Gather device information for all partitions
+  aursu.lvm_setup.dev_probe:
+    paths: "{{ partitions | aursu.lvm_setup.partition_paths_system }}"
+  register: dev_probe
+
+- name: Validate partitions for LVM
+  ansible.builtin.assert:
+    that:
+      - item | aursu.lvm_setup.validate_lvm_partition(dev_probe.devices)
+  loop: "{{ partitions | aursu.lvm_setup.partition_paths_system }}"
+'''
+
+RETURN = r'''
+devices:
+  description: Dictionary mapping each path to its device information.
+  type: dict
+  returned: always
+  sample:
+    /dev/data/data1:
+      is_exists: true
+      filetype: b
+      stat:
+        mode: 25008
+        rdev: 64512
+        size: 0
+      blkid:
+        dev_name: /dev/data/data1
+        type: xfs
+        uuid: 66310f17-f78d-421e-ae23-154fd646d32f
+        block_size: "4096"
+      mount:
+        - target: /mnt/data1
+          source: /dev/mapper/data-data1
+          fstype: xfs
+          options: rw,relatime
+    /dev/data/data2:
+      is_exists: false
+      stat: {}
+'''
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            paths=dict(type="list", elements="str", required=True),
+        ),
+        supports_check_mode=True,
+    )
+
+    try:
+        devices = probe_devices(module, module.params["paths"])
+    except ProbeError as e:
+        module.fail_json(msg=e.msg, **e.details)
+
+    module.exit_json(changed=False, devices=devices)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible module to create the filesystems of all planned logical volumes concurrently
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.mkfs import apply_jobs, filesystem_jobs
+
+DOCUMENTATION = r'''
+---
+module: filesystem_apply
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Create filesystems of all planned logical volumes concurrently
+description:
+  - This module takes the volume definitions and the plans returned by C(validate_volumes) and creates the
+    filesystem of every volume with action C(create) or C(format).
+  - The mkfs runs of different volumes are started concurrently, up to O(max_workers) at a time, and
+    the duration and outcome of each run are reported per volume.
+  - A volume that already has the requested filesystem is skipped; a volume with another filesystem
+    signature is reported as failed and left untouched.
+  - Errors of all volumes are collected and reported together after all runs finished.
+options:
+  volumes:
+    description:
+      - List of logical volume definitions (C(name), C(vg), C(filesystem), ...).
+    type: list
+    elements: dict
+    required: true
+  plan:
+    description:
+      - List of volume plans in the order of O(volumes), as returned by C(validate_volumes).
+    type: list
+    elements: dict
+    required: true
+  max_workers:
+    description:
+      - Maximum number of filesystems created at the same time.
+    type: int
+    required: false
+    default: 4
+requirements:
+  - blkid (util-linux)
+  - mkfs.xfs, mkfs.ext4 or mkfs.btrfs for the requested filesystems
+notes:
+  - Supports check mode.
+seealso:
+  - name: validate_volumes
+    description: Validates and plans all logical volumes
+    plugin: aursu.lvm_setup.validate_volumes
+'''
+
+EXAMPLES = r'''
+- name: Create filesystems
+  aursu.lvm_setup.filesystem_apply:
+    volumes: "{{ volumes }}"
+    plan: "{{ volumes_plan }}"
+    max_workers: 4
+'''
+
+RETURN = r'''
+filesystems:
+  description: Result per volume path for every volume that needed a filesystem.
+  type: dict
+  returned: always
+  sample:
+    /dev/data/data1:
+      name: data1
+      fstype: xfs
+      changed: true
+      elapsed: 41.207
+      rc: 0
+    /dev/data/data2:
+      name: data2
+      fstype: ext4
+      changed: false
+      elapsed: 0.012
+      rc: 1
+      error: "/dev/data/data2 already contains a xfs filesystem"
+errors:
+  description: Error message per failed volume path.
+  type: dict
+  returned: always
+  sample:
+    /dev/data/data2: "/dev/data/data2 already contains a xfs filesystem"
+'''
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            volumes=dict(type="list", elements="dict", required=True),
+            plan=dict(type="list", elements="dict", required=True),
+            max_workers=dict(type="int", default=4),
+        ),
+        supports_check_mode=True,
+    )
+
+    try:
+        jobs = filesystem_jobs(module.params["volumes"], module.params["plan"])
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    if not jobs:
+        module.exit_json(changed=False, filesystems={}, errors={})
+
+    blkid = module.get_bin_path("blkid", required=True)
+    filesystems, errors = apply_jobs(module, blkid, jobs, module.params["max_workers"])
+    changed = any(r["changed"] for r in filesystems.values())
+
+    if errors:
+        module.fail_json(
+            msg=f"Filesystem creation failed on {len(errors)} of {len(jobs)} volumes: {', '.join(sorted(errors))}",
+            changed=changed, filesystems=filesystems, errors=errors,
+        )
+    module.exit_json(changed=changed, filesystems=filesystems, errors={})
+
+if __name__ == "__main__":
+    main()
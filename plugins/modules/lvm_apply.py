@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible module to run all planned pvcreate, vgcreate/vgextend and lvcreate commands in one lvm shell session
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_apply import (
+    LvmError,
+    batch_error,
+    lvcreate_args,
+    pv_commands,
+    run_lvm_batch,
+)
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_helpers import VolumeGroup
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_report import ReportError, lvm_fullreport
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.validation import PlanError
+
+DOCUMENTATION = r'''
+---
+module: lvm_apply
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Apply physical volume and logical volume plans in one lvm process
+description:
+  - This module takes the physical volume plan returned by C(validate_pvs) and the volume plans returned by
+    C(validate_volumes), and runs the required LVM commands in C(lvm) shell sessions, so the LVM
+    configuration is loaded, the global lock is taken and the devices are scanned once for all logical volumes
+    instead of once per C(community.general.lvg) or C(community.general.lvol) run.
+  - PVs with action C(create) are initialized with one C(pvcreate) of all devices; the volume group is created
+    with all planned PVs, or extended with the new ones by one C(vgextend). Every volume with action C(create)
+    gets one C(lvcreate).
+  - The outcome of every command is read from its JSON command log and reported per command. The module stops
+    at the first failure, so commands depending on a failed one (e.g. C(vgcreate) after C(pvcreate), or an
+    C(lvcreate) of C(100%FREE)) never run; only C(lvcreate) commands of absolute sizes share a shell session.
+options:
+  vg_name:
+    description:
+      - Volume group name. Required with O(pvs).
+    type: str
+    required: false
+  pvs:
+    description:
+      - Physical volume plan (C(path), C(action)) as returned by C(validate_pvs).
+    type: list
+    elements: dict
+    required: false
+  lvm_info:
+    description:
+      - LVM state (e.g. the result of C(lvm_report)) used to tell whether O(vg_name) exists. If omitted and O(pvs)
+        needs changes, C(lvm fullreport) is run.
+    type: dict
+    required: false
+  volumes:
+    description:
+      - List of logical volume definitions (C(name), C(vg), C(size), ...).
+    type: list
+    elements: dict
+    required: false
+  plan:
+    description:
+      - List of volume plans in the order of O(volumes), as returned by C(validate_volumes).
+    type: list
+    elements: dict
+    required: false
+  shell:
+    description:
+      - Run the commands in one C(lvm) shell process. If disabled, or if lvm has no shell support, every command
+        runs in a process of its own.
+    type: bool
+    required: false
+    default: true
+requirements:
+  - lvm2
+notes:
+  - Supports check mode; the commands are returned without being run.
+seealso:
+  - name: validate_pvs
+    description: Plans physical volumes of a volume group
+    plugin: aursu.lvm_setup.validate_pvs
+  - name: validate_volumes
+    description: Validates and plans all logical volumes
+    plugin: aursu.lvm_setup.validate_volumes
+'''
+
+EXAMPLES = r'''
+- name: Create or extend the volume group
+  aursu.lvm_setup.lvm_apply:
+    vg_name: "{{ vg_name }}"
+    pvs: "{{ lvm_info | aursu.lvm_setup.validate_pvs(pv_paths, vg_name) }}"
+    lvm_info: "{{ lvm_info }}"
+
+- name: Create all logical volumes
+  aursu.lvm_setup.lvm_apply:
+    volumes: "{{ volumes }}"
+    plan: "{{ volumes_plan }}"
+'''
+
+RETURN = r'''
+commands:
+  description: lvm commands (argument lists without the lvm binary), in execution order.
+  type: list
+  elements: list
+  returned: always
+  sample:
+    - [pvcreate, /dev/sdb1, /dev/sdc1]
+    - [vgextend, data, /dev/sdb1, /dev/sdc1]
+    - [lvcreate, --yes, -n, data1, -L, 200g, data]
+results:
+  description:
+    - Outcome of every command (C(command), C(ok), C(messages)).
+    - Commands which did not run because an earlier one failed have C(skipped) set.
+  type: list
+  elements: dict
+  returned: unless in check mode
+  sample:
+    - command: [lvcreate, --yes, -n, data1, -L, 200g, data]
+      ok: false
+      messages: ['Volume group "data" has insufficient free space (10 extents): 51200 required.']
+    - command: [lvcreate, --yes, -n, data2, -l, 100%FREE, data]
+      ok: false
+      skipped: true
+      messages: ['not run, an earlier lvm command failed']
+'''
+
+def volume_commands(volumes, plan):
+    if len(volumes) != len(plan):
+        raise ValueError(f"Got {len(volumes)} volumes but {len(plan)} plans.")
+
+    commands = []
+    for volume, entry in zip(volumes, plan):
+        if volume.get("name") != entry.get("name"):
+            raise ValueError(f"Plan for '{entry.get('name')}' does not match volume '{volume.get('name')}'.")
+        if entry.get("action") == "create":
+            commands.append(lvcreate_args(volume))
+    return commands
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            vg_name=dict(type="str"),
+            pvs=dict(type="list", elements="dict"),
+            lvm_info=dict(type="dict"),
+            volumes=dict(type="list", elements="dict"),
+            plan=dict(type="list", elements="dict"),
+            shell=dict(type="bool", default=True),
+        ),
+        required_one_of=[("pvs", "volumes")],
+        required_together=[("vg_name", "pvs"), ("volumes", "plan")],
+        supports_check_mode=True,
+    )
+
+    vg_name = module.params["vg_name"]
+    pvs = module.params["pvs"] or []
+    lvm = module.get_bin_path("lvm", required=True)
+
+    commands = []
+    try:
+        if any(p.get("action") in ("create", "add") for p in pvs):
+            lvm_info = module.params["lvm_info"] or lvm_fullreport(module, lvm, [vg_name])
+            vg_exists = VolumeGroup.from_lvm_info(vg_name, lvm_info).is_exists
+            commands.extend(pv_commands(vg_name, pvs, vg_exists))
+        if module.params["volumes"] is not None:
+            commands.extend(volume_commands(module.params["volumes"], module.params["plan"]))
+    except ReportError as e:
+        module.fail_json(msg=e.msg, **e.details)
+    except PlanError as e:
+        module.fail_json(msg=e.message)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    if module.check_mode or not commands:
+        module.exit_json(changed=bool(commands), commands=commands)
+
+    try:
+        results = run_lvm_batch(module, lvm, commands, shell=module.params["shell"])
+    except LvmError as e:
+        module.fail_json(msg=e.msg, rc=e.rc, commands=commands)
+
+    changed = any(r["ok"] for r in results)
+    error = batch_error(results)
+    if error:
+        module.fail_json(msg=error.msg, changed=changed, commands=commands, results=results)
+    module.exit_json(changed=changed, commands=commands, results=results)
+
+if __name__ == "__main__":
+    main()
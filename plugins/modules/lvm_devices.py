@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible module to restrict the devices LVM scans to the physical volumes of the collection
+"""
+
+import os
+import tempfile
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_apply import LvmError, run_lvm
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_devices import (
+    DEVICES_FILE,
+    LVMLOCAL_CONF,
+    block_devices,
+    devices_file_commands,
+    global_filter,
+    parse_lvmconfig,
+    read_devices_file,
+    update_config_block,
+)
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_report import ReportError, lvm_fullreport
+
+DOCUMENTATION = r'''
+---
+module: lvm_devices
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Restrict LVM device scanning to the physical volumes of the host
+description:
+  - Every LVM command scans all block devices of the host unless the LVM devices file or a C(global_filter)
+    limits them. On hosts with hundreds of multipath or container devices this scan dominates the runtime of
+    every LVM step.
+  - With O(mode=devices_file) the module adds the given devices to the LVM devices file with
+    C(lvmdevices --adddev) (and, with O(exclusive), removes all other entries with C(lvmdevices --deldev)).
+  - With O(mode=filter) the module writes a C(devices/global_filter) accepting exactly the given devices to a
+    marked block of O(config_file).
+  - Both modes are idempotent; nothing is changed if the devices file or the filter already match.
+  - The result contains the effective scan configuration and all block devices of the host, so the
+    C(lvm_scan_devices) filter can show which devices LVM still scans.
+options:
+  paths:
+    description:
+      - Device paths of the physical volumes, e.g. the output of C(partition_paths_system).
+    type: list
+    elements: str
+    required: true
+  mode:
+    description:
+      - C(devices_file) manages the LVM devices file (requires C(devices/use_devicesfile=1), lvm2 2.03.12 or later).
+      - C(filter) manages C(devices/global_filter) in O(config_file).
+    type: str
+    choices: [devices_file, filter]
+    required: false
+    default: devices_file
+  keep_existing_pvs:
+    description:
+      - Also allow every device which LVM currently reports as a physical volume, so no existing volume group
+        (e.g. the one of the root filesystem) is hidden.
+    type: bool
+    required: false
+    default: true
+  exclusive:
+    description:
+      - With O(mode=devices_file), remove devices file entries of all other devices.
+    type: bool
+    required: false
+    default: false
+  config_file:
+    description:
+      - LVM configuration file the C(global_filter) block is written to with O(mode=filter). Settings of
+        C(lvmlocal.conf) override the ones of C(lvm.conf).
+    type: path
+    required: false
+    default: /etc/lvm/lvmlocal.conf
+requirements:
+  - lvm2
+notes:
+  - Supports check mode.
+  - With O(mode=filter) the managed block must be the only C(devices) section of O(config_file).
+seealso:
+  - name: lvm_scan_devices
+    description: Lists the devices LVM scans
+    plugin: aursu.lvm_setup.lvm_scan_devices
+'''
+
+EXAMPLES = r'''
+- name: Restrict LVM to the physical volumes
+  aursu.lvm_setup.lvm_devices:
+    paths: "{{ partitions | aursu.lvm_setup.partition_paths_system }}"
+  register: lvm_devices
+
+- name: Show devices LVM still scans
+  ansible.builtin.debug:
+    msg: "{{ lvm_devices | aursu.lvm_setup.lvm_scan_devices }}"
+
+- name: Restrict LVM with a global_filter
+  aursu.lvm_setup.lvm_devices:
+    paths: "{{ partitions | aursu.lvm_setup.partition_paths_system }}"
+    mode: filter
+'''
+
+RETURN = r'''
+paths:
+  description: Allowed devices (O(paths) and, with O(keep_existing_pvs), the existing PVs).
+  type: list
+  elements: str
+  returned: always
+  sample: [/dev/sda3, /dev/sdb1, /dev/sdc1]
+commands:
+  description: lvmdevices commands (argument lists without the lvm binary) with O(mode=devices_file).
+  type: list
+  elements: list
+  returned: always
+  sample:
+    - [lvmdevices, --yes, --adddev, /dev/sdc1]
+use_devicesfile:
+  description: Whether LVM uses the devices file (C(devices/use_devicesfile)).
+  type: bool
+  returned: always
+devices:
+  description: Device names of the devices file entries, or C(null) if there is no devices file.
+  type: list
+  elements: str
+  returned: always
+  sample: [/dev/sda3, /dev/sdb1, /dev/sdc1]
+global_filter:
+  description: Effective C(devices/global_filter).
+  type: list
+  elements: str
+  returned: always
+  sample: ['a|^/dev/sda3$|', 'a|^/dev/sdb1$|', 'r|.*|']
+config_file:
+  description: File the C(global_filter) block is kept in.
+  type: str
+  returned: with O(mode=filter)
+  sample: /etc/lvm/lvmlocal.conf
+block_devices:
+  description: All block devices of the host.
+  type: list
+  elements: str
+  returned: always
+'''
+
+CONFIG_SETTINGS = ["devices/use_devicesfile", "devices/devicesfile", "devices/global_filter"]
+
+def lvm_config(module, lvm) -> dict:
+    out = run_lvm(module, lvm, ["lvmconfig", "--typeconfig", "full"] + CONFIG_SETTINGS)
+    return parse_lvmconfig(out)
+
+def write_file(module, path, content):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix="." + os.path.basename(path) + ".")
+    with os.fdopen(fd, "w") as f:
+        f.write(content)
+    module.atomic_move(tmp, path)
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            paths=dict(type="list", elements="str", required=True),
+            mode=dict(type="str", default="devices_file", choices=["devices_file", "filter"]),
+            keep_existing_pvs=dict(type="bool", default=True),
+            exclusive=dict(type="bool", default=False),
+            config_file=dict(type="path", default=LVMLOCAL_CONF),
+        ),
+        supports_check_mode=True,
+    )
+
+    lvm = module.get_bin_path("lvm", required=True)
+    paths = [p for p in module.params["paths"] if p]
+    result = dict(changed=False, commands=[])
+
+    try:
+        config = lvm_config(module, lvm)
+        if module.params["keep_existing_pvs"]:
+            paths += [pv["pv_name"] for pv in lvm_fullreport(module, lvm)["pv"] if pv.get("pv_name")]
+        paths = list(dict.fromkeys(paths))
+        result["paths"] = paths
+
+        name = config.get("devicesfile") or DEVICES_FILE
+        entries = read_devices_file(name)
+        result["use_devicesfile"] = bool(config.get("use_devicesfile"))
+        result["global_filter"] = config.get("global_filter", [])
+
+        if module.params["mode"] == "devices_file":
+            if not result["use_devicesfile"]:
+                module.warn("devices/use_devicesfile is disabled, LVM does not read the devices file")
+            commands = devices_file_commands(
+                entries, paths, module.params["exclusive"], devicesfile=None if name == DEVICES_FILE else name,
+            )
+            result.update(changed=bool(commands), commands=commands)
+            if commands and module.check_mode:
+                kept = [e.get("DEVNAME") for e in entries or [] if not module.params["exclusive"] or e.get("DEVNAME") in paths]
+                entries = [{"DEVNAME": p} for p in dict.fromkeys(kept + paths)]
+            elif commands:
+                for args in commands:
+                    run_lvm(module, lvm, args)
+                entries = read_devices_file(name)
+        else:
+            patterns = global_filter(paths)
+            try:
+                with open(module.params["config_file"]) as f:
+                    current = f.read()
+            except FileNotFoundError:
+                current = ""
+            content, changed = update_config_block(current, patterns)
+            if changed and not module.check_mode:
+                write_file(module, module.params["config_file"], content)
+            result.update(changed=changed, global_filter=patterns, config_file=module.params["config_file"])
+    except LvmError as e:
+        module.fail_json(msg=e.msg, rc=e.rc, **result)
+    except ReportError as e:
+        module.fail_json(msg=e.msg, **e.details)
+    except (OSError, ValueError) as e:
+        module.fail_json(msg=str(e), **result)
+
+    result["devices"] = None if entries is None else [e.get("DEVNAME") for e in entries]
+    result["block_devices"] = block_devices()
+    module.exit_json(**result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible module to gather PV, VG and LV information with a single lvm fullreport call
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_report import ReportError, lvm_fullreport
+
+DOCUMENTATION = r'''
+---
+module: lvm_report
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Gather LVM state with one lvm fullreport call
+description:
+  - This module runs C(lvm fullreport --reportformat json) once and returns physical volumes, volume groups,
+    logical volumes and LV segments, so a single device scan serves every planning step of a play.
+  - The result has the same C(pv), C(vg) and C(lv) structure as C(aursu.general.lvm_info), so it can be passed
+    to C(validate_pvs), C(validate_vg), C(validate_volume) and the other LVM planning filters as C(lvm_info).
+options:
+  vgs:
+    description:
+      - Volume group names to report VGs, LVs and segments of. All volume groups are reported if omitted.
+      - Physical volumes of all volume groups are reported, so that C(validate_pvs) can tell devices of
+        another volume group apart from unused ones.
+    type: list
+    elements: str
+    required: false
+  include_orphans:
+    description:
+      - Also report physical volumes which do not belong to any volume group.
+      - If disabled, lvm only reports O(vgs), so PVs of other volume groups are not reported either.
+    type: bool
+    required: false
+    default: true
+requirements:
+  - lvm2
+notes:
+  - Supports check mode.
+seealso:
+  - name: validate_volume
+    description: Validates and plans a logical volume against LVM state
+    plugin: aursu.lvm_setup.validate_volume
+'''
+
+EXAMPLES = r'''
+- name: Get current LVM info
+  aursu.lvm_setup.lvm_report:
+    vgs:
+      - "{{ vg_name }}"
+  register: lvm_info
+
+- name: Validate physical volumes
+  set_fact:
+    validated_pvs: "{{ lvm_info | aursu.lvm_setup.validate_pvs(pv_paths, vg_name) }}"
+'''
+
+RETURN = r'''
+pv:
+  description: Physical volumes.
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - pv_name: /dev/sda6
+      vg_name: data
+      pv_fmt: lvm2
+      pv_attr: a--
+      pv_size: "855520.00m"
+      pv_free: "650720.00m"
+vg:
+  description: Volume groups.
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - vg_name: data
+      vg_attr: wz--n-
+      vg_size: "1710944.00m"
+      vg_free: "1301344.00m"
+      vg_extent_size: "4.00m"
+      pv_count: "2"
+      lv_count: "2"
+lv:
+  description: Logical volumes.
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - lv_name: data1
+      vg_name: data
+      lv_attr: -wi-a-----
+      lv_size: "204800.00m"
+seg:
+  description: Logical volume segments.
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - lv_name: data1
+      vg_name: data
+      segtype: linear
+      stripes: "1"
+      stripe_size: "0m"
+      seg_size: "204800.00m"
+      devices: /dev/sda6(0)
+'''
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            vgs=dict(type="list", elements="str"),
+            include_orphans=dict(type="bool", default=True),
+        ),
+        supports_check_mode=True,
+    )
+
+    lvm = module.get_bin_path("lvm", required=True)
+    try:
+        result = lvm_fullreport(module, lvm, module.params["vgs"], module.params["include_orphans"])
+    except ReportError as e:
+        module.fail_json(msg=e.msg, **e.details)
+
+    module.exit_json(changed=False, **result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible module to create all planned partitions of a disk (or of all disks) with a single partition table write per disk
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.partition_apply import (
+    ApplyError,
+    apply_plan,
+    apply_plans,
+    udev_settle,
+)
+
+DOCUMENTATION = r'''
+---
+module: partition_apply
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Create all planned partitions of a disk in one table write
+description:
+  - This module takes the partition plan of one disk, as returned by C(validate_partitions) or by
+    C(validate_partitions_system) for that disk, and creates every partition with action C(create)
+    using one C(sfdisk) script, i.e. one partition table write.
+  - New partitions get the Linux LVM partition type (the equivalent of the parted C(lvm) flag).
+  - After the write the kernel is told about the new partitions once (C(partx --update), falling back
+    to C(blockdev --rereadpt)) and udev is settled once, instead of once per partition.
+  - A new partition table is created if the disk has none.
+  - With O(plans) the plans of all disks of the host are applied in one invocation. Disks are partitioned
+    concurrently (each disk is written by its own C(sfdisk) run), udev is settled once after all disks are done,
+    and the errors of all failed disks are reported together.
+options:
+  device:
+    description:
+      - Disk device path (e.g. C(/dev/sda)).
+      - Mutually exclusive with O(plans).
+    type: str
+    required: false
+  plan:
+    description:
+      - List of partition plans for the disk. Entries with an action other than C(create) are ignored.
+      - Required with O(device).
+    type: list
+    elements: dict
+    required: false
+  plans:
+    description:
+      - Dictionary mapping disk device paths to their lists of partition plans, as returned by
+        C(validate_partitions_system).
+      - Mutually exclusive with O(device).
+    type: dict
+    required: false
+  max_workers:
+    description:
+      - Maximum number of disks partitioned at the same time when O(plans) is used.
+    type: int
+    required: false
+    default: 8
+  label:
+    description:
+      - Partition table label used if the disk has no partition table yet.
+        Defaults to the C(disk_label) of the plan, or C(gpt).
+    type: str
+    choices: [gpt, msdos]
+    required: false
+  settle:
+    description:
+      - Wait for udev to process the new partitions.
+    type: bool
+    required: false
+    default: true
+  settle_timeout:
+    description:
+      - Maximum number of seconds to wait for udev.
+    type: int
+    required: false
+    default: 120
+requirements:
+  - sfdisk (util-linux)
+notes:
+  - Supports check mode; the generated script is returned without being applied.
+seealso:
+  - name: validate_partitions_system
+    description: Generates partition plans for all disks
+    plugin: aursu.lvm_setup.validate_partitions_system
+'''
+
+EXAMPLES = r'''
+- name: Create missing partitions
+  aursu.lvm_setup.partition_apply:
+    device: "{{ item.key }}"
+    plan: "{{ item.value }}"
+  loop: "{{ validated_partitions | dict2items }}"
+  loop_control:
+    label: "{{ item.key }}"
+
+- name: Create missing partitions on all disks at once
+  aursu.lvm_setup.partition_apply:
+    plans: "{{ validated_partitions }}"
+    max_workers: 4
+'''
+
+RETURN = r'''
+created:
+  description: Numbers of the partitions created on the disk.
+  type: list
+  elements: int
+  returned: when O(device) is used
+  sample: [6, 7]
+script:
+  description: sfdisk script applied to the disk (empty if nothing had to be created).
+  type: str
+  returned: when O(device) is used
+  sample: "/dev/sda6 : start=2048, size=838860800, type=E6D6D379-F507-44C2-A23C-238F2A3DF928\n"
+label:
+  description: Partition table label of the disk.
+  type: str
+  returned: when O(device) is used
+  sample: gpt
+elapsed:
+  description: Seconds spent on the disk.
+  type: float
+  returned: when O(device) is used
+  sample: 0.412
+disks:
+  description: Result per disk (C(changed), C(created), C(script), C(label), C(elapsed)). Failed disks are missing.
+  type: dict
+  returned: when O(plans) is used
+  sample:
+    /dev/sdb:
+      changed: true
+      created: [1]
+      script: "label: gpt\n\n/dev/sdb1 : start=2048, size=838860800, type=E6D6D379-F507-44C2-A23C-238F2A3DF928\n"
+      label: gpt
+      elapsed: 0.387
+errors:
+  description: Error message per failed disk.
+  type: dict
+  returned: when O(plans) is used
+  sample:
+    /dev/sdc: "sfdisk failed on /dev/sdc: Device or resource busy"
+'''
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            device=dict(type="str"),
+            plan=dict(type="list", elements="dict"),
+            plans=dict(type="dict"),
+            label=dict(type="str", choices=["gpt", "msdos"]),
+            max_workers=dict(type="int", default=8),
+            settle=dict(type="bool", default=True),
+            settle_timeout=dict(type="int", default=120),
+        ),
+        mutually_exclusive=[("device", "plans"), ("plan", "plans")],
+        required_one_of=[("device", "plans")],
+        required_together=[("device", "plan")],
+        supports_check_mode=True,
+    )
+
+    sfdisk = module.get_bin_path("sfdisk", required=True)
+    label = module.params["label"]
+
+    if module.params["device"]:
+        device = module.params["device"]
+        try:
+            result = apply_plan(module, sfdisk, device, module.params["plan"], label)
+        except ApplyError as e:
+            module.fail_json(msg=e.msg, **e.details)
+        if result["changed"] and module.params["settle"] and not module.check_mode:
+            udev_settle(module, module.params["settle_timeout"])
+        module.exit_json(**result)
+
+    plans = module.params["plans"]
+    for device, plan in plans.items():
+        if not isinstance(plan, list):
+            module.fail_json(msg=f"Expected the plan for {device} to be a list, got {type(plan).__name__}.")
+
+    disks, errors = apply_plans(module, sfdisk, plans, label, module.params["max_workers"])
+    changed = any(r["changed"] for r in disks.values())
+
+    # one udev settle for all disks, also after partial failures
+    if changed and module.params["settle"] and not module.check_mode:
+        udev_settle(module, module.params["settle_timeout"])
+
+    if errors:
+        module.fail_json(
+            msg=f"Partitioning failed on {len(errors)} of {len(plans)} disks: {', '.join(sorted(errors))}",
+            changed=changed, disks=disks, errors=errors,
+        )
+    module.exit_json(changed=changed, disks=disks, errors={})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible module to read GPT/MBR partition tables of many disks without running parted
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.partition_table import disk_info
+
+DOCUMENTATION = r'''
+---
+module: partition_table_info
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Read partition tables of disks in the parted info format
+description:
+  - This module reads the GPT (or MBR) partition table of every given disk directly from the device
+    and the disk geometry from sysfs, for any number of disks in one invocation.
+  - The result for each disk has the same structure as C(community.general.parted) with C(state=info)
+    (C(disk) and C(partitions)), so it can be passed to C(validate_partitions), C(validate_partitions_exist),
+    C(disk_free_extents) and, as a whole, to C(validate_partitions_system).
+  - Besides C(logical_block) and C(physical_block) the C(disk) entry carries the C(alignment_offset),
+    C(minimum_io_size) and C(optimal_io_size) queue limits used for partition alignment.
+  - Filesystem types of partitions are not probed (C(fstype) is always empty).
+options:
+  devices:
+    description:
+      - List of disk device paths (e.g. C(/dev/sda)).
+    type: list
+    elements: str
+    required: true
+  unit:
+    description:
+      - Unit of positions and sizes in the result. With C(s) (sectors), C(end) is the last sector of a partition.
+    type: str
+    choices: [s, B, KiB, MiB, GiB, TiB]
+    required: false
+    default: s
+notes:
+  - Supports check mode.
+seealso:
+  - name: validate_partitions_system
+    description: Generates partition plans for all disks
+    plugin: aursu.lvm_setup.validate_partitions_system
+'''
+
+EXAMPLES = r'''
+- name: Get current partition tables
+  aursu.lvm_setup.partition_table_info:
+    devices: "{{ partitions.keys() | list }}"
+  register: partition_tables
+
+- name: Plan partitions on all disks
+  set_fact:
+    partitions_plan: "{{ partition_tables.disks | aursu.lvm_setup.validate_partitions_system(partitions) }}"
+'''
+
+RETURN = r'''
+disks:
+  description: Dictionary mapping disk paths to their partition table in the parted info format.
+  type: dict
+  returned: always
+  sample:
+    /dev/sda:
+      disk:
+        dev: /dev/sda
+        size: 1953525168
+        unit: s
+        table: gpt
+        model: ATA SAMSUNG SSD
+        logical_block: 512
+        physical_block: 4096
+        alignment_offset: 0
+        minimum_io_size: 4096
+        optimal_io_size: 0
+      partitions:
+        - num: 1
+          begin: 2048
+          end: 2099199
+          size: 2097152
+          unit: s
+          fstype: ""
+          name: EFI
+          flags: [boot, esp]
+'''
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            devices=dict(type="list", elements="str", required=True),
+            unit=dict(type="str", default="s", choices=["s", "B", "KiB", "MiB", "GiB", "TiB"]),
+        ),
+        supports_check_mode=True,
+    )
+
+    disks = {}
+    for device in module.params["devices"]:
+        try:
+            disks[device] = disk_info(device, module.params["unit"])
+        except OSError as e:
+            module.fail_json(msg=f"Unable to read partition table of {device}: {e}", disks=disks)
+
+    module.exit_json(changed=False, disks=disks)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Ansible module to converge partitions, LVM, filesystems and mounts of a host in one invocation
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.storage_engine import EngineError, StorageEngine
+
+DOCUMENTATION = r'''
+---
+module: storage_apply
+author: Alexander Ursu
+version_added: "1.3.0"
+short_description: Converge partitions, physical volumes, volume group, logical volumes, filesystems and mounts
+description:
+  - This module does the work of the C(process_disks), C(process_lvm) and C(process_volumes) roles in one
+    process on the managed node. It takes the same O(partitions), O(vg_name) and O(volumes) variables, plans
+    every phase against the live state of the host with the planners of the filter plugins, and applies it.
+  - "Phases run in order: C(partitions) (one C(sfdisk) write per disk, disks in parallel, one udev settle),
+    C(pvs) (C(pvcreate), then C(vgcreate) or C(vgextend)), C(volumes) (C(lvcreate)), C(filesystems)
+    (mkfs runs in parallel) and C(mounts) (fstab entry, mount point directory, C(mount))."
+  - Every phase reports the time it took, so one task gives a per-phase timing breakdown of the whole
+    convergence.
+  - All input is validated before anything is changed. Planning errors stop the run at the failing phase;
+    the results of the finished phases are returned with the failure.
+options:
+  partitions:
+    description:
+      - Dictionary mapping disk device paths to lists of partitions, as used by the C(process_disks) role.
+        All partitions become physical volumes of O(vg_name).
+    type: dict
+    required: false
+  vg_name:
+    description:
+      - Volume group of the partitions. Defaults to the C(vg) of O(volumes).
+    type: str
+    required: false
+  volumes:
+    description:
+      - List of logical volumes (C(name), C(vg), C(size), C(filesystem), C(mountpoint), C(stripes),
+        C(stripe_size)), as used by the C(process_volumes) role.
+    type: list
+    elements: dict
+    required: false
+  label:
+    description:
+      - Partition table label used for disks without a partition table.
+    type: str
+    choices: [gpt, msdos]
+    required: false
+    default: gpt
+  partition_workers:
+    description:
+      - Maximum number of disks partitioned at the same time.
+    type: int
+    required: false
+    default: 8
+  mkfs_workers:
+    description:
+      - Maximum number of filesystems created at the same time.
+    type: int
+    required: false
+    default: 4
+  settle_timeout:
+    description:
+      - Maximum number of seconds to wait for udev after partitioning.
+    type: int
+    required: false
+    default: 120
+  fstab:
+    description:
+      - File the mount entries are written to.
+    type: path
+    required: false
+    default: /etc/fstab
+  strategy:
+    description:
+      - C(phases) plans and applies the phases one after the other, reading the state again for every phase.
+      - C(graph) plans all phases up front and applies the changes as one dependency graph of operations
+        (e.g. partitioning of one disk, C(lvcreate) of one volume, mkfs of one volume, a mount), so independent
+        operations of different phases overlap. Up to O(max_workers) operations run at the same time,
+        the longest chains of work (by volume size for mkfs) start first, and LVM commands run one at a time
+        as they take the LVM global lock. A failed operation only stops the operations depending on it.
+    type: str
+    choices: [phases, graph]
+    required: false
+    default: phases
+  max_workers:
+    description:
+      - Maximum number of operations run at the same time with O(strategy=graph).
+    type: int
+    required: false
+    default: 4
+  lvm_shell:
+    description:
+      - Run consecutive C(lvcreate) commands of absolute sizes in one C(lvm) shell process, so the LVM
+        configuration is loaded and the devices are scanned once for all of them instead of once per command.
+        The outcome of every command is read from its JSON command log.
+      - A phase stops at the first failed command; C(pvcreate), C(vgcreate)/C(vgextend) and C(lvcreate) of
+        relative sizes, which later commands depend on, always run on their own.
+      - Falls back to one process per command if lvm has no shell support. Not used with O(strategy=graph),
+        where every LVM command is an operation of its own.
+    type: bool
+    required: false
+    default: true
+  plan_only:
+    description:
+      - Only plan every phase and return the plans, without changing anything. Same as check mode.
+    type: bool
+    required: false
+    default: false
+requirements:
+  - sfdisk, blkid (util-linux)
+  - lvm2
+  - mkfs.xfs, mkfs.ext4 or mkfs.btrfs for the requested filesystems
+notes:
+  - Supports check mode. Objects an earlier phase would create are planned as missing by the later phases,
+    e.g. all volumes of a volume group which does not exist yet are planned for creation.
+seealso:
+  - name: partition_apply
+    description: Creates all planned partitions of a disk
+    module: aursu.lvm_setup.partition_apply
+  - name: filesystem_apply
+    description: Creates the filesystems of all planned logical volumes
+    module: aursu.lvm_setup.filesystem_apply
+'''
+
+EXAMPLES = r'''
+- name: Converge storage
+  aursu.lvm_setup.storage_apply:
+    partitions: "{{ partitions }}"
+    vg_name: "{{ vg_name }}"
+    volumes: "{{ volumes }}"
+  register: storage
+
+- name: Show time spent per phase
+  ansible.builtin.debug:
+    msg: "{{ item.key }}: {{ item.value.elapsed }}s"
+  loop: "{{ storage.phases | dict2items }}"
+  loop_control:
+    label: "{{ item.key }}"
+
+- name: Converge storage as a dependency graph of operations
+  aursu.lvm_setup.storage_apply:
+    partitions: "{{ partitions }}"
+    vg_name: "{{ vg_name }}"
+    volumes: "{{ volumes }}"
+    strategy: graph
+    max_workers: 8
+
+- name: Plan only
+  aursu.lvm_setup.storage_apply:
+    partitions: "{{ partitions }}"
+    vg_name: "{{ vg_name }}"
+    volumes: "{{ volumes }}"
+    plan_only: true
+  register: storage_plan
+'''
+
+RETURN = r'''
+phases:
+  description:
+    - Result per phase (C(partitions), C(pvs), C(volumes), C(filesystems), C(mounts)), in execution order.
+    - With O(strategy=graph) the phases only plan, and the C(apply) phase returns the C(graph) of operations
+      (C(name), C(deps), C(cost), C(lock)) and, unless in check mode, the C(operations) results (C(status)
+      C(ok), C(failed) or C(skipped), C(elapsed), C(result), C(error), C(blocked_by)).
+    - Every phase has C(changed) and C(elapsed) (seconds). C(partitions), C(pvs) and C(volumes) return their
+      C(plan); C(pvs) also the lvm C(commands), C(volumes) the C(created) LV paths, both the result of every
+      lvm command in C(lvm) (C(command), C(ok), C(messages)), C(filesystems) the
+      result per volume (see C(filesystem_apply)) and C(mounts) the C(fstab) entries changed and the
+      mount points C(mounted).
+  type: dict
+  returned: always
+  sample:
+    partitions:
+      changed: true
+      elapsed: 0.412
+      plan:
+        /dev/sdb:
+          - num: 1
+            action: create
+            disk_label: gpt
+      disks:
+        /dev/sdb:
+          changed: true
+          created: [1]
+    pvs:
+      changed: true
+      elapsed: 0.951
+      plan:
+        - path: /dev/sdb1
+          action: create
+      commands:
+        - [pvcreate, /dev/sdb1]
+        - [vgcreate, data, /dev/sdb1]
+      lvm:
+        - command: [pvcreate, /dev/sdb1]
+          ok: true
+          messages: []
+        - command: [vgcreate, data, /dev/sdb1]
+          ok: true
+          messages: []
+    volumes:
+      changed: true
+      elapsed: 0.733
+      plan:
+        - name: data1
+          path: /dev/data/data1
+          action: create
+      created: [/dev/data/data1]
+    filesystems:
+      changed: true
+      elapsed: 1.204
+      filesystems:
+        /dev/data/data1:
+          name: data1
+          fstype: xfs
+          changed: true
+          rc: 0
+          elapsed: 1.187
+    mounts:
+      changed: true
+      elapsed: 0.062
+      fstab: [/mnt/data1]
+      mounted: [/mnt/data1]
+    apply:
+      changed: true
+      elapsed: 2.315
+      graph:
+        - name: lvcreate:/dev/data/data1
+          deps: []
+          cost: 1
+          lock: lvm
+        - name: mkfs:/dev/data/data1
+          deps: [lvcreate:/dev/data/data1]
+          cost: 10240.0
+          lock: null
+      operations:
+        lvcreate:/dev/data/data1:
+          status: ok
+          elapsed: 0.702
+          result:
+            changed: true
+            command: [lvcreate, --yes, -n, data1, -L, 10g, data]
+        mkfs:/dev/data/data1:
+          status: ok
+          elapsed: 1.187
+          result:
+            changed: true
+            rc: 0
+            fstype: xfs
+phase:
+  description: Phase which failed (C(input) for invalid options).
+  type: str
+  returned: failure
+  sample: pvs
+'''
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            partitions=dict(type="dict"),
+            vg_name=dict(type="str"),
+            volumes=dict(type="list", elements="dict"),
+            label=dict(type="str", default="gpt", choices=["gpt", "msdos"]),
+            partition_workers=dict(type="int", default=8),
+            mkfs_workers=dict(type="int", default=4),
+            settle_timeout=dict(type="int", default=120),
+            fstab=dict(type="path", default="/etc/fstab"),
+            lvm_shell=dict(type="bool", default=True),
+            strategy=dict(type="str", default="phases", choices=["phases", "graph"]),
+            max_workers=dict(type="int", default=4),
+            plan_only=dict(type="bool", default=False),
+        ),
+        required_one_of=[("partitions", "volumes")],
+        supports_check_mode=True,
+    )
+
+    # the apply helpers skip every change in check mode
+    if module.params["plan_only"]:
+        module.check_mode = True
+
+    engine = None
+    try:
+        engine = StorageEngine(
+            module,
+            partitions=module.params["partitions"],
+            vg_name=module.params["vg_name"],
+            volumes=module.params["volumes"],
+            label=module.params["label"],
+            partition_workers=module.params["partition_workers"],
+            mkfs_workers=module.params["mkfs_workers"],
+            settle_timeout=module.params["settle_timeout"],
+            fstab=module.params["fstab"],
+            lvm_shell=module.params["lvm_shell"],
+        )
+        if module.params["strategy"] == "graph":
+            result = engine.run_graph(module.params["max_workers"])
+        else:
+            result = engine.run()
+    except EngineError as e:
+        module.fail_json(
+            msg=e.msg, phase=e.phase,
+            changed=engine.changed if engine else False,
+            phases=engine.phases if engine else {},
+            **e.details,
+        )
+
+    module.exit_json(**result)
+
+if __name__ == "__main__":
+    main()
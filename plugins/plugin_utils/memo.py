@@ -0,0 +1,91 @@
+import copy
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+DEFAULT_MEMO_SIZE = 256
+
+def canonical_hash(value: Any, default: Optional[Callable] = None) -> str:
+    """
+    Return a SHA-256 hash of the compact JSON form of `value`.
+
+    Dictionary keys keep their insertion order: filters return results in input order, so inputs
+    that differ only in key order must not share a cache entry.
+
+    Raises:
+        TypeError: If `value` contains objects JSON can not represent and no `default` is given.
+    """
+    payload = json.dumps(value, separators=(",", ":"), default=default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class Memo:
+    """
+    Bounded in-process result cache of one function with least recently used eviction.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE):
+        self.maxsize = max(1, int(maxsize))
+        self._data: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+def memoize(maxsize: int = DEFAULT_MEMO_SIZE) -> Callable:
+    """
+    Decorator caching filter results per worker process, keyed by a canonical hash of the arguments.
+
+    Arguments are compared by content, so equal inputs rendered again (in loops, 'when' clauses or
+    for hosts with identical hardware) return the cached result instead of rebuilding the object graph.
+    Mutable results are copied on return, exceptions are not cached, and calls with arguments that
+    can not be represented as JSON bypass the cache.
+
+    The decorated function exposes cache_info() and cache_clear().
+    """
+    def decorator(func: Callable) -> Callable:
+        memo = Memo(maxsize)
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = canonical_hash([name, args, kwargs])
+            except (TypeError, ValueError):
+                return func(*args, **kwargs)
+
+            found, result = memo.get(key)
+            if not found:
+                result = func(*args, **kwargs)
+                memo.put(key, result)
+            return copy.deepcopy(result) if isinstance(result, (dict, list)) else result
+
+        wrapper.cache_info = memo.info
+        wrapper.cache_clear = memo.clear
+        return wrapper
+    return decorator
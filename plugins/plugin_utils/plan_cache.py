@@ -0,0 +1,168 @@
+import functools
+import json
+import os
+import tempfile
+from typing import Any, Callable, Optional
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import canonical_hash
+
+# bump when planner output for the same input may change, so stale plans are never reused
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_SIZE = 4096
+
+# fields of registered task results and of stat() output that change between runs
+# without the storage layout changing
+VOLATILE_KEYS = frozenset({
+    "changed", "failed", "invocation", "warnings", "deprecations", "msg",
+    "atime", "ctime", "mtime",
+})
+
+def normalize(value: Any) -> Any:
+    """
+    Return `value` with volatile fields (see VOLATILE_KEYS) and Ansible internal keys removed.
+    """
+    if isinstance(value, dict):
+        return {
+            str(k): normalize(v) for k, v in value.items()
+            if k not in VOLATILE_KEYS and not str(k).startswith("_ansible")
+        }
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return value
+
+def fingerprint(kind: str, *args, **kwargs) -> str:
+    """
+    Return a stable hash of the planner name and its normalized arguments.
+    """
+    return canonical_hash([CACHE_VERSION, kind, normalize(list(args)), normalize(kwargs)], default=str)
+
+def all_skip(plan: Any) -> bool:
+    """
+    Return True if every action in `plan` is 'skip'.
+
+    Accepts a single plan dictionary, a list of plans, or a dictionary mapping disks to lists of plans.
+    An empty plan has nothing to do and counts as unchanged.
+    """
+    if isinstance(plan, dict):
+        if "action" in plan:
+            return plan["action"] == "skip"
+        return all(all_skip(v) for v in plan.values())
+    if isinstance(plan, (list, tuple)):
+        return all(all_skip(v) for v in plan)
+    return False
+
+class PlanCache:
+    """
+    Directory of cached plans (one JSON file per fingerprint) with LRU eviction.
+
+    The modification time of an entry is its last use; when more than `max_entries` entries
+    exist, the least recently used ones are removed.
+    """
+
+    SUFFIX = ".json"
+
+    def __init__(self, directory: str, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.directory = os.path.expanduser(directory)
+        self.max_entries = max(1, int(max_entries))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # corrupt or unreadable entry: treat as a miss
+            self._remove(path)
+            return None
+
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("plan")
+
+    def put(self, key: str, plan: Any) -> None:
+        try:
+            data = json.dumps({"key": key, "plan": plan})
+        except (TypeError, ValueError):
+            return
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # write to a temporary file first so concurrent readers never see partial entries
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            return
+        self.evict()
+
+    def entries(self) -> list[tuple[float, str]]:
+        result = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.SUFFIX):
+                        continue
+                    try:
+                        result.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return result
+
+    def evict(self) -> None:
+        entries = self.entries()
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+        for _, path in sorted(entries)[:excess]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def cached_plan(kind: str) -> Callable:
+    """
+    Decorator adding an optional on-disk plan cache to a planner filter.
+
+    The decorated filter accepts two extra keyword arguments:
+        cache_dir (str): Cache directory; no caching if not set.
+        cache_size (int): Maximum number of cached plans.
+
+    Plans are keyed by the fingerprint of all (normalized) filter arguments, so a cached plan is
+    only reused when the desired spec and the storage state are the same. Failed planning is never cached.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, cache_dir: Optional[str] = None, cache_size: int = DEFAULT_CACHE_SIZE, **kwargs):
+            if not cache_dir:
+                return func(*args, **kwargs)
+
+            cache = PlanCache(cache_dir, cache_size)
+            key = fingerprint(kind, *args, **kwargs)
+
+            plan = cache.get(key)
+            if plan is not None:
+                return plan
+
+            plan = func(*args, **kwargs)
+            cache.put(key, plan)
+            return plan
+        return wrapper
+    return decorator
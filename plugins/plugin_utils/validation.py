@@ -0,0 +1,2 @@
+# the models are shared with the modules planning on the managed node, see module_utils/validation.py
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.validation import *  # noqa: F401,F403
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Planner benchmarks.
+
+Measures wall time and peak memory of the planning entry points on synthetic storage state,
+saves the results as JSON and compares them against a saved baseline.
+
+    python tests/benchmarks/bench.py run -o tests/benchmarks/baselines/local.json
+    python tests/benchmarks/bench.py compare tests/benchmarks/baselines/local.json current.json --threshold 0.25
+    python tests/benchmarks/bench.py run --compare tests/benchmarks/baselines/local.json
+
+The collection must be importable as ansible_collections.aursu.lvm_setup (see README).
+"""
+
+import argparse
+import datetime
+import gc
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generators as gen  # noqa: E402
+import simulate  # noqa: E402
+from ansible_collections.aursu.lvm_setup.plugins.filter.validate_partitions import validate_partitions  # noqa: E402
+from ansible_collections.aursu.lvm_setup.plugins.filter.validate_volume import validate_volume  # noqa: E402
+from ansible_collections.aursu.lvm_setup.plugins.filter.validate_volumes import validate_volumes  # noqa: E402
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import PartitionInput  # noqa: E402
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import VolumeGroup  # noqa: E402
+
+DEFAULT_THRESHOLD = 0.25
+
+# the filters are memoized; benchmarks always measure the planners themselves
+plan_partitions = inspect.unwrap(validate_partitions)
+plan_volume = inspect.unwrap(validate_volume)
+plan_volumes = inspect.unwrap(validate_volumes)
+
+def disk_plan_case(partitions, new=10):
+    state = gen.parted_info("/dev/sda", partitions, free_mib=(new + 1) * 16)
+    specs = gen.partition_specs(partitions + new)
+    return lambda: plan_partitions(state, specs)
+
+def partition_paths_case(disks, partitions):
+    spec = {disk: gen.partition_specs(partitions) for disk in gen.disk_names(disks)}
+    return lambda: PartitionInput(spec).paths()
+
+def vg_from_metadata_case(pvs, lvs):
+    info = gen.lvm_info(pvs=pvs, lvs=lvs)
+    return lambda: VolumeGroup.from_lvm_info("data", info)
+
+def plan_pvs_case(pvs, lvs):
+    info = gen.lvm_info(pvs=pvs, lvs=lvs)
+    paths = gen.pv_paths(pvs)
+    return lambda: VolumeGroup.from_lvm_info("data", info).plan_pvs(paths)
+
+def validate_volume_case(lvs):
+    info = gen.lvm_info(pvs=max(lvs // 10, 1), lvs=lvs)
+    volume = gen.volume_specs(1, start=lvs // 2)[0]
+    devices = gen.dev_infos([volume])
+    return lambda: plan_volume(volume, info, devices)
+
+def validate_volumes_case(volumes, lvs):
+    info = gen.lvm_info(pvs=max(lvs // 10, 1), lvs=lvs)
+    specs = gen.volume_specs(volumes)
+    devices = gen.dev_infos(specs)
+    return lambda: plan_volumes(specs, info, devices)
+
+def converge_case(hosts, runs=2):
+    spec = simulate.host_spec()
+    return lambda: simulate.simulate(hosts, runs, spec, memo=False)
+
+def cases(quick=False):
+    """
+    Return benchmark name → factory of the timed callable (built outside the measurement).
+    """
+    partitions = (1, 100, 1000) if quick else (1, 100, 1000, 10000)
+    lvs = 1000 if quick else 10000
+    pvs = 100 if quick else 1000
+
+    result = {}
+    for n in partitions:
+        result[f"disk_plan[{n}]"] = lambda n=n: disk_plan_case(n)
+    result["partition_input_paths[100x100]"] = lambda: partition_paths_case(100, 100)
+    result[f"vg_from_metadata[{pvs}pv/{lvs}lv]"] = lambda: vg_from_metadata_case(pvs, lvs)
+    result[f"plan_pvs[{pvs}pv/{lvs}lv]"] = lambda: plan_pvs_case(pvs, lvs)
+    result[f"validate_volume[{lvs}lv]"] = lambda: validate_volume_case(lvs)
+    result[f"validate_volumes[{lvs // 10}/{lvs}lv]"] = lambda: validate_volumes_case(lvs // 10, lvs)
+    result["converge[10 hosts x 2 runs]"] = lambda: converge_case(10)
+    return result
+
+def measure(func, repeat):
+    """
+    Return timing (seconds) and peak traced memory (KiB) of `func`.
+
+    Memory is measured in a separate run, since tracing slows the code down.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "time": statistics.median(times),
+        "min": min(times),
+        "repeat": repeat,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+def run(args):
+    selected = {
+        name: factory for name, factory in cases(args.quick).items()
+        if not args.filter or any(f in name for f in args.filter)
+    }
+
+    results = {}
+    for name, factory in selected.items():
+        func = factory()
+        results[name] = measure(func, args.repeat)
+        r = results[name]
+        print(f"{name:40} {r['time'] * 1000:12.3f} ms {r['peak_kib']:12.1f} KiB", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.compare:
+        return compare_reports(load(args.compare), report, args.threshold)
+    return 0
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Print the change of every benchmark present in both reports; return 1 if any time or peak memory
+    grew by more than `threshold` (a fraction, 0.25 = +25%).
+    """
+    regressions = 0
+    base_results = baseline.get("results", {})
+    for name, cur in current.get("results", {}).items():
+        base = base_results.get(name)
+        if base is None:
+            print(f"{name:40} new")
+            continue
+
+        flags = []
+        changes = []
+        for key, label in (("time", "time"), ("peak_kib", "memory")):
+            if not base.get(key):
+                continue
+            change = cur[key] / base[key] - 1
+            changes.append(f"{label} {change:+7.1%}")
+            if change > threshold:
+                flags.append(label)
+
+        status = f"REGRESSION ({', '.join(flags)})" if flags else "ok"
+        print(f"{name:40} {'  '.join(changes)}  {status}")
+        regressions += bool(flags)
+
+    for name in sorted(base_results.keys() - current.get("results", {}).keys()):
+        print(f"{name:40} not run")
+
+    return 1 if regressions else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="run the benchmarks")
+    p_run.add_argument("-o", "--output", help="write results to this JSON file")
+    p_run.add_argument("-r", "--repeat", type=int, default=5, help="timed runs per benchmark (default: 5)")
+    p_run.add_argument("-k", "--filter", action="append", help="only run benchmarks containing this string")
+    p_run.add_argument("--quick", action="store_true", help="smaller fixtures (no 10k partitions/LVs)")
+    p_run.add_argument("--compare", metavar="BASELINE", help="compare the results against a baseline")
+    p_run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help=f"regression threshold as a fraction (default: {DEFAULT_THRESHOLD})")
+
+    p_cmp = sub.add_parser("compare", help="compare two result files")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help=f"regression threshold as a fraction (default: {DEFAULT_THRESHOLD})")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return compare_reports(load(args.baseline), load(args.current), args.threshold)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
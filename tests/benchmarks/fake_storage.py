@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+In-memory storage backend for planning/apply simulation.
+
+FakeStorage keeps disks, partitions, LVM objects, filesystems and mounts in memory, reports them
+in the formats of the collection's fact modules (partition_table_info, lvm_report, dev_probe) and
+applies the plans returned by the planners the way the apply modules and community.general tasks do.
+"""
+
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.mkfs import filesystem_jobs
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.partition_table import parted_info as render_parted_info
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.sfdisk_script import partition_node, to_sectors
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.size_utils import Size
+
+MiB = 1024 * 1024
+GiB = 1024 * MiB
+
+GPT_RESERVED_SECTORS = 34
+# space LVM keeps at the start of a PV for its metadata
+PV_METADATA = MiB
+
+class FakeStorageError(Exception):
+    pass
+
+class FakeStorage:
+    def __init__(self, disks=None, sector_size=512, extent_size=4 * MiB):
+        """
+        Args:
+            disks (dict): Disk path → size in bytes of the disks to create (empty, without partition table).
+            sector_size (int): Logical sector size of all disks.
+            extent_size (int): Extent size of new volume groups.
+        """
+        self.sector_size = sector_size
+        self.extent_size = extent_size
+
+        self.disks = {}        # disk path → {"sectors", "table", "partitions": {num: (first, last)}}
+        self.nodes = {}        # partition path → (disk path, num)
+        self.pvs = {}          # PV path → VG name ("" for orphan PVs)
+        self.vgs = {}          # VG name → extent size
+        self.lvs = {}          # (VG name, LV name) → size in bytes
+        self.filesystems = {}  # device path → filesystem type
+        self.mounts = {}       # LV path → mount target
+        self.lv_paths = {}     # /dev/<vg>/<lv> and /dev/mapper path → (VG name, LV name)
+        self.rdevs = {}        # device path → device number
+
+        for path, size in (disks or {}).items():
+            self.add_disk(path, size)
+
+    def add_disk(self, path, size, table=None):
+        self.disks[path] = {"sectors": size // self.sector_size, "table": table, "partitions": {}}
+
+    # --- reported state ---
+
+    def parted_info(self, disk):
+        data = self._disk(disk)
+        table = {
+            "table": data["table"] or "unknown",
+            "partitions": [
+                {"num": num, "first": first, "last": last, "name": "", "flags": ["lvm"]}
+                for num, (first, last) in data["partitions"].items()
+            ],
+        }
+        return render_parted_info(disk, table, self.sector_size, data["sectors"], disk_meta={"physical_block": 4096})
+
+    def partition_table_info(self, devices):
+        """
+        Return the result of aursu.lvm_setup.partition_table_info for `devices`.
+        """
+        return {"changed": False, "disks": {disk: self.parted_info(disk) for disk in devices}}
+
+    def lvm_report(self, vgs=None, include_orphans=True):
+        """
+        Return the result of aursu.lvm_setup.lvm_report (values in MiB, as with '--units m').
+        """
+        selected = [vg for vg in self.vgs if not vgs or vg in vgs]
+        pv_sizes = {path: self._pv_size(path) for path in self.pvs}
+        used = {name: 0 for name in self.vgs}
+        lv_counts = {name: 0 for name in self.vgs}
+        for (name, _), size in self.lvs.items():
+            used[name] += size
+            lv_counts[name] += 1
+
+        # LVs are allocated from the PVs of a VG in order
+        pv_free = {}
+        remaining = dict(used)
+        for path, name in self.pvs.items():
+            taken = min(remaining.get(name, 0), pv_sizes[path]) if name else 0
+            pv_free[path] = pv_sizes[path] - taken
+            if name:
+                remaining[name] -= taken
+
+        pv = [
+            {
+                "pv_name": path, "vg_name": vg, "pv_fmt": "lvm2", "pv_attr": "a--" if vg else "---",
+                "pv_size": self._mib(pv_sizes[path]), "pv_free": self._mib(pv_free[path]),
+            }
+            for path, vg in self.pvs.items()
+            if vg in selected or (include_orphans and not vg)
+        ]
+        vg_sizes = {name: 0 for name in self.vgs}
+        pv_counts = {name: 0 for name in self.vgs}
+        for path, name in self.pvs.items():
+            if name:
+                vg_sizes[name] += pv_sizes[path]
+                pv_counts[name] += 1
+        vg = [
+            {
+                "vg_name": name, "vg_attr": "wz--n-",
+                "vg_size": self._mib(vg_sizes[name]), "vg_free": self._mib(vg_sizes[name] - used[name]),
+                "vg_extent_size": self._mib(self.vgs[name]),
+                "pv_count": str(pv_counts[name]), "lv_count": str(lv_counts[name]), "snap_count": "0",
+            }
+            for name in selected
+        ]
+        lv = [
+            {
+                "lv_name": name, "vg_name": vg_name, "lv_attr": "-wi-a-----", "lv_size": self._mib(size),
+                "lv_path": f"/dev/{vg_name}/{name}", "lv_dm_path": self.dm_path(vg_name, name),
+            }
+            for (vg_name, name), size in self.lvs.items()
+            if vg_name in selected
+        ]
+        seg = [
+            {"lv_name": l["lv_name"], "vg_name": l["vg_name"], "segtype": "linear", "stripes": "1", "stripe_size": "0m"}
+            for l in lv
+        ]
+        return {"changed": False, "pv": pv, "vg": vg, "lv": lv, "seg": seg}
+
+    def dev_info(self, path):
+        lv = self.lv_paths.get(path)
+        if path in self.nodes:
+            rdev = self.rdevs[path]
+        elif lv is not None:
+            rdev = self.rdevs[f"/dev/{lv[0]}/{lv[1]}"]
+        else:
+            return {"is_exists": False, "stat": {}}
+
+        info = {
+            "is_exists": True,
+            "filetype": "b",
+            "stat": {"mode": 25008, "rdev": rdev, "size": 0, "uid": 0, "gid": 6, "nlink": 1},
+            "mount": [],
+        }
+
+        fstype = "LVM2_member" if path in self.pvs else None
+        if lv is not None:
+            lv_path = f"/dev/{lv[0]}/{lv[1]}"
+            fstype = self.filesystems.get(lv_path)
+            if lv_path in self.mounts:
+                info["mount"] = [{
+                    "target": self.mounts[lv_path], "source": self.dm_path(*lv),
+                    "fstype": fstype, "options": "rw,relatime",
+                }]
+        if fstype:
+            info["blkid"] = {"dev_name": path, "type": fstype}
+        return info
+
+    def dev_probe(self, paths):
+        """
+        Return the result of aursu.lvm_setup.dev_probe for `paths`.
+        """
+        return {"changed": False, "devices": {path: self.dev_info(path) for path in dict.fromkeys(paths)}}
+
+    # --- sizes ---
+
+    def vg_pvs(self, vg):
+        return [path for path, name in self.pvs.items() if name == vg]
+
+    def vg_size(self, vg):
+        return sum(self._pv_size(path) for path in self.vg_pvs(vg))
+
+    def vg_free(self, vg):
+        return self.vg_size(vg) - sum(size for (name, _), size in self.lvs.items() if name == vg)
+
+    def _pv_size(self, path):
+        disk, num = self.nodes[path]
+        first, last = self.disks[disk]["partitions"][num]
+        size = (last - first + 1) * self.sector_size - PV_METADATA
+        extent = self.vgs.get(self.pvs.get(path), self.extent_size)
+        return max(size - size % extent, 0)
+
+    @staticmethod
+    def dm_path(vg, lv):
+        return f"/dev/mapper/{vg.replace('-', '--')}-{lv.replace('-', '--')}"
+
+    @staticmethod
+    def _mib(size):
+        return f"{size / MiB:.2f}m"
+
+    def _disk(self, disk):
+        if disk not in self.disks:
+            raise FakeStorageError(f"Unknown disk {disk}")
+        return self.disks[disk]
+
+    # --- apply ---
+
+    def apply_partitions(self, plans):
+        """
+        Create the partitions with action 'create' of disk → plan (as partition_apply with 'plans').
+
+        Returns:
+            dict: disk path → list of created partition numbers
+        """
+        created = {}
+        for disk, plan in plans.items():
+            data = self._disk(disk)
+            for entry in plan:
+                if entry.get("action") != "create":
+                    continue
+                if data["table"] is None:
+                    data["table"] = entry.get("disk_label") or "gpt"
+
+                num = int(entry["num"])
+                if num in data["partitions"]:
+                    continue
+                first = to_sectors(entry["part_start"], self.sector_size)
+                last = to_sectors(entry["part_end"], self.sector_size)
+                if last is None:
+                    last = self._free_end(data, first)
+                self._check_free(disk, data, first, last)
+
+                data["partitions"][num] = (first, last)
+                data["partitions"] = dict(sorted(data["partitions"].items()))
+                node = partition_node(disk, num)
+                self.nodes[node] = (disk, num)
+                self.rdevs[node] = 8 * 256 + len(self.rdevs)
+                created.setdefault(disk, []).append(num)
+        return created
+
+    def _free_end(self, data, first):
+        last = data["sectors"] - 1
+        if data["table"] == "gpt":
+            last -= GPT_RESERVED_SECTORS - 1
+        for begin, _ in data["partitions"].values():
+            if begin > first:
+                last = min(last, begin - 1)
+        return last
+
+    def _check_free(self, disk, data, first, last):
+        if first > last or last >= data["sectors"]:
+            raise FakeStorageError(f"Invalid partition {first}..{last} on {disk}")
+        for num, (begin, end) in data["partitions"].items():
+            if first <= end and begin <= last:
+                raise FakeStorageError(f"Partition {first}..{last} overlaps partition {num} on {disk}")
+
+    def ensure_vg(self, vg, pvs):
+        """
+        Create or extend volume group `vg` with `pvs` (as community.general.lvg with state present).
+
+        Returns:
+            bool: True if anything changed
+        """
+        changed = False
+        for path in pvs:
+            if path not in self.nodes:
+                raise FakeStorageError(f"Device {path} not found")
+            owner = self.pvs.get(path)
+            if owner and owner != vg:
+                raise FakeStorageError(f"{path} already belongs to volume group {owner}")
+            if path in self.filesystems:
+                raise FakeStorageError(f"{path} contains a {self.filesystems[path]} filesystem")
+            if owner != vg:
+                self.pvs[path] = vg
+                changed = True
+        if vg not in self.vgs:
+            self.vgs[vg] = self.extent_size
+            changed = True
+        return changed
+
+    def create_lvs(self, volumes, plan):
+        """
+        Create the LVs with action 'create' (as community.general.lvol).
+
+        Returns:
+            list: names of the created LVs
+        """
+        created = []
+        free_by_vg = {}
+        for volume, entry in zip(volumes, plan):
+            if entry.get("action") != "create":
+                continue
+            vg, name = volume["vg"], volume["name"]
+            if vg not in self.vgs:
+                raise FakeStorageError(f"Volume group {vg} does not exist")
+            if (vg, name) in self.lvs:
+                continue
+
+            if vg not in free_by_vg:
+                free_by_vg[vg] = (self.vg_size(vg), self.vg_free(vg))
+            vg_size, vg_free = free_by_vg[vg]
+            free = Size(vg_free)
+            totals = {"FREE": free, "VG": Size(vg_size), "PVS": Size(vg_size)}
+            relative = Size.relative(volume["size"])
+            size = Size.parse(volume["size"], total=totals[relative[1]] if relative else None)
+            size = size.align_up(Size(self.vgs[vg])).bytes
+            if size > free.bytes:
+                raise FakeStorageError(f"Insufficient free space in {vg} for {name}")
+
+            self.lvs[(vg, name)] = size
+            free_by_vg[vg] = (vg_size, vg_free - size)
+            path = f"/dev/{vg}/{name}"
+            self.lv_paths[path] = self.lv_paths[self.dm_path(vg, name)] = (vg, name)
+            self.rdevs[path] = 253 * 256 + len(self.rdevs)
+            created.append(name)
+        return created
+
+    def make_filesystems(self, volumes, plan):
+        """
+        Create filesystems of the LVs with action 'create' or 'format' (as filesystem_apply).
+
+        Returns:
+            list: paths of the formatted LVs
+        """
+        formatted = []
+        for job in filesystem_jobs(volumes, plan):
+            if job["path"] not in self.lv_paths:
+                raise FakeStorageError(f"{job['path']} does not exist")
+            found = self.filesystems.get(job["path"])
+            if found == job["fstype"]:
+                continue
+            if found:
+                raise FakeStorageError(f"{job['path']} already contains a {found} filesystem")
+            self.filesystems[job["path"]] = job["fstype"]
+            formatted.append(job["path"])
+        return formatted
+
+    def mount(self, path, target):
+        """
+        Mount `path` at `target` (as ansible.posix.mount with state mounted).
+        """
+        if path not in self.filesystems:
+            raise FakeStorageError(f"{path} has no filesystem")
+        changed = self.mounts.get(path) != target
+        self.mounts[path] = target
+        return changed
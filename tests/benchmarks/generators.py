@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Synthetic storage state generators for the planner benchmarks.
+
+All generators are deterministic and return data in the formats gathered by the roles:
+parted info (partition_table_info), lvm_info (lvm_report) and dev_info maps (dev_probe).
+"""
+
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.partition_table import parted_info as render_parted_info
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.sfdisk_script import partition_node
+
+SECTOR_SIZE = 512
+MIB_SECTORS = 1024 * 1024 // SECTOR_SIZE
+FIRST_SECTOR = 2048
+GPT_RESERVED = 34
+
+LVM_FLAGS = ["lvm"]
+
+def partition_specs(count, size_mib=16):
+    """
+    Return `count` requested partitions of `size_mib` MiB each (numbered from 1).
+    """
+    return [{"num": num, "size": f"{size_mib}MiB"} for num in range(1, count + 1)]
+
+def parted_info(disk="/dev/sda", partitions=0, size_mib=16, free_mib=1024):
+    """
+    Return parted info (in sectors) of a GPT disk holding `partitions` back-to-back partitions of
+    `size_mib` MiB, followed by `free_mib` MiB of free space.
+    """
+    part_sectors = size_mib * MIB_SECTORS
+    parts = []
+    first = FIRST_SECTOR
+    for num in range(1, partitions + 1):
+        parts.append({"num": num, "first": first, "last": first + part_sectors - 1, "name": "", "flags": LVM_FLAGS})
+        first += part_sectors
+
+    total_sectors = first + free_mib * MIB_SECTORS + GPT_RESERVED
+    return render_parted_info(
+        disk, {"table": "gpt", "partitions": parts}, SECTOR_SIZE, total_sectors,
+        disk_meta={"physical_block": 4096, "model": "Synthetic Disk"},
+    )
+
+def disk_names(count):
+    """
+    Return `count` disk paths (/dev/sda ... /dev/sdzz, then nvme namespaces).
+    """
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    names = []
+    for i in range(count):
+        if i < len(letters):
+            names.append(f"/dev/sd{letters[i]}")
+        elif i < len(letters) * (len(letters) + 1):
+            j = i - len(letters)
+            names.append(f"/dev/sd{letters[j // len(letters)]}{letters[j % len(letters)]}")
+        else:
+            names.append(f"/dev/nvme{i}n1")
+    return names
+
+def pv_paths(count, per_disk=1):
+    """
+    Return `count` partition paths, `per_disk` partitions on each disk.
+    """
+    disks = disk_names((count + per_disk - 1) // per_disk)
+    return [partition_node(disks[i // per_disk], i % per_disk + 1) for i in range(count)]
+
+def lvm_info(vg="data", pvs=1000, lvs=10000, lv_size_mib=1024, free_mib=1024 * 1024):
+    """
+    Return lvm_info of one volume group built from `pvs` PVs holding `lvs` LVs of `lv_size_mib` MiB.
+    """
+    used = lvs * lv_size_mib
+    size = used + free_mib
+    pv_size = size / max(pvs, 1)
+    pv_free = free_mib / max(pvs, 1)
+
+    return {
+        "pv": [
+            {
+                "pv_name": path, "vg_name": vg, "pv_fmt": "lvm2", "pv_attr": "a--",
+                "pv_size": f"{pv_size:.2f}m", "pv_free": f"{pv_free:.2f}m",
+            }
+            for path in pv_paths(pvs)
+        ],
+        "vg": [{
+            "vg_name": vg, "pv_count": str(pvs), "lv_count": str(lvs), "snap_count": "0", "vg_attr": "wz--n-",
+            "vg_size": f"{size:.2f}m", "vg_free": f"{free_mib:.2f}m", "vg_extent_size": "4.00m",
+        }],
+        "lv": [
+            {"lv_name": f"lv{i}", "vg_name": vg, "lv_attr": "-wi-a-----", "lv_size": f"{lv_size_mib:.2f}m"}
+            for i in range(lvs)
+        ],
+    }
+
+def volume_specs(count, vg="data", size="1g", filesystem="xfs", start=0):
+    """
+    Return `count` requested LVs named like the ones of lvm_info() (lv<start> ... ).
+    """
+    return [
+        {"name": f"lv{i}", "vg": vg, "size": size, "filesystem": filesystem, "mountpoint": f"/mnt/lv{i}"}
+        for i in range(start, start + count)
+    ]
+
+def dev_info(path, fstype=None, rdev=64768, mounts=()):
+    """
+    Return the dev_info entry of an existing block device.
+    """
+    info = {
+        "is_exists": True,
+        "filetype": "b",
+        "stat": {"mode": 25008, "rdev": rdev, "size": 0, "uid": 0, "gid": 6, "nlink": 1},
+        "mount": [dict(m) for m in mounts],
+    }
+    if fstype:
+        info["blkid"] = {"dev_name": path, "type": fstype}
+    return info
+
+def dev_infos(volumes, fstype="xfs", mounted=True):
+    """
+    Return a dev_probe style map (path → dev_info) for the LVs of `volumes`, formatted with `fstype`
+    and mounted at their mountpoints if `mounted` is set.
+    """
+    result = {}
+    for i, volume in enumerate(volumes):
+        path = f"/dev/{volume['vg']}/{volume['name']}"
+        mounts = ()
+        if mounted and volume.get("mountpoint"):
+            mounts = ({"target": volume["mountpoint"], "source": path, "fstype": fstype, "options": "rw"},)
+        result[path] = dev_info(path, fstype, rdev=64768 + i, mounts=mounts)
+    return {"changed": False, "devices": result}
+
+def pv_dev_infos(paths):
+    """
+    Return a dev_probe style map for partitions used as LVM physical volumes.
+    """
+    return {"changed": False, "devices": {path: dev_info(path, "LVM2_member") for path in paths}}
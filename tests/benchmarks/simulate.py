@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Alexander Ursu <alexander.ursu@gmail.com>
+# SPDX-License-Identifier: MIT
+
+"""
+Fleet convergence simulation on the in-memory storage backend.
+
+Runs the planning flow of the process_disks, process_lvm and process_volumes roles against
+FakeStorage hosts, applies the plans, and reports the time spent in each stage per run:
+
+    python tests/benchmarks/simulate.py --hosts 100 --disks 4 --partitions 4 --volumes 50 --runs 2
+
+The second and later runs of a converged host must not change anything.
+"""
+
+import argparse
+import inspect
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generators as gen  # noqa: E402
+from fake_storage import GiB, FakeStorage  # noqa: E402
+from ansible_collections.aursu.lvm_setup.plugins.filter import (  # noqa: E402
+    partition_paths_disk,
+    partition_paths_system,
+    plan_unchanged,
+    validate_lvm_partition,
+    validate_mount,
+    validate_partitions_exist,
+    validate_partitions_input,
+    validate_partitions_system,
+    validate_pvs,
+    validate_vg,
+    validate_volumes,
+    validate_volumes_input,
+)
+
+FILTER_MODULES = (
+    partition_paths_disk, partition_paths_system, plan_unchanged, validate_lvm_partition, validate_mount,
+    validate_partitions_exist, validate_partitions_input, validate_partitions_system, validate_pvs,
+    validate_vg, validate_volumes, validate_volumes_input,
+)
+
+def load_filters(memo=True):
+    """
+    Return filter name → function, as registered by the FilterModules.
+
+    With memo=False the memoization of the filters is bypassed.
+    """
+    filters = {}
+    for module in FILTER_MODULES:
+        for name, func in module.FilterModule().filters().items():
+            filters[name] = func if memo else inspect.unwrap(func)
+    return filters
+
+def host_spec(disks=4, partitions=4, volumes=50, vg="data", part_size_gib=16, lv_size="1g"):
+    """
+    Return the role variables (partitions, vg_name, volumes) and disk sizes of a synthetic host.
+    """
+    disk_paths = gen.disk_names(disks)
+    size = (partitions * part_size_gib + 1) * GiB
+    return {
+        "disks": {disk: size for disk in disk_paths},
+        "partitions": {disk: gen.partition_specs(partitions, part_size_gib * 1024) for disk in disk_paths},
+        "vg_name": vg,
+        "volumes": gen.volume_specs(volumes, vg=vg, size=lv_size),
+    }
+
+class Timer:
+    def __init__(self):
+        self.stages = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - started
+
+def converge(storage, spec, filters=None, timer=None):
+    """
+    Run the roles' planning flow once against `storage` and apply the plans.
+
+    Returns:
+        dict: Number of objects changed per stage ('partitions', 'vg', 'lvs', 'filesystems', 'mounts').
+    """
+    f = filters or load_filters()
+    timer = timer or Timer()
+    partitions, vg_name, volumes = spec["partitions"], spec["vg_name"], spec["volumes"]
+    changes = {}
+
+    # process_disks
+    with timer.stage("disks.plan"):
+        assert f["validate_partitions_input"](partitions)
+        tables = storage.partition_table_info(list(partitions))
+        plans = f["validate_partitions_system"](tables["disks"], partitions)
+    with timer.stage("disks.apply"):
+        created = {} if f["plan_unchanged"](plans) else storage.apply_partitions(plans)
+        changes["partitions"] = sum(len(nums) for nums in created.values())
+
+    # process_lvm
+    with timer.stage("lvm.plan"):
+        tables = storage.partition_table_info(list(partitions))
+        pv_paths = f["partition_paths_system"](partitions).split(",")
+        probe = storage.dev_probe(pv_paths)
+        lvm_info = storage.lvm_report([vg_name])
+        for disk, parts in partitions.items():
+            assert f["validate_partitions_exist"](tables["disks"][disk], parts)
+            disk_paths = f["partition_paths_disk"](disk, parts)
+            for path in disk_paths:
+                assert f["validate_lvm_partition"](path, probe["devices"])
+            f["validate_pvs"](lvm_info, disk_paths, vg_name)
+    with timer.stage("lvm.apply"):
+        changes["vg"] = int(storage.ensure_vg(vg_name, pv_paths))
+
+    # process_volumes
+    with timer.stage("volumes.plan"):
+        assert f["validate_volumes_input"](volumes)
+        lvm_info = storage.lvm_report([vg_name])
+        assert f["validate_vg"](vg_name, lvm_info)
+        probe = storage.dev_probe([f"/dev/{v['vg']}/{v['name']}" for v in volumes])
+        volumes_plan = f["validate_volumes"](volumes, lvm_info, probe)
+    with timer.stage("volumes.apply"):
+        unchanged = f["plan_unchanged"](volumes_plan)
+        changes["lvs"] = 0 if unchanged else len(storage.create_lvs(volumes, volumes_plan))
+        changes["filesystems"] = 0 if unchanged else len(storage.make_filesystems(volumes, volumes_plan))
+    with timer.stage("volumes.mount"):
+        changes["mounts"] = 0
+        for volume, entry in zip(volumes, volumes_plan):
+            if volume.get("filesystem") and volume.get("mountpoint") and not f["validate_mount"](volume, probe["devices"]):
+                changes["mounts"] += storage.mount(entry["path"], volume["mountpoint"])
+
+    return changes
+
+def simulate(hosts, runs, spec, memo=True):
+    """
+    Converge `hosts` identical hosts `runs` times.
+
+    Returns:
+        list[dict]: Per run: total stage times ('stages') and total changes ('changes').
+    """
+    filters = load_filters(memo)
+    storages = [FakeStorage(spec["disks"]) for _ in range(hosts)]
+
+    report = []
+    for _ in range(runs):
+        timer = Timer()
+        changes = defaultdict(int)
+        for storage in storages:
+            for key, value in converge(storage, spec, filters, timer).items():
+                changes[key] += value
+        report.append({"stages": dict(timer.stages), "changes": dict(changes)})
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hosts", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--disks", type=int, default=4, help="disks per host")
+    parser.add_argument("--partitions", type=int, default=4, help="partitions per disk")
+    parser.add_argument("--volumes", type=int, default=50, help="logical volumes per host")
+    parser.add_argument("--no-memo", action="store_true", help="bypass the memoization of the filters")
+    args = parser.parse_args(argv)
+
+    spec = host_spec(args.disks, args.partitions, args.volumes)
+    report = simulate(args.hosts, args.runs, spec, memo=not args.no_memo)
+
+    status = 0
+    for run, result in enumerate(report, 1):
+        total = sum(result["stages"].values())
+        print(f"run {run}: {total * 1000:.1f} ms for {args.hosts} hosts, changes: {result['changes']}")
+        for name, seconds in result["stages"].items():
+            print(f"  {name:16} {seconds * 1000:10.1f} ms {seconds / args.hosts * 1000:10.3f} ms/host")
+        if run > 1 and any(result["changes"].values()):
+            print(f"run {run} is not idempotent", file=sys.stderr)
+            status = 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
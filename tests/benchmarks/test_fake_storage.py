@@ -0,0 +1,51 @@
+import pytest
+from fake_storage import GiB, FakeStorage, FakeStorageError
+from simulate import converge, host_spec, load_filters
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import Disk
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import VolumeGroup
+
+def test_converges_and_stays_unchanged():
+    spec = host_spec(disks=2, partitions=2, volumes=5, part_size_gib=1, lv_size="256m")
+    storage = FakeStorage(spec["disks"])
+
+    assert converge(storage, spec) == {"partitions": 4, "vg": 1, "lvs": 5, "filesystems": 5, "mounts": 5}
+    assert converge(storage, spec) == {"partitions": 0, "vg": 0, "lvs": 0, "filesystems": 0, "mounts": 0}
+    assert converge(storage, spec, load_filters(memo=False))["lvs"] == 0
+
+def test_reported_state_matches_planner_models():
+    storage = FakeStorage({"/dev/nvme0n1": 4 * GiB})
+    storage.apply_partitions({"/dev/nvme0n1": [
+        {"num": 1, "action": "create", "disk_label": "gpt", "part_start": "2048s", "part_end": "2099199s"},
+        {"num": 2, "action": "create", "disk_label": "gpt", "part_start": "2099200s", "part_end": "100%"},
+    ]})
+    storage.ensure_vg("data", ["/dev/nvme0n1p1", "/dev/nvme0n1p2"])
+    storage.create_lvs([{"name": "data1", "vg": "data", "size": "100%FREE"}], [{"action": "create"}])
+
+    disk = Disk.from_parted(storage.parted_info("/dev/nvme0n1"))
+    assert disk.table == "gpt"
+    assert disk.paths() == ["/dev/nvme0n1p1", "/dev/nvme0n1p2"]
+
+    vg = VolumeGroup.from_lvm_info("data", storage.lvm_report(["data"]))
+    assert vg.is_exists
+    assert sorted(vg.pvs) == ["/dev/nvme0n1p1", "/dev/nvme0n1p2"]
+    assert vg.vg_free.bytes == 0
+    assert vg.vg_size.bytes == storage.lvs[("data", "data1")]
+
+    probe = storage.dev_probe(["/dev/nvme0n1p1", "/dev/mapper/data-data1", "/dev/data/data2"])["devices"]
+    assert probe["/dev/nvme0n1p1"]["blkid"]["type"] == "LVM2_member"
+    assert probe["/dev/mapper/data-data1"]["is_exists"] is True
+    assert probe["/dev/data/data2"] == {"is_exists": False, "stat": {}}
+
+def test_apply_errors():
+    storage = FakeStorage({"/dev/sda": GiB})
+    create = {"num": 1, "action": "create", "disk_label": "gpt", "part_start": "2048s", "part_end": "4095s"}
+    storage.apply_partitions({"/dev/sda": [create]})
+
+    with pytest.raises(FakeStorageError, match="overlaps partition 1"):
+        storage.apply_partitions({"/dev/sda": [dict(create, num=2)]})
+    with pytest.raises(FakeStorageError, match="Unknown disk"):
+        storage.partition_table_info(["/dev/sdb"])
+
+    storage.ensure_vg("data", ["/dev/sda1"])
+    with pytest.raises(FakeStorageError, match="Insufficient free space"):
+        storage.create_lvs([{"name": "data1", "vg": "data", "size": "1g"}], [{"action": "create"}])
@@ -0,0 +1,53 @@
+import pytest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.filter.disk_free_extents import disk_free_extents
+
+def parted_info(partitions, size):
+    return {
+        "disk": {"size": size, "dev": "/dev/sda", "table": "gpt"},
+        "partitions": partitions
+    }
+
+def test_empty_disk():
+    result = disk_free_extents(parted_info([], 4096.0))
+    assert result == [{"begin": 0.0, "end": 4096.0, "size": 4096.0}]
+
+def test_gaps_largest_first():
+    parted = parted_info([
+        {"num": 1, "begin": 1.0, "end": 1024.0, "size": 1023.0},
+        {"num": 2, "begin": 1536.0, "end": 2048.0, "size": 512.0},
+    ], 8192.0)
+    result = disk_free_extents(parted)
+    assert [(e["begin"], e["end"]) for e in result] == [(2048.0, 8192.0), (1024.0, 1536.0)]
+
+def test_count_limit():
+    parted = parted_info([
+        {"num": 1, "begin": 1.0, "end": 1024.0, "size": 1023.0},
+        {"num": 2, "begin": 1536.0, "end": 2048.0, "size": 512.0},
+    ], 8192.0)
+    result = disk_free_extents(parted, count=1)
+    assert len(result) == 1
+    assert result[0]["size"] == 6144.0
+
+def test_fill_mode():
+    parted = parted_info([
+        {"num": 1, "begin": 1.0, "end": 1024.0, "size": 1023.0},
+        {"num": 2, "begin": 1536.0, "end": 2048.0, "size": 512.0},
+    ], 8192.0)
+    result = disk_free_extents(parted, fill=True)
+    assert result[0]["num"] == 3
+    assert result[0]["part_start"] == "4196352s"
+    assert result[0]["part_end"] == "100%"
+    assert result[1]["num"] == 4
+    assert result[1]["part_start"] == "2099200s"
+    assert result[1]["part_end"] == "3145727s"
+
+def test_fill_empty_disk():
+    result = disk_free_extents(parted_info([], 4096.0), fill=True)
+    assert result[0]["num"] == 1
+    assert result[0]["part_start"] == "2048s"
+    assert result[0]["part_end"] == "100%"
+
+def test_invalid_count():
+    with pytest.raises(AnsibleFilterError, match="Expected 'count' to be a non-negative integer"):
+        disk_free_extents(parted_info([], 4096.0), count="two")
@@ -0,0 +1,24 @@
+import pytest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.filter.lvm_scan_devices import lvm_scan_devices
+
+LVM_DEVICES = {
+    "use_devicesfile": True,
+    "devices": ["/dev/sda3", "/dev/sdb1"],
+    "global_filter": [],
+    "block_devices": ["/dev/sda", "/dev/sda3", "/dev/sdb", "/dev/sdb1", "/dev/dm-7"],
+}
+
+def test_block_devices_of_the_result():
+    assert lvm_scan_devices(LVM_DEVICES) == ["/dev/sda3", "/dev/sdb1"]
+
+def test_given_devices():
+    assert lvm_scan_devices(LVM_DEVICES, ["/dev/sdb1", "/dev/sdc1"]) == ["/dev/sdb1"]
+
+def test_global_filter_only():
+    lvm_devices = dict(LVM_DEVICES, use_devicesfile=False, global_filter=["a|^/dev/sdb1$|", "r|.*|"])
+    assert lvm_scan_devices(lvm_devices) == ["/dev/sdb1"]
+
+def test_invalid_input():
+    with pytest.raises(AnsibleFilterError):
+        lvm_scan_devices(["/dev/sdb1"])
@@ -51,8 +51,8 @@ def test_create_partition_with_enough_space():
     result = validate_partitions(parted, requested)
     assert result[0]["status"] == "ok"
     assert result[0]["action"] == "create"
-    assert result[0]["part_start"] == "1025MiB"
-    assert result[0]["part_end"] == "2048MiB"
+    assert result[0]["part_start"] == "2099200s"
+    assert result[0]["part_end"] == "4196351s"
 
 def test_create_partition_without_size_at_end():
     parted = parted_info([
@@ -138,3 +138,47 @@ def test_partition_must_exist_with_require_existing_nvme():
     requested = [{"num": 2, "size": 1024.0}]
     with pytest.raises(AnsibleFilterError, match=r"/dev/nvme0n1p2 not found — expected to exist"):
         validate_partitions(parted, requested, require_existing=True)
+
+def test_create_first_partition_aligned_after_gpt_header():
+    parted = parted_info([], 4096.0)
+    result = validate_partitions(parted, [{"num": 1, "size": "1g"}])
+    assert result[0]["part_start"] == "2048s"
+    assert result[0]["part_end"] == "2099199s"
+
+def test_create_partition_on_4kn_disk():
+    parted = {
+        "disk": {"size": 4096.0, "dev": "/dev/sda", "logical_block": 4096, "physical_block": 4096},
+        "partitions": [
+            {"num": 1, "begin": 256, "end": 262399, "size": 262144, "unit": "s"}
+        ]
+    }
+    result = validate_partitions(parted, [{"num": 2, "size": "1g"}])
+    assert result[0]["part_start"] == "262400s"
+    assert result[0]["part_end"] == "524543s"
+
+def test_create_partition_aligned_to_optimal_io_size():
+    parted = parted_info([
+        {"num": 1, "begin": 2048, "end": 2099199, "size": 2097152, "unit": "s"}
+    ], 8192.0)
+    # RAID stripe width of 3 MiB (6 data disks x 512 KiB chunk)
+    parted["disk"].update({"minimum_io_size": 524288, "optimal_io_size": 3145728})
+    result = validate_partitions(parted, [{"num": 2, "size": "1g"}])
+    assert result[0]["part_start"] == "2101248s"
+    assert result[0]["part_end"] == "4198399s"
+
+def test_create_partition_honors_alignment_offset():
+    parted = parted_info([], 4096.0)
+    parted["disk"].update({"physical_block": 4096, "alignment_offset": 3584})
+    result = validate_partitions(parted, [{"num": 1, "size": "1g"}])
+    assert result[0]["part_start"] == "2055s"
+
+def test_bogus_optimal_io_size_is_ignored():
+    parted = parted_info([], 4096.0)
+    parted["disk"]["optimal_io_size"] = 33553920
+    result = validate_partitions(parted, [{"num": 1, "size": "1g"}])
+    assert result[0]["part_start"] == "2048s"
+
+def test_create_partition_exceeds_gpt_usable_area():
+    parted = parted_info([], 1025.0)
+    with pytest.raises(AnsibleFilterError, match=r"exceeds available space"):
+        validate_partitions(parted, [{"num": 1, "size": "1g"}])
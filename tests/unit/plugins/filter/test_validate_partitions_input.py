@@ -67,3 +67,30 @@ def test_partition_numbers_have_gaps():
     }
     with pytest.raises(AnsibleFilterError, match="Partition numbers on disk '/dev/sda' contain gaps"):
         validate_partitions_input(partitions, allow_gaps=False)
+
+def test_all_errors_reported_at_once():
+    partitions = {
+        '/dev/sda': [
+            {'num': 'one'},
+            {'num': 2, 'size': 'big'},
+            'not a dict',
+            {'num': 3}
+        ],
+        '/dev/sdb': [
+            {'num': 1, 'size': '100g'},
+            {'num': 1}
+        ],
+        '/dev/sdc': 'notalist'
+    }
+    with pytest.raises(AnsibleFilterError) as exc:
+        validate_partitions_input(partitions)
+
+    message = exc.value.message
+    assert message.startswith("Found 5 errors in 'partitions':")
+    assert "Partition entry must be a dictionary. Found: not a dict" in message
+    assert "'num' must be an integer in partition #3 for disk '/dev/sda'" in message
+    assert "Unable to convert 'size' field to MiB for partition #1 for disk '/dev/sda'. Got: big" in message
+    assert "Duplicate partition number 1 detected on disk '/dev/sdb'" in message
+    assert "Expected a list of partitions for device '/dev/sdc', got str." in message
+    # numbering of a disk with unparsable entries is not reported as a gap
+    assert "contain gaps" not in message
@@ -0,0 +1,54 @@
+import pytest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.filter.validate_partitions_system import validate_partitions_system
+
+def parted_info(dev, partitions, size, table="gpt"):
+    return {
+        "disk": {"size": size, "dev": dev, "table": table},
+        "partitions": partitions
+    }
+
+def test_plan_keyed_by_disk():
+    parted = {
+        "/dev/sda": parted_info("/dev/sda", [
+            {"num": 1, "begin": 1.0, "end": 1025.0, "size": 1024.0}
+        ], 4096.0),
+        "/dev/sdb": parted_info("/dev/sdb", [], 4096.0, table=""),
+    }
+    partitions = {
+        "/dev/sda": [{"num": 1, "size": "1g"}, {"num": 2}],
+        "/dev/sdb": [{"num": 1, "size": "1g"}],
+    }
+    result = validate_partitions_system(parted, partitions)
+
+    assert list(result) == ["/dev/sda", "/dev/sdb"]
+    assert [p["action"] for p in result["/dev/sda"]] == ["skip", "create"]
+    assert result["/dev/sda"][1]["part_end"] == "100%"
+    assert result["/dev/sdb"][0]["action"] == "create"
+    assert result["/dev/sdb"][0]["disk_label"] == "gpt"
+    assert result["/dev/sdb"][0]["part_start"] == "2048s"
+
+def test_plan_from_looped_results():
+    parted = {
+        "results": [
+            dict(parted_info("/dev/sda", [], 4096.0), item="/dev/sda"),
+            dict(parted_info("/dev/nvme0n1", [], 4096.0), item={"key": "/dev/nvme0n1", "value": []}),
+        ]
+    }
+    partitions = {
+        "/dev/sda": [{"num": 1, "size": "1g"}],
+        "/dev/nvme0n1": [{"num": 1}],
+    }
+    result = validate_partitions_system(parted, partitions, default_label="msdos")
+    assert result["/dev/sda"][0]["disk_label"] == "gpt"
+    assert result["/dev/nvme0n1"][0]["part_end"] == "100%"
+
+def test_missing_parted_info_for_disk():
+    partitions = {"/dev/sdc": [{"num": 1}]}
+    with pytest.raises(AnsibleFilterError, match="No parted information found for disk '/dev/sdc'"):
+        validate_partitions_system({}, partitions)
+
+def test_require_existing():
+    parted = {"/dev/sda": parted_info("/dev/sda", [], 4096.0)}
+    with pytest.raises(AnsibleFilterError, match=r"/dev/sda1 not found"):
+        validate_partitions_system(parted, {"/dev/sda": [{"num": 1}]}, require_existing=True)
@@ -0,0 +1,56 @@
+import pytest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.filter.validate_volume import validate_volume
+
+def lvm_info(vg_free="1024.00m", vg_size="2048.00m", lvs=None):
+    return {
+        "vg": [{"vg_name": "data", "vg_free": vg_free, "vg_size": vg_size}],
+        "lv": lvs or [],
+        "pv": [],
+    }
+
+def test_create_when_missing():
+    lv = {"name": "data1", "vg": "data", "size": "512m", "filesystem": "xfs"}
+    result = validate_volume(lv, lvm_info(), {"is_exists": False})
+    assert result == {"name": "data1", "path": "/dev/data/data1", "action": "create"}
+
+def test_create_exact_free_space():
+    lv = {"name": "data1", "vg": "data", "size": "1g"}
+    result = validate_volume(lv, lvm_info(), {"is_exists": False})
+    assert result["action"] == "create"
+
+def test_create_relative_size():
+    lv = {"name": "data1", "vg": "data", "size": "100%FREE"}
+    result = validate_volume(lv, lvm_info(), {"is_exists": False})
+    assert result["action"] == "create"
+
+def test_not_enough_free_space():
+    lv = {"name": "data1", "vg": "data", "size": "1025m"}
+    with pytest.raises(AnsibleFilterError, match="Not enough free space"):
+        validate_volume(lv, lvm_info(), {"is_exists": False})
+
+def test_existing_volume_needs_format():
+    lv = {"name": "data1", "vg": "data", "size": "512m", "filesystem": "xfs"}
+    info = lvm_info(lvs=[{"lv_name": "data1", "vg_name": "data", "lv_size": "512.00m"}])
+    dev_info = {"is_exists": True, "filetype": "b", "blkid": {}}
+    result = validate_volume(lv, info, dev_info)
+    assert result["action"] == "format"
+
+def test_existing_volume_filesystem_mismatch():
+    lv = {"name": "data1", "vg": "data", "size": "512m", "filesystem": "xfs"}
+    info = lvm_info(lvs=[{"lv_name": "data1", "vg_name": "data", "lv_size": "512.00m"}])
+    dev_info = {"is_exists": True, "filetype": "b", "blkid": {"type": "ext4"}}
+    with pytest.raises(AnsibleFilterError, match="Filesystem mismatch"):
+        validate_volume(lv, info, dev_info)
+
+def test_missing_volume_group():
+    lv = {"name": "data1", "vg": "other", "size": "512m"}
+    with pytest.raises(AnsibleFilterError, match="Volume group 'other' not found"):
+        validate_volume(lv, lvm_info(), {"is_exists": False})
+
+def test_device_info_map():
+    lv = {"name": "data1", "vg": "data", "size": "512m", "filesystem": "xfs"}
+    info = lvm_info(lvs=[{"lv_name": "data1", "vg_name": "data", "lv_size": "512.00m"}])
+    dev_infos = {"/dev/mapper/data-data1": {"is_exists": True, "filetype": "b", "blkid": {"type": "xfs"}}}
+    result = validate_volume(lv, info, dev_infos)
+    assert result["action"] == "skip"
@@ -0,0 +1,147 @@
+import pytest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.filter.validate_volumes import validate_volumes
+
+def lvm_info(vg_free="1024.00m", vg_size="2048.00m", lvs=None):
+    return {
+        "vg": [{"vg_name": "data", "vg_free": vg_free, "vg_size": vg_size}],
+        "lv": lvs or [],
+        "pv": [],
+    }
+
+EXISTING = [{"lv_name": "data1", "vg_name": "data", "lv_size": "1024.00m"}]
+
+def test_plan_in_order():
+    volumes = [
+        {"name": "data1", "vg": "data", "size": "1g", "filesystem": "xfs"},
+        {"name": "data2", "vg": "data", "size": "512m", "filesystem": "xfs"},
+    ]
+    dev_infos = {"/dev/data/data1": {"is_exists": True, "filetype": "b", "blkid": {"type": "xfs"}}}
+
+    result = validate_volumes(volumes, lvm_info(lvs=EXISTING), dev_infos)
+
+    assert result == [
+        {"name": "data1", "path": "/dev/data/data1", "action": "skip"},
+        {"name": "data2", "path": "/dev/data/data2", "action": "create"},
+    ]
+
+def test_batch_exceeding_free_space():
+    volumes = [
+        {"name": "data1", "vg": "data", "size": "512m"},
+        {"name": "data2", "vg": "data", "size": "512m"},
+        {"name": "data3", "vg": "data", "size": "1m"},
+    ]
+    with pytest.raises(AnsibleFilterError, match="Not enough free space .* to create LV 'data3'"):
+        validate_volumes(volumes, lvm_info())
+
+def test_relative_size_uses_remaining_space():
+    volumes = [
+        {"name": "data1", "vg": "data", "size": "768m"},
+        {"name": "data2", "vg": "data", "size": "100%FREE"},
+        {"name": "data3", "vg": "data", "size": "1m"},
+    ]
+    with pytest.raises(AnsibleFilterError, match="LV 'data3'"):
+        validate_volumes(volumes, lvm_info())
+
+    assert [p["action"] for p in validate_volumes(volumes[:2], lvm_info())] == ["create", "create"]
+
+def test_looped_dev_info_results():
+    volumes = [{"name": "data1", "vg": "data", "size": "1g", "filesystem": "xfs"}]
+    dev_infos = {"results": [
+        {"item": volumes[0], "ansible_loop_var": "item", "is_exists": True, "filetype": "b", "blkid": {}},
+    ]}
+    result = validate_volumes(volumes, lvm_info(lvs=EXISTING), dev_infos)
+    assert result[0]["action"] == "format"
+
+def test_missing_device_info_for_existing_volume():
+    volumes = [{"name": "data1", "vg": "data", "size": "1g"}]
+    with pytest.raises(AnsibleFilterError, match="No device information found"):
+        validate_volumes(volumes, lvm_info(lvs=EXISTING))
+
+def test_duplicate_volume():
+    volumes = [
+        {"name": "data1", "vg": "data", "size": "1m"},
+        {"name": "data1", "vg": "data", "size": "1m"},
+    ]
+    with pytest.raises(AnsibleFilterError, match="Duplicate LV name"):
+        validate_volumes(volumes, lvm_info())
+
+def test_dev_probe_result():
+    volumes = [{"name": "data1", "vg": "data", "size": "1g", "filesystem": "xfs"}]
+    dev_infos = {"changed": False, "devices": {
+        "/dev/data/data1": {"is_exists": True, "filetype": "b", "blkid": {"type": "xfs"}},
+    }}
+    result = validate_volumes(volumes, lvm_info(lvs=EXISTING), dev_infos)
+    assert result[0]["action"] == "skip"
+
+def striped_lvm_info(pv_free=("512.00m", "512.00m", "128.00m"), lvs=None, segs=None):
+    info = lvm_info(vg_free="1152.00m", lvs=lvs)
+    info["vg"][0].update(vg_extent_size="4.00m", pv_count=str(len(pv_free)))
+    info["pv"] = [
+        {"pv_name": f"/dev/nvme{i}n1p1", "vg_name": "data", "pv_free": free} for i, free in enumerate(pv_free)
+    ]
+    info["seg"] = segs or []
+    return info
+
+def test_striped_volume_needs_free_space_on_each_pv():
+    volumes = [{"name": "fast", "vg": "data", "size": "1g", "stripes": 2, "stripe_size": "64k"}]
+    assert validate_volumes(volumes, striped_lvm_info())[0]["action"] == "create"
+
+    volumes = [{"name": "fast", "vg": "data", "size": "1g", "stripes": 3}]
+    with pytest.raises(AnsibleFilterError, match="2 of 3 PVs have 344.00 MiB free"):
+        validate_volumes(volumes, striped_lvm_info())
+
+def test_striped_volumes_share_pv_free_space():
+    volumes = [
+        {"name": "fast1", "vg": "data", "size": "512m", "stripes": 2},
+        {"name": "fast2", "vg": "data", "size": "520m", "stripes": 2},
+    ]
+    # the VG has 640m left, but only 256m on each of the PVs fast1 was striped over
+    with pytest.raises(AnsibleFilterError, match="LV 'fast2' with size 520m and 2 stripes: 0 of 3 PVs"):
+        validate_volumes(volumes, striped_lvm_info())
+
+    # '100%FREE' is an upper limit: two stripes of the second largest free space
+    volumes[1]["size"] = "100%FREE"
+    assert [p["action"] for p in validate_volumes(volumes, striped_lvm_info())] == ["create", "create"]
+
+def test_striped_volume_without_pv_free():
+    info = striped_lvm_info()
+    info["pv"] = []
+    assert validate_volumes([{"name": "fast", "vg": "data", "size": "1g", "stripes": 3}], info)[0]["action"] == "create"
+    with pytest.raises(AnsibleFilterError, match=r"Not enough physical volumes \(3\)"):
+        validate_volumes([{"name": "fast", "vg": "data", "size": "1g", "stripes": 4}], info)
+
+def test_invalid_stripes():
+    volumes = [
+        {"name": "a", "vg": "data", "size": "1g", "stripes": 0},
+        {"name": "b", "vg": "data", "size": "1g", "stripes": 2, "stripe_size": "96k"},
+        {"name": "c", "vg": "data", "size": "1g", "stripe_size": "64k"},
+        {"name": "d", "vg": "data", "size": "1g", "stripes": 2, "stripe_size": "64"},
+    ]
+    with pytest.raises(AnsibleFilterError) as e:
+        validate_volumes(volumes, striped_lvm_info())
+    message = str(e.value)
+    assert "'stripes' must be a positive integer in logical volume #1" in message
+    assert "power of 2" in message
+    assert "requires 'stripes' greater than 1 in logical volume #3" in message
+    assert "unit suffix" in message
+
+def test_existing_volume_layout_mismatch():
+    dev_infos = {"/dev/data/data1": {"is_exists": True, "filetype": "b", "blkid": {}}}
+    segs = [{"lv_name": "data1", "vg_name": "data", "segtype": "striped", "stripes": "2", "stripe_size": "0.06m",
+             "seg_start": "0m"}]
+    info = striped_lvm_info(lvs=EXISTING, segs=segs)
+
+    volumes = [{"name": "data1", "vg": "data", "size": "1g", "stripes": 2, "stripe_size": "64k"}]
+    assert validate_volumes(volumes, info, dev_infos) == [{"name": "data1", "path": "/dev/data/data1", "action": "skip"}]
+
+    volumes = [{"name": "data1", "vg": "data", "size": "1g", "stripes": 2, "stripe_size": "128k"}]
+    assert "stripe size 0.06m" in validate_volumes(volumes, info, dev_infos)[0]["layout_mismatch"]
+
+    volumes = [{"name": "data1", "vg": "data", "size": "1g", "stripes": 4}]
+    plan = validate_volumes(volumes, info, dev_infos)[0]
+    assert plan["action"] == "skip"
+    assert plan["layout_mismatch"] == "LV /dev/data/data1 has 2 stripe(s) in segment at 0m, expected 4"
+
+    # volumes without stripes keep whatever layout they have
+    assert "layout_mismatch" not in validate_volumes([{"name": "data1", "vg": "data", "size": "1g"}], info, dev_infos)[0]
@@ -0,0 +1,42 @@
+import pytest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.filter.validate_volumes_input import validate_volumes_input
+
+def test_valid_volumes():
+    volumes = [
+        {'name': 'data1', 'vg': 'data', 'size': '100g'},
+        {'name': 'data2', 'vg': 'data', 'size': '200g', 'filesystem': 'xfs', 'mountpoint': '/mnt/data2'},
+    ]
+    assert validate_volumes_input(volumes) is True
+
+def test_not_a_list():
+    with pytest.raises(AnsibleFilterError, match="Expected 'volumes' to be a list."):
+        validate_volumes_input({'name': 'data1'})
+
+def test_single_error_keeps_message():
+    with pytest.raises(AnsibleFilterError, match=r"^Duplicate LV name detected: 'data1'$"):
+        validate_volumes_input([
+            {'name': 'data1', 'vg': 'data', 'size': '100g'},
+            {'name': 'data1', 'vg': 'data', 'size': '200g'},
+        ])
+
+def test_all_errors_reported_at_once():
+    volumes = [
+        {'name': 'data1', 'vg': 'data'},
+        {'name': 'data2', 'vg': 'data', 'size': '1g', 'filesystem': 'ntfs', 'mountpoint': 'mnt'},
+        'data3',
+        {'name': 'data1', 'vg': 'data', 'size': '1g'},
+        {'name': 'data4', 'vg': 'other', 'size': '1g'},
+    ]
+    with pytest.raises(AnsibleFilterError) as exc:
+        validate_volumes_input(volumes)
+
+    message = exc.value.message
+    assert message.startswith("Found 5 errors in 'volumes':")
+    assert "Missing 'size' (and 'lv_size') field in logical volume #1." in message
+    assert "Unsupported filesystem 'ntfs' in volume 'data2'" in message
+    assert "Volume 'data2': 'mountpoint' must be an absolute path." in message
+    assert "Volume entry must be a dictionary for logical volume #3. Found: data3" in message
+    # the first 'data1' is invalid, so the second one is not a duplicate
+    assert "Duplicate LV name" not in message
+    assert "within single group" in message
@@ -0,0 +1,87 @@
+import threading
+import time
+import pytest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.dag import (
+    DagError,
+    Operation,
+    critical_path,
+    run_operations,
+)
+
+class Recorder:
+    def __init__(self):
+        self.order = []
+        self.running = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def op(self, name, group=None, delay=0.0, fail=False):
+        def run():
+            with self.lock:
+                self.order.append(name)
+                self.running[group] = self.running.get(group, 0) + 1
+                self.peak[group] = max(self.peak.get(group, 0), self.running[group])
+            time.sleep(delay)
+            with self.lock:
+                self.running[group] -= 1
+            if fail:
+                raise RuntimeError(f"{name} failed")
+            return {"changed": True}
+        return run
+
+def test_longest_chain_first():
+    rec = Recorder()
+    ops = [
+        Operation("mkfs:small", rec.op("mkfs:small"), cost=10),
+        Operation("lvcreate:big", rec.op("lvcreate:big")),
+        Operation("mkfs:big", rec.op("mkfs:big"), deps=["lvcreate:big"], cost=1000),
+        Operation("mkdir", rec.op("mkdir")),
+    ]
+    assert critical_path(ops) == {"mkfs:small": 10, "lvcreate:big": 1001, "mkfs:big": 1000, "mkdir": 1}
+
+    results = run_operations(ops, max_workers=1)
+
+    assert rec.order == ["lvcreate:big", "mkfs:big", "mkfs:small", "mkdir"]
+    assert list(results) == ["mkfs:small", "lvcreate:big", "mkfs:big", "mkdir"]
+    assert all(r["status"] == "ok" for r in results.values())
+
+def test_lock_serializes_within_pool():
+    rec = Recorder()
+    ops = [Operation(f"lvm:{n}", rec.op(f"lvm:{n}", "lvm", 0.02), lock="lvm") for n in range(4)]
+    ops += [Operation(f"mkfs:{n}", rec.op(f"mkfs:{n}", "mkfs", 0.02)) for n in range(4)]
+
+    results = run_operations(ops, max_workers=4)
+
+    assert rec.peak["lvm"] == 1
+    assert rec.peak["mkfs"] > 1
+    assert all(r["status"] == "ok" for r in results.values())
+
+def test_failure_skips_dependent_subtree_only():
+    rec = Recorder()
+    ops = [
+        Operation("settle", rec.op("settle")),
+        Operation("lvcreate:a", rec.op("lvcreate:a", fail=True), deps=["settle"], lock="lvm"),
+        Operation("mkfs:a", rec.op("mkfs:a"), deps=["lvcreate:a"]),
+        Operation("mount:a", rec.op("mount:a"), deps=["mkfs:a", "mkdir:a"]),
+        Operation("mkdir:a", rec.op("mkdir:a")),
+        Operation("lvcreate:b", rec.op("lvcreate:b"), deps=["settle"], lock="lvm"),
+        Operation("mkfs:b", rec.op("mkfs:b"), deps=["lvcreate:b"]),
+    ]
+
+    results = run_operations(ops, max_workers=2)
+
+    assert results["lvcreate:a"] == {"status": "failed", "error": "lvcreate:a failed", "elapsed": results["lvcreate:a"]["elapsed"]}
+    assert results["mkfs:a"] == {"status": "skipped", "blocked_by": "lvcreate:a"}
+    assert results["mount:a"]["status"] == "skipped"
+    assert {name for name, r in results.items() if r["status"] == "ok"} == {"settle", "mkdir:a", "lvcreate:b", "mkfs:b"}
+    assert "mkfs:a" not in rec.order
+
+@pytest.mark.parametrize("ops, message", [
+    ([Operation("a", None), Operation("a", None)], "Duplicate operation 'a'"),
+    ([Operation("a", None, deps=["b"])], "unknown operation 'b'"),
+    ([Operation("a", None, deps=["b"]), Operation("b", None, deps=["a"]), Operation("c", None)],
+     "circular dependencies: a, b"),
+])
+def test_invalid_graph(ops, message):
+    with pytest.raises(DagError, match=message):
+        run_operations(ops)
@@ -0,0 +1,69 @@
+import os
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.dev_probe import (
+    dev_info,
+    parse_blkid_export,
+    parse_mountinfo,
+)
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import Device
+
+MOUNTINFO = (
+    "22 1 253:0 / / rw,relatime shared:1 - xfs /dev/mapper/rl-root rw,attr2\n"
+    "98 22 253:2 / /mnt/data\\0401 rw,relatime shared:50 - xfs /dev/mapper/data-data1 rw\n"
+    "99 22 253:2 / /srv/data1 rw,relatime - xfs /dev/mapper/data-data1 rw\n"
+    "25 22 0:5 / /dev rw,nosuid shared:2 - devtmpfs devtmpfs rw\n"
+)
+
+BLKID = (
+    "DEVNAME=/dev/sda6\n"
+    "UUID=Zl3b3H-1sBp-ElvF\n"
+    "VERSION=LVM2 001\n"
+    "TYPE=LVM2_member\n"
+    "USAGE=raid\n"
+    "\n"
+    "DEVNAME=/dev/data/data1\n"
+    "UUID=66310f17-f78d-421e-ae23-154fd646d32f\n"
+    "BLOCK_SIZE=4096\n"
+    "TYPE=xfs\n"
+)
+
+def test_parse_mountinfo():
+    mounts = parse_mountinfo(MOUNTINFO)
+    assert [m["target"] for m in mounts[(253, 2)]] == ["/mnt/data 1", "/srv/data1"]
+    assert mounts[(253, 2)][0]["source"] == "/dev/mapper/data-data1"
+    assert mounts[(253, 0)][0]["fstype"] == "xfs"
+
+def test_parse_blkid_export():
+    blkid = parse_blkid_export(BLKID)
+    assert blkid["/dev/sda6"]["type"] == "LVM2_member"
+    assert blkid["/dev/data/data1"] == {
+        "dev_name": "/dev/data/data1",
+        "uuid": "66310f17-f78d-421e-ae23-154fd646d32f",
+        "block_size": "4096",
+        "type": "xfs",
+    }
+
+def test_dev_info_missing_path(tmp_path):
+    info = dev_info(str(tmp_path / "missing"), {}, {})
+    assert info == {"is_exists": False, "stat": {}}
+    assert not Device.from_dev_info(str(tmp_path / "missing"), info).is_exists
+
+def test_dev_info_regular_file(tmp_path):
+    path = tmp_path / "file"
+    path.write_text("")
+    info = dev_info(str(path), {}, {})
+    assert info["is_exists"] is True
+    assert info["filetype"] == "f"
+    assert info["stat"]["ino"] == os.stat(path).st_ino
+
+def test_dev_info_map_devices():
+    infos = {"devices": {
+        "/dev/sda6": {"is_exists": True, "filetype": "b", "blkid": {"type": "LVM2_member"}},
+        "/dev/mapper/data-data1": {"is_exists": True, "filetype": "b", "mount": [{"target": "/mnt/data1"}]},
+    }}
+    devices = Device.from_dev_info_map(infos, ["/dev/sda6", "/dev/sdb6"])
+    assert devices["/dev/sda6"].is_lvm2_member()
+    assert not devices["/dev/sdb6"].is_exists
+
+    dev = Device.from_dev_info_lookup("/dev/data/data1", infos, ("/dev/mapper/data-data1",))
+    assert dev.path == "/dev/mapper/data-data1"
+    assert dev.validate_mount("/mnt/data1")
@@ -0,0 +1,30 @@
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.fstab import fstab_entry, update_fstab
+
+FSTAB = """# /etc/fstab
+UUID=1234 / xfs defaults 0 0
+/dev/data/data1 /mnt/data1 ext4 defaults 0 0
+"""
+
+def test_append_and_replace():
+    content, changed = update_fstab(FSTAB, [
+        fstab_entry("/dev/data/data1", "/mnt/data1", "xfs"),
+        fstab_entry("/dev/data/data2", "/mnt/data 2", "xfs"),
+    ])
+
+    assert changed == ["/mnt/data1", "/mnt/data 2"]
+    assert content == (
+        "# /etc/fstab\n"
+        "UUID=1234 / xfs defaults 0 0\n"
+        "/dev/data/data1 /mnt/data1 xfs defaults 0 0\n"
+        "/dev/data/data2 /mnt/data\\0402 xfs defaults 0 0\n"
+    )
+
+def test_unchanged():
+    entries = [fstab_entry("/dev/data/data1", "/mnt/data1", "ext4")]
+    content, changed = update_fstab(FSTAB, entries)
+
+    assert changed == []
+    assert content == FSTAB
+
+def test_empty_file():
+    assert update_fstab("", []) == ("", [])
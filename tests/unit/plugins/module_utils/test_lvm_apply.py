@@ -0,0 +1,158 @@
+import json
+import shlex
+import pytest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_apply import (
+    REPORT_OPTIONS,
+    LvmError,
+    batch_error,
+    batch_sessions,
+    lvcreate_args,
+    parse_command_logs,
+    pv_commands,
+    run_lvm_batch,
+    shell_script,
+)
+
+def test_new_volume_group():
+    plan = [{"path": "/dev/sdb1", "action": "create"}, {"path": "/dev/sdc1", "action": "add"}]
+    assert pv_commands("data", plan, vg_exists=False) == [
+        ["pvcreate", "/dev/sdb1"],
+        ["vgcreate", "data", "/dev/sdb1", "/dev/sdc1"],
+    ]
+
+def test_extend_existing_volume_group():
+    plan = [
+        {"path": "/dev/sdb1", "action": "skip"},
+        {"path": "/dev/sdc1", "action": "add"},
+        {"path": "/dev/sdd1", "action": "create"},
+    ]
+    assert pv_commands("data", plan, vg_exists=True) == [
+        ["pvcreate", "/dev/sdd1"],
+        ["vgextend", "data", "/dev/sdc1", "/dev/sdd1"],
+    ]
+
+def test_converged_volume_group():
+    assert pv_commands("data", [{"path": "/dev/sdb1", "action": "skip"}], vg_exists=True) == []
+
+def test_lvcreate_size_option():
+    assert lvcreate_args({"name": "data1", "vg": "data", "size": "10g"}) == [
+        "lvcreate", "--yes", "-n", "data1", "-L", "10g", "data",
+    ]
+    assert lvcreate_args({"name": "data2", "vg": "data", "size": "50%VG"})[4:6] == ["-l", "50%VG"]
+
+
+def command_log(ok, message=None):
+    log = []
+    if message:
+        log.append({"log_type": "error" if not ok else "print", "log_message": message, "log_ret_code": "0"})
+    log.append({"log_type": "status", "log_object_type": "cmd", "log_message": "", "log_ret_code": "1" if ok else "5"})
+    return json.dumps({"log": log}, indent=2)
+
+class ShellModule:
+    """
+    Emulates the lvm shell: one JSON command log per script line, failing the lines containing `failing`.
+    """
+    def __init__(self, failing=None, shell=True):
+        self.failing = failing
+        self.shell = shell
+        self.calls = []
+        self.warnings = []
+
+    def warn(self, msg):
+        self.warnings.append(msg)
+
+    def run_command(self, cmd, data=None, environ_update=None):
+        self.calls.append((cmd, data))
+        if data is None:
+            if self.failing and self.failing in cmd:
+                return 5, "", f"  Failed: {self.failing}"
+            return 0, "", ""
+        if not self.shell:
+            return 1, "", "  Unrecognised command: lvm shell"
+        out = []
+        for line in data.splitlines():
+            if line != "exit":
+                ok = not (self.failing and self.failing in shlex.split(line))
+                out.append("lvm> " + command_log(ok, None if ok else f"Failed: {self.failing}"))
+        return 0, "\n".join(out), ""
+
+COMMANDS = [["pvcreate", "/dev/sdb1"], ["vgcreate", "data", "/dev/sdb1"]]
+
+def test_shell_script():
+    lines = shell_script([["lvcreate", "-n", "my lv", "data"]]).splitlines()
+    assert shlex.split(lines[0]) == ["lvcreate"] + REPORT_OPTIONS + ["-n", "my lv", "data"]
+    assert lines[1] == "exit"
+
+def test_parse_command_logs_skips_prompts():
+    output = "lvm> " + command_log(True, "Physical volume created.") + "\nlvm> " + command_log(False, "no space") + "\nlvm> "
+    assert parse_command_logs(output) == [(True, []), (False, ["no space"])]
+
+LVCREATES = [
+    ["lvcreate", "--yes", "-n", "data1", "-L", "1g", "data"],
+    ["lvcreate", "--yes", "-n", "data2", "-L", "2g", "data"],
+    ["lvcreate", "--yes", "-n", "data3", "-l", "100%FREE", "data"],
+]
+
+def test_batch_sessions():
+    assert batch_sessions(COMMANDS + LVCREATES + LVCREATES[:1]) == [
+        COMMANDS[:1], COMMANDS[1:], LVCREATES[:2], LVCREATES[2:], LVCREATES[:1],
+    ]
+
+def test_batch_runs_one_shell_session():
+    module = ShellModule()
+    results = run_lvm_batch(module, "/usr/sbin/lvm", LVCREATES[:2])
+
+    assert [call[0] for call in module.calls] == [["/usr/sbin/lvm"]]
+    assert [r["ok"] for r in results] == [True, True]
+    assert batch_error(results) is None
+
+def test_batch_stops_at_first_failure():
+    module = ShellModule(failing="vgcreate")
+    results = run_lvm_batch(module, "/usr/sbin/lvm", COMMANDS + LVCREATES)
+
+    assert [r["ok"] for r in results] == [True, False, False, False, False]
+    assert results[1]["messages"] == ["lvm vgcreate failed: Failed: vgcreate"]
+    assert [r.get("skipped", False) for r in results] == [False, False, True, True, True]
+    # no lvcreate reached lvm
+    assert not any("lvcreate" in (data or " ".join(cmd)) for cmd, data in module.calls)
+    assert batch_error(results).msg == (
+        "1 of 5 lvm commands failed: vgcreate data /dev/sdb1: lvm vgcreate failed: Failed: vgcreate (3 not run)"
+    )
+
+def test_batch_failed_session_stops_relative_sizes():
+    module = ShellModule(failing="data1")
+    results = run_lvm_batch(module, "/usr/sbin/lvm", LVCREATES)
+
+    assert len(module.calls) == 1
+    assert [r["ok"] for r in results] == [False, True, False]
+    assert results[2]["skipped"]
+
+def test_batch_without_shell_runs_commands_one_by_one():
+    module = ShellModule(failing="pvcreate", shell=False)
+    results = run_lvm_batch(module, "/usr/sbin/lvm", COMMANDS)
+
+    assert [call[0] for call in module.calls] == [["/usr/sbin/lvm"] + COMMANDS[0]]
+    assert [r["ok"] for r in results] == [False, False]
+    assert results[1]["skipped"]
+
+def test_batch_shell_not_available():
+    module = ShellModule(failing="data2", shell=False)
+    results = run_lvm_batch(module, "/usr/sbin/lvm", LVCREATES)
+
+    assert module.warnings
+    assert [call[0] for call in module.calls[1:]] == [["/usr/sbin/lvm"] + c for c in LVCREATES[:2]]
+    assert [r["ok"] for r in results] == [True, False, False]
+
+def test_batch_missing_logs():
+    class SilentModule(ShellModule):
+        def run_command(self, cmd, data=None, environ_update=None):
+            return 0, "lvm> ", ""
+
+    with pytest.raises(LvmError, match="command logs"):
+        run_lvm_batch(SilentModule(), "/usr/sbin/lvm", LVCREATES)
+
+def test_lvcreate_stripes():
+    assert lvcreate_args({"name": "fast", "vg": "data", "size": "1t", "stripes": 4, "stripe_size": "1m"}) == [
+        "lvcreate", "--yes", "-n", "fast", "-L", "1t", "-i", "4", "-I", "1024k", "data",
+    ]
+    assert lvcreate_args({"name": "data1", "vg": "data", "size": "10g", "stripes": 1})[-3:] == ["-L", "10g", "data"]
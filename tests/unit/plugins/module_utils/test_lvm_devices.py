@@ -0,0 +1,85 @@
+import pytest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_devices import (
+    BLOCK_BEGIN,
+    block_devices,
+    devices_file_commands,
+    global_filter,
+    parse_devices_file,
+    parse_lvmconfig,
+    scanned_devices,
+    update_config_block,
+)
+
+DEVICES_FILE = """\
+# LVM uses devices listed in this file.
+# Created by LVM command lvmdevices pid 1234 at Mon Jan  6 10:00:00 2025
+VERSION=1.1.2
+IDTYPE=sys_wwid IDNAME=naa.5000c500a1b2c3d4 DEVNAME=/dev/sda3 PVID=Abc123 PART=3
+IDTYPE=devname IDNAME=/dev/sdb1 DEVNAME=/dev/sdb1 PVID=Def456 PART=1
+"""
+
+def test_parse_devices_file():
+    entries = parse_devices_file(DEVICES_FILE)
+    assert [e["DEVNAME"] for e in entries] == ["/dev/sda3", "/dev/sdb1"]
+    assert entries[0]["IDNAME"] == "naa.5000c500a1b2c3d4"
+
+def test_devices_file_commands_are_idempotent():
+    entries = parse_devices_file(DEVICES_FILE)
+    assert devices_file_commands(entries, ["/dev/sda3", "/dev/sdb1"]) == []
+    assert devices_file_commands(entries, ["/dev/sdb1", "/dev/sdc1", "/dev/sdc1"]) == [
+        ["lvmdevices", "--yes", "--adddev", "/dev/sdc1"],
+    ]
+    assert devices_file_commands(entries, ["/dev/sdb1"], exclusive=True, devicesfile="test.devices") == [
+        ["lvmdevices", "--yes", "--devicesfile", "test.devices", "--deldev", "/dev/sda3"],
+    ]
+    assert devices_file_commands(None, ["/dev/sdb1"]) == [["lvmdevices", "--yes", "--adddev", "/dev/sdb1"]]
+
+def test_global_filter_accepts_exact_paths():
+    patterns = global_filter(["/dev/sdb1", "/dev/mapper/mpath.a"])
+    assert patterns == ["a|^/dev/sdb1$|", "a|^/dev/mapper/mpath[.]a$|", "r|.*|"]
+    assert scanned_devices(["/dev/sdb1", "/dev/sdb10", "/dev/mapper/mpathxa", "/dev/mapper/mpath.a"], {
+        "global_filter": patterns,
+    }) == ["/dev/sdb1", "/dev/mapper/mpath.a"]
+
+    with pytest.raises(ValueError, match="can not be used"):
+        global_filter(['/dev/disk/by-id/a"b'])
+
+def test_update_config_block():
+    original = "local {\n\tsystem_id = \"host1\"\n}"
+    content, changed = update_config_block(original, global_filter(["/dev/sdb1"]))
+    assert changed
+    assert content.startswith(original + "\n" + BLOCK_BEGIN)
+    assert 'global_filter = [ "a|^/dev/sdb1$|", "r|.*|" ]' in content
+
+    assert update_config_block(content, global_filter(["/dev/sdb1"])) == (content, False)
+
+    updated, changed = update_config_block(content + "# trailing\n", global_filter(["/dev/sdc1"]))
+    assert changed
+    assert updated.count(BLOCK_BEGIN) == 1
+    assert "/dev/sdb1" not in updated
+    assert updated.endswith("# trailing\n")
+
+def test_parse_lvmconfig():
+    output = 'use_devicesfile=1\ndevicesfile="system.devices"\nglobal_filter=["a|^/dev/sdb1$|","r|.*|"]\n#filter=["a|.*|"]\n'
+    assert parse_lvmconfig(output) == {
+        "use_devicesfile": 1,
+        "devicesfile": "system.devices",
+        "global_filter": ["a|^/dev/sdb1$|", "r|.*|"],
+    }
+
+def test_scanned_devices_with_devices_file():
+    devices = ["/dev/sda", "/dev/sda3", "/dev/sdb1"]
+    config = {"use_devicesfile": True, "devices": ["/dev/sda3", "/dev/sdb1"], "global_filter": ["r|^/dev/sdb|"]}
+    assert scanned_devices(devices, config) == ["/dev/sda3"]
+    # a disabled or missing devices file does not restrict scanning
+    assert scanned_devices(devices, dict(config, use_devicesfile=False, global_filter=[])) == devices
+    assert scanned_devices(devices, {"use_devicesfile": True, "devices": None}) == devices
+
+def test_block_devices(tmp_path):
+    (tmp_path / "sda").mkdir()
+    (tmp_path / "cciss!c0d0").mkdir()
+    (tmp_path / "dm-0" / "dm").mkdir(parents=True)
+    (tmp_path / "dm-0" / "dm" / "name").write_text("data-data1\n")
+
+    assert block_devices(str(tmp_path)) == ["/dev/cciss/c0d0", "/dev/mapper/data-data1", "/dev/sda"]
+    assert block_devices(str(tmp_path / "missing")) == []
@@ -0,0 +1,77 @@
+import json
+import pytest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_report import fullreport_command, parse_fullreport
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import VolumeGroup
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.validation import PlanError
+
+FULLREPORT = json.dumps({
+    "report": [
+        {
+            "vg": [{"vg_name": "data", "vg_size": "1024.00m", "vg_free": "512.00m"}],
+            "pv": [
+                {"pv_name": "/dev/sda6", "vg_name": "data", "pv_free": "256.00m"},
+                {"pv_name": "/dev/sdb6", "vg_name": "data", "pv_free": "256.00m"},
+            ],
+            "lv": [{"lv_name": "data1", "vg_name": "data", "lv_size": "512.00m"}],
+            "pvseg": [{"pv_name": "/dev/sda6", "pvseg_start": "0", "pvseg_size": "64"}],
+            "seg": [{"lv_name": "data1", "vg_name": "data", "segtype": "striped", "stripes": "2"}],
+        },
+        {
+            "vg": [{"vg_name": "other", "vg_size": "512.00m", "vg_free": "0m"}],
+            "pv": [{"pv_name": "/dev/sdc6", "vg_name": "other"}],
+            "lv": [{"lv_name": "data1", "vg_name": "other", "lv_size": "512.00m"}],
+            "pvseg": [],
+            "seg": [],
+        },
+        {
+            "vg": [],
+            "pv": [{"pv_name": "/dev/sdd6", "vg_name": ""}],
+            "lv": [],
+            "pvseg": [],
+            "seg": [],
+        },
+    ]
+})
+
+def test_fullreport_command():
+    cmd = fullreport_command("/usr/sbin/lvm", ["data"])
+    assert cmd[:6] == ["/usr/sbin/lvm", "fullreport", "--reportformat", "json", "--units", "m"]
+    assert cmd[-1] == "data"
+    assert cmd.count("--configreport") == 5
+
+def test_parse_all_groups():
+    result = parse_fullreport(FULLREPORT)
+    assert [vg["vg_name"] for vg in result["vg"]] == ["data", "other"]
+    assert [pv["pv_name"] for pv in result["pv"]] == ["/dev/sda6", "/dev/sdb6", "/dev/sdc6", "/dev/sdd6"]
+    assert [(lv["vg_name"], lv["lv_name"]) for lv in result["lv"]] == [("data", "data1"), ("other", "data1")]
+    assert result["seg"][0]["stripes"] == "2"
+
+def test_parse_filtered_groups():
+    result = parse_fullreport(FULLREPORT, vgs=["data"])
+    assert [vg["vg_name"] for vg in result["vg"]] == ["data"]
+    assert [(lv["vg_name"], lv["lv_name"]) for lv in result["lv"]] == [("data", "data1")]
+    assert [pv["pv_name"] for pv in result["pv"]] == ["/dev/sda6", "/dev/sdb6", "/dev/sdc6", "/dev/sdd6"]
+
+    result = parse_fullreport(FULLREPORT, vgs=["data"], include_orphans=False)
+    assert [pv["pv_name"] for pv in result["pv"]] == ["/dev/sda6", "/dev/sdb6", "/dev/sdc6"]
+
+def test_filtered_report_keeps_pvs_of_other_groups():
+    vg = VolumeGroup.from_lvm_info("data", parse_fullreport(FULLREPORT, vgs=["data"]))
+    assert vg.plan_pvs(["/dev/sda6", "/dev/sdd6"]) == [
+        {"path": "/dev/sda6", "action": "skip"},
+        {"path": "/dev/sdd6", "action": "add"},
+    ]
+    with pytest.raises(PlanError, match="already part of another volume group: other"):
+        vg.plan_pvs(["/dev/sdc6"])
+
+def test_result_feeds_volume_group():
+    vg = VolumeGroup.from_lvm_info("data", parse_fullreport(FULLREPORT))
+    assert vg.is_exists
+    assert sorted(vg.pvs) == ["/dev/sda6", "/dev/sdb6"]
+    assert list(vg.lvs) == ["data1"]
+    assert vg.vg_free.mib == 512
+
+@pytest.mark.parametrize("output", ["not json", "{}", "[]"])
+def test_parse_invalid(output):
+    with pytest.raises(ValueError):
+        parse_fullreport(output)
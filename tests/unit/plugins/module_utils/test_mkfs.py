@@ -0,0 +1,36 @@
+import pytest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.mkfs import filesystem_jobs, mkfs_command
+
+VOLUMES = [
+    {"name": "data1", "vg": "data", "size": "1g", "filesystem": "xfs"},
+    {"name": "data2", "vg": "data", "size": "1g", "filesystem": "ext4"},
+    {"name": "data3", "vg": "data", "size": "1g"},
+    {"name": "data4", "vg": "data", "size": "1g", "filesystem": "xfs"},
+]
+
+PLAN = [
+    {"name": "data1", "path": "/dev/data/data1", "action": "create"},
+    {"name": "data2", "path": "/dev/data/data2", "action": "format"},
+    {"name": "data3", "path": "/dev/data/data3", "action": "create"},
+    {"name": "data4", "path": "/dev/data/data4", "action": "skip"},
+]
+
+def test_jobs_for_create_and_format():
+    assert filesystem_jobs(VOLUMES, PLAN) == [
+        {"name": "data1", "path": "/dev/data/data1", "fstype": "xfs"},
+        {"name": "data2", "path": "/dev/data/data2", "fstype": "ext4"},
+    ]
+
+def test_mismatched_plan():
+    with pytest.raises(ValueError, match="4 volumes but 3 plans"):
+        filesystem_jobs(VOLUMES, PLAN[:3])
+    with pytest.raises(ValueError, match="does not match volume 'data1'"):
+        filesystem_jobs(VOLUMES[:2], PLAN[1:3])
+
+def test_unsupported_filesystem():
+    with pytest.raises(ValueError, match="Unsupported filesystem 'vfat'"):
+        filesystem_jobs([{"name": "data1", "filesystem": "vfat"}], PLAN[:1])
+
+def test_mkfs_command():
+    assert mkfs_command("/usr/sbin/mkfs.xfs", "/dev/data/data1") == ["/usr/sbin/mkfs.xfs", "/dev/data/data1"]
+    assert mkfs_command("/usr/sbin/mkfs.ext4", "/dev/data/data2") == ["/usr/sbin/mkfs.ext4", "-F", "/dev/data/data2"]
@@ -0,0 +1,51 @@
+import pytest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.parted_units import (
+    convert_to_bytes,
+    convert_to_mib,
+    normalize_unit,
+)
+
+@pytest.mark.parametrize("unit, expected", [
+    ("gb", "GB"),
+    ("GiB", "GiB"),
+    ("mib", "MiB"),
+    (" S ", "s"),
+    ("%", "%"),
+    ("FOOBYTES", None),
+    (None, None),
+])
+def test_normalize_unit(unit, expected):
+    assert normalize_unit(unit) == expected
+
+@pytest.mark.parametrize("size, unit, expected", [
+    ("100", "GB", 100 * 1000 ** 3),
+    (1, "KiB", 1024),
+    ("1.5TiB", None, 3 * 1024 ** 4 // 2),
+    ("500GB", "MiB", 500 * 1000 ** 3),
+    ("2048s", None, 2048 * 512),
+    (2048, "s", 2048 * 512),
+    ("1024.00", "mib", 1024 * 1024 ** 2),
+])
+def test_convert_to_bytes(size, unit, expected):
+    assert convert_to_bytes(size, unit) == expected
+
+def test_convert_sectors_with_sector_size():
+    assert convert_to_bytes("8s", None, sector_size=4096) == 32768
+
+def test_convert_percent():
+    assert convert_to_bytes("50%", None) is None
+    assert convert_to_bytes("50%", None, total=4096) == 2048
+
+def test_convert_to_mib():
+    assert convert_to_mib("1", "GiB") == 1024.0
+    assert convert_to_mib("100", "GB") == 95367.431640625
+
+@pytest.mark.parametrize("size, unit", [
+    ("100", "FOOBYTES"),
+    ("abc", "GB"),
+    ("GB", None),
+    (["100"], "GB"),
+    (True, "GB"),
+])
+def test_convert_invalid(size, unit):
+    assert convert_to_mib(size, unit) is None
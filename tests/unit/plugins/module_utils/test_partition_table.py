@@ -0,0 +1,128 @@
+import os
+import struct
+import uuid
+import zlib
+import pytest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.partition_table import (
+    GPT_ENTRY,
+    GPT_HEADER,
+    parted_info,
+    read_partition_table,
+)
+from ansible_collections.aursu.lvm_setup.plugins.filter.validate_partitions_system import validate_partitions_system
+
+SECTOR = 512
+TOTAL = 8 * 1024 * 1024 // SECTOR  # 8 MiB image
+LVM = "E6D6D379-F507-44C2-A23C-238F2A3DF928"
+
+def mbr(entries):
+    data = bytearray(SECTOR)
+    for idx, (status, part_type, first, count) in enumerate(entries):
+        struct.pack_into("<B3sB3sII", data, 446 + idx * 16, status, b"\0" * 3, part_type, b"\0" * 3, first, count)
+    data[510:512] = b"\x55\xaa"
+    return bytes(data)
+
+def gpt_header(current, backup, entries_lba, entries):
+    header = bytearray(GPT_HEADER.pack(
+        b"EFI PART", 0x10000, GPT_HEADER.size, 0, 0, current, backup, 34, TOTAL - 34,
+        uuid.uuid4().bytes_le, entries_lba, 128, 128, zlib.crc32(entries)
+    ))
+    struct.pack_into("<I", header, 16, zlib.crc32(header))
+    return bytes(header)
+
+def gpt_entries(parts):
+    data = bytearray(128 * 128)
+    for num, first, last, name in parts:
+        GPT_ENTRY.pack_into(data, (num - 1) * 128, uuid.UUID(LVM).bytes_le, uuid.uuid4().bytes_le,
+                            first, last, 0, name.encode("utf-16-le"))
+    return bytes(data)
+
+def write_image(path, chunks):
+    with open(path, "wb") as f:
+        f.truncate(TOTAL * SECTOR)
+        for lba, data in chunks:
+            f.seek(lba * SECTOR)
+            f.write(data)
+    return path
+
+def read(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return read_partition_table(fd, SECTOR, TOTAL)
+    finally:
+        os.close(fd)
+
+def gpt_image(path, parts, corrupt_primary=False):
+    entries = gpt_entries(parts)
+    primary = gpt_header(1, TOTAL - 1, 2, entries)
+    if corrupt_primary:
+        primary = b"\0" * len(primary)
+    return write_image(path, [
+        (0, mbr([(0, 0xEE, 1, TOTAL - 1)])),
+        (1, primary),
+        (2, entries),
+        (TOTAL - 33, entries),
+        (TOTAL - 1, gpt_header(TOTAL - 1, 1, TOTAL - 33, entries)),
+    ])
+
+def test_read_gpt(tmp_path):
+    image = gpt_image(tmp_path / "disk.img", [(1, 2048, 4095, "data"), (3, 6144, 8191, "")])
+    table = read(image)
+
+    assert table["table"] == "gpt"
+    assert [(p["num"], p["first"], p["last"], p["name"], p["flags"]) for p in table["partitions"]] == [
+        (1, 2048, 4095, "data", ["lvm"]),
+        (3, 6144, 8191, "", ["lvm"]),
+    ]
+
+def test_read_gpt_backup_header(tmp_path):
+    image = gpt_image(tmp_path / "disk.img", [(2, 2048, 4095, "")], corrupt_primary=True)
+    table = read(image)
+
+    assert table["table"] == "gpt"
+    assert [p["num"] for p in table["partitions"]] == [2]
+
+def test_read_mbr_with_logical_partitions(tmp_path):
+    image = write_image(tmp_path / "disk.img", [
+        (0, mbr([(0x80, 0x83, 2048, 2048), (0, 0x05, 4096, 8192)])),
+        # first EBR: logical partition + link to the next EBR (relative to the extended partition)
+        (4096, mbr([(0, 0x8E, 2048, 1024), (0, 0x05, 4096, 4096)])),
+        (8192, mbr([(0, 0x83, 2048, 1024)])),
+    ])
+    table = read(image)
+
+    assert table["table"] == "msdos"
+    assert [(p["num"], p["first"], p["last"], p["flags"]) for p in table["partitions"]] == [
+        (1, 2048, 4095, ["boot"]),
+        (2, 4096, 12287, []),
+        (5, 6144, 7167, ["lvm"]),
+        (6, 10240, 11263, []),
+    ]
+
+def test_read_blank_disk(tmp_path):
+    image = write_image(tmp_path / "disk.img", [])
+    assert read(image) == {"table": "unknown", "partitions": []}
+
+@pytest.mark.parametrize("unit, begin, end, size", [
+    ("s", 2048, 4095, 2048),
+    ("MiB", 1, 2 - 1 / 1024 ** 2, 1),
+])
+def test_parted_info_units(unit, begin, end, size):
+    table = {"table": "gpt", "partitions": [{"num": 1, "first": 2048, "last": 4095, "name": "", "flags": ["lvm"]}]}
+    info = parted_info("/dev/sda", table, SECTOR, TOTAL, unit, {"physical_block": 4096})
+
+    assert info["disk"]["table"] == "gpt"
+    assert info["disk"]["unit"] == unit.lower()
+    assert info["disk"]["physical_block"] == 4096
+    part = info["partitions"][0]
+    assert (part["begin"], part["end"], part["size"]) == (begin, end, size)
+
+def test_parted_info_feeds_planner(tmp_path):
+    image = gpt_image(tmp_path / "disk.img", [(1, 2048, 4095, "")])
+    info = parted_info("/dev/sda", read(image), SECTOR, TOTAL)
+
+    plan = validate_partitions_system({"/dev/sda": info}, {"/dev/sda": [{"num": 1, "size": "1m"}, {"num": 2}]})
+
+    assert [p["action"] for p in plan["/dev/sda"]] == ["skip", "create"]
+    assert plan["/dev/sda"][0]["warning"] == ""
+    assert plan["/dev/sda"][1]["part_start"] == "4096s"
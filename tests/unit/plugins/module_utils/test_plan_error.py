@@ -0,0 +1,25 @@
+import importlib
+import sys
+import pytest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.module_utils import validation
+
+def test_controller_plan_error():
+    assert validation.PlanError is AnsibleFilterError
+
+def test_managed_node_plan_error(monkeypatch):
+    # modules only ship module_utils; ansible.errors is not importable on the managed node
+    monkeypatch.setitem(sys.modules, "ansible.errors", None)
+    try:
+        fallback = importlib.reload(validation)
+        assert fallback.PlanError is not AnsibleFilterError
+
+        errors = fallback.ValidationErrors("'volumes'")
+        errors.add("first")
+        errors.add("second")
+        with pytest.raises(fallback.PlanError) as e:
+            errors.raise_if_any()
+        assert e.value.message == "Found 2 errors in 'volumes':\n  - first\n  - second"
+    finally:
+        monkeypatch.undo()
+        importlib.reload(validation)
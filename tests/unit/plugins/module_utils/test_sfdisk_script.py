@@ -0,0 +1,58 @@
+import pytest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.sfdisk_script import (
+    build_script,
+    partition_node,
+    partition_number,
+    to_sectors,
+)
+
+GPT_LVM = "E6D6D379-F507-44C2-A23C-238F2A3DF928"
+
+@pytest.mark.parametrize("value, sector_size, expected", [
+    ("2048s", 512, 2048),
+    ("1MiB", 512, 2048),
+    ("1MiB", 4096, 256),
+    (1024, 512, 2097152),
+    ("100%", 512, None),
+])
+def test_to_sectors(value, sector_size, expected):
+    assert to_sectors(value, sector_size) == expected
+
+@pytest.mark.parametrize("value", ["50%", "1000B", "abc", None])
+def test_to_sectors_invalid(value):
+    with pytest.raises(ValueError):
+        to_sectors(value, 512)
+
+def test_partition_node_and_number():
+    assert partition_node("/dev/sda", 6) == "/dev/sda6"
+    assert partition_node("/dev/nvme0n1", 2) == "/dev/nvme0n1p2"
+    assert partition_number("/dev/nvme0n1p12") == 12
+    assert partition_number("/dev/sda") is None
+
+def test_build_script_appends_all_partitions():
+    plan = [
+        {"num": 6, "part_start": "2048s", "part_end": "4196351s"},
+        {"num": 7, "part_start": "4196352s", "part_end": "100%"},
+    ]
+    assert build_script("/dev/sda", plan, "gpt") == (
+        f"/dev/sda6 : start=2048, size=4194304, type={GPT_LVM}\n"
+        f"/dev/sda7 : start=4196352, type={GPT_LVM}\n"
+    )
+
+def test_build_script_new_msdos_table():
+    plan = [{"num": 1, "part_start": "2048s", "part_end": "2099199s"}]
+    assert build_script("/dev/vdb", plan, "msdos", new_table=True) == (
+        "label: dos\n"
+        "\n"
+        "/dev/vdb1 : start=2048, size=2097152, type=8e\n"
+    )
+
+@pytest.mark.parametrize("plan, label", [
+    ([{"num": 1, "part_start": "100%", "part_end": "100%"}], "gpt"),
+    ([{"num": 1, "part_start": "4096s", "part_end": "2048s"}], "gpt"),
+    ([{"num": "x", "part_start": "2048s", "part_end": "4095s"}], "gpt"),
+    ([{"num": 1, "part_start": "2048s", "part_end": "4095s"}], "mac"),
+])
+def test_build_script_invalid(plan, label):
+    with pytest.raises(ValueError):
+        build_script("/dev/sda", plan, label)
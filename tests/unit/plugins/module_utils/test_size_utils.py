@@ -1,6 +1,6 @@
 import pytest
 from ansible.errors import AnsibleFilterError
-from ansible_collections.aursu.lvm_setup.plugins.module_utils.size_utils import to_mib
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.size_utils import Size, to_mib
 
 def test_to_mib_with_valid_units():
     assert to_mib("512m") == 512.0
@@ -17,3 +17,59 @@ def test_to_mib_with_invalid_unit():
 def test_to_mib_with_invalid_type():
     with pytest.raises(AnsibleFilterError, match="Invalid type for size"):
         to_mib(["not", "a", "string"])
+
+@pytest.mark.parametrize("value, unit, expected", [
+    ("1.5TiB", "MiB", 3 * 2 ** 39),
+    ("500GB", "MiB", 500 * 10 ** 9),
+    ("2048s", "MiB", 2048 * 512),
+    ("400g", "MiB", 400 * 2 ** 30),
+    ("512m", "MiB", 512 * 2 ** 20),
+    (1024, "MiB", 2 ** 30),
+    (1024.5, "mib", 1024 * 2 ** 20 + 2 ** 19),
+    ("4096.00", "kib", 4 * 2 ** 20),
+])
+def test_size_parse(value, unit, expected):
+    assert Size.parse(value, unit).bytes == expected
+
+def test_size_parse_relative():
+    total = Size.parse("1g")
+    assert Size.parse("100%FREE", total=total) == total
+    assert Size.parse("50%", total=total) == Size.parse("512m")
+    assert Size.relative("25%vg") == (25, "VG")
+    assert Size.relative("25g") is None
+    with pytest.raises(ValueError, match="requires a total size"):
+        Size.parse("100%FREE")
+
+def test_size_parse_invalid():
+    with pytest.raises(ValueError, match="Unsupported or invalid size"):
+        Size.parse("100x")
+
+@pytest.mark.parametrize("value", ["-10g", "-10GiB", "-5", -5, "-2048s"])
+def test_size_parse_negative(value):
+    with pytest.raises(ValueError, match="must not be negative"):
+        Size.parse(value)
+
+def test_size_parse_signed():
+    with pytest.raises(ValueError, match="Unsupported or invalid size"):
+        Size.parse("+10g")
+
+def test_size_arithmetic():
+    a = Size.parse("1g")
+    b = Size.parse("512m")
+    assert a - b == b
+    assert b + b == a
+    assert b * 2 == a
+    assert a // b == 2
+    assert a > b
+    assert Size.parse("1000m").align_up(Size.parse("64m")) == Size.parse("1024m")
+    assert Size.parse("1000m").align_down(Size.parse("64m")) == Size.parse("960m")
+
+def test_size_format():
+    assert Size.parse("1g").format("MiB") == "1024MiB"
+    assert Size.parse("1m").format("s") == "2048s"
+    assert Size(1000).format("MiB") == "1000B"
+
+def test_size_immutable():
+    size = Size(1)
+    with pytest.raises(AttributeError):
+        size._bytes = 2
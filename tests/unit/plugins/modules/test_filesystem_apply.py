@@ -0,0 +1,59 @@
+import threading
+import time
+from ansible_collections.aursu.lvm_setup.plugins.modules.filesystem_apply import apply_jobs
+
+class FakeModule:
+    check_mode = False
+
+    def __init__(self, signatures, failing=()):
+        self.signatures = signatures
+        self.failing = set(failing)
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get_bin_path(self, name, required=False):
+        return f"/usr/sbin/{name}"
+
+    def run_command(self, cmd):
+        path = cmd[-1]
+        if cmd[0].endswith("blkid"):
+            fstype = self.signatures.get(path)
+            return (0, f"{fstype}\n", "") if fstype else (2, "", "")
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        if path in self.failing:
+            return 1, "", "device busy"
+        return 0, "", ""
+
+def job(num, fstype="xfs"):
+    return {"name": f"data{num}", "path": f"/dev/data/data{num}", "fstype": fstype}
+
+def test_concurrent_runs_are_capped():
+    module = FakeModule({})
+    jobs = [job(n) for n in range(1, 7)]
+
+    filesystems, errors = apply_jobs(module, "/usr/sbin/blkid", jobs, max_workers=3)
+
+    assert errors == {}
+    assert list(filesystems) == [j["path"] for j in jobs]
+    assert all(r["changed"] and r["rc"] == 0 and r["elapsed"] >= 0.05 for r in filesystems.values())
+    assert module.peak == 3
+
+def test_outcomes_per_volume():
+    module = FakeModule({"/dev/data/data2": "xfs", "/dev/data/data3": "ext4"}, failing={"/dev/data/data4"})
+    jobs = [job(1), job(2), job(3), job(4)]
+
+    filesystems, errors = apply_jobs(module, "/usr/sbin/blkid", jobs, max_workers=4)
+
+    assert filesystems["/dev/data/data1"]["changed"] is True
+    assert filesystems["/dev/data/data2"]["changed"] is False
+    assert errors == {
+        "/dev/data/data3": "/dev/data/data3 already contains a ext4 filesystem",
+        "/dev/data/data4": "mkfs.xfs failed on /dev/data/data4: device busy",
+    }
+    assert filesystems["/dev/data/data4"]["rc"] == 1
@@ -0,0 +1,69 @@
+import json
+import threading
+from ansible_collections.aursu.lvm_setup.plugins.modules.partition_apply import apply_plans
+
+class FakeModule:
+    check_mode = False
+
+    def __init__(self, tables, failing=()):
+        self.tables = tables
+        self.failing = set(failing)
+        self.commands = []
+        self.warnings = []
+        self.lock = threading.Lock()
+
+    def get_bin_path(self, name, required=False):
+        return f"/usr/sbin/{name}"
+
+    def warn(self, msg):
+        self.warnings.append(msg)
+
+    def run_command(self, cmd, data=None):
+        with self.lock:
+            self.commands.append(cmd)
+        device = cmd[-1]
+        if "--json" in cmd:
+            table = self.tables.get(device)
+            if table is None:
+                return 1, "", f"sfdisk: {device} does not contain a recognized partition table"
+            return 0, json.dumps({"partitiontable": table}), ""
+        if cmd[0].endswith("sfdisk") and device in self.failing:
+            return 1, "", "Device or resource busy"
+        return 0, "", ""
+
+def plan(num, start, end):
+    return {"num": num, "action": "create", "part_start": f"{start}s", "part_end": f"{end}s"}
+
+def test_all_disks_applied_and_errors_collected():
+    module = FakeModule(
+        tables={
+            "/dev/sdb": {"label": "gpt", "sectorsize": 512, "partitions": []},
+            "/dev/sdd": {"label": "gpt", "sectorsize": 512, "partitions": [{"node": "/dev/sdd1"}]},
+        },
+        failing={"/dev/sdc"},
+    )
+    plans = {
+        "/dev/sdb": [plan(1, 2048, 4095)],
+        "/dev/sdc": [plan(1, 2048, 4095)],
+        "/dev/sdd": [plan(1, 2048, 4095)],
+        "/dev/sde": [{"num": 1, "action": "skip"}],
+    }
+
+    disks, errors = apply_plans(module, "/usr/sbin/sfdisk", plans, max_workers=4)
+
+    assert errors == {"/dev/sdc": "sfdisk failed on /dev/sdc: Device or resource busy"}
+    assert disks["/dev/sdb"]["created"] == [1]
+    assert disks["/dev/sdb"]["script"] == "/dev/sdb1 : start=2048, size=2048, type=E6D6D379-F507-44C2-A23C-238F2A3DF928\n"
+    assert disks["/dev/sdd"]["changed"] is False
+    assert disks["/dev/sde"]["changed"] is False
+    assert "/dev/sdc" not in disks
+    # disks without anything to create are not touched
+    assert not any(cmd[-1] == "/dev/sde" for cmd in module.commands)
+
+def test_new_table_label():
+    module = FakeModule(tables={})
+    disks, errors = apply_plans(module, "/usr/sbin/sfdisk", {"/dev/sdb": [plan(1, 2048, 4095)]}, "msdos")
+
+    assert errors == {}
+    assert disks["/dev/sdb"]["label"] == "msdos"
+    assert ["/usr/sbin/sfdisk", "--no-reread", "--no-tell-kernel", "--label", "dos", "/dev/sdb"] in module.commands
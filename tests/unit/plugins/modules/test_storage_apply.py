@@ -0,0 +1,258 @@
+import json
+import shlex
+import pytest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils import storage_engine
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.lvm_apply import REPORT_OPTIONS
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.storage_engine import EngineError, StorageEngine
+
+MIB = 2048  # sectors
+
+PARTITIONS = {"/dev/sdb": [{"num": 1, "size": 1024}, {"num": 2}]}
+VOLUMES = [
+    {"name": "data1", "vg": "data", "size": "512m", "filesystem": "xfs", "mountpoint": "/mnt/data1"},
+    {"name": "data2", "vg": "data", "size": "100%FREE"},
+]
+
+class FakeModule:
+    def __init__(self, check_mode=False):
+        self.check_mode = check_mode
+        self.commands = []
+        self.shell = []
+
+    def get_bin_path(self, name, required=False):
+        return f"/usr/sbin/{name}"
+
+    def warn(self, msg):
+        pass
+
+    def run_command(self, cmd, data=None, environ_update=None):
+        self.commands.append(cmd)
+        if "--json" in cmd:
+            return 1, "", f"sfdisk: {cmd[-1]} does not contain a recognized partition table"
+        if data is not None and cmd == ["/usr/sbin/lvm"]:
+            # lvm shell: one successful command log per command
+            log = json.dumps({"log": [{"log_type": "status", "log_object_type": "cmd", "log_ret_code": "1"}]})
+            lines = [line for line in data.splitlines() if line != "exit"]
+            self.shell.extend(shlex.split(line) for line in lines)
+            return 0, "\n".join(f"lvm> {log}" for _ in lines), ""
+        return 0, "", ""
+
+    def atomic_move(self, src, dest):
+        raise AssertionError("fstab must not be written")
+
+def empty_disk(device, unit):
+    return {
+        "disk": {"dev": device, "size": 4096 * MIB, "unit": "s", "table": "unknown", "logical_block": 512},
+        "partitions": [],
+    }
+
+@pytest.fixture
+def fresh_host(monkeypatch, tmp_path):
+    mountinfo = tmp_path / "mountinfo"
+    mountinfo.write_text("")
+    monkeypatch.setattr(storage_engine, "MOUNTINFO", str(mountinfo))
+    monkeypatch.setattr(storage_engine, "disk_info", empty_disk)
+    monkeypatch.setattr(storage_engine, "probe_devices", lambda module, paths: {p: {"is_exists": False} for p in paths})
+    monkeypatch.setattr(storage_engine, "lvm_fullreport", lambda module, lvm, vgs: {"pv": [], "vg": [], "lv": [], "seg": []})
+    return tmp_path
+
+def test_check_mode_plans_every_phase(fresh_host):
+    module = FakeModule(check_mode=True)
+    engine = StorageEngine(module, PARTITIONS, "data", VOLUMES, fstab=str(fresh_host / "fstab"))
+
+    result = engine.run()
+    phases = result["phases"]
+
+    assert result["changed"] is True
+    assert list(phases) == ["partitions", "pvs", "volumes", "filesystems", "mounts"]
+    assert all(isinstance(p["elapsed"], float) for p in phases.values())
+    assert phases["partitions"]["disks"]["/dev/sdb"]["created"] == [1, 2]
+    assert phases["pvs"]["commands"] == [
+        ["pvcreate", "/dev/sdb1", "/dev/sdb2"],
+        ["vgcreate", "data", "/dev/sdb1", "/dev/sdb2"],
+    ]
+    assert [p["action"] for p in phases["volumes"]["plan"]] == ["create", "create"]
+    assert list(phases["filesystems"]["filesystems"]) == ["/dev/data/data1"]
+    assert phases["mounts"]["fstab"] == ["/mnt/data1"]
+    assert phases["mounts"]["mounted"] == ["/mnt/data1"]
+    # only the partition tables were read
+    assert all("--json" in cmd for cmd in module.commands)
+
+def test_apply_runs_lvm_commands(fresh_host, monkeypatch):
+    module = FakeModule()
+    # partitions are block devices once created
+    monkeypatch.setattr(storage_engine, "probe_devices", lambda module, paths: {
+        p: {"is_exists": True, "filetype": "b"} if p.startswith("/dev/sdb") else {"is_exists": False} for p in paths
+    })
+    # the volume group exists once vgcreate ran
+    created = {"vg": [{"vg_name": "data", "vg_size": "4092.00m", "vg_free": "4092.00m", "vg_extent_size": "4.00m"}],
+               "pv": [{"pv_name": "/dev/sdb1", "vg_name": "data"}, {"pv_name": "/dev/sdb2", "vg_name": "data"}],
+               "lv": [], "seg": []}
+    monkeypatch.setattr(storage_engine, "lvm_fullreport", lambda module, lvm, vgs: created if any(
+        "vgcreate" in cmd for cmd in module.commands) else {"pv": [], "vg": [], "lv": [], "seg": []})
+    volumes = [{"name": "data1", "vg": "data", "size": "512m"}, {"name": "data2", "vg": "data", "size": "1g"}]
+    engine = StorageEngine(module, PARTITIONS, "data", volumes)
+
+    result = engine.run()
+
+    # pvcreate and vgcreate ran on their own, both lvcreates in one lvm shell session
+    lvm = [cmd[1:] for cmd in module.commands if cmd[0] == "/usr/sbin/lvm"]
+    assert lvm == [["pvcreate", "/dev/sdb1", "/dev/sdb2"], ["vgcreate", "data", "/dev/sdb1", "/dev/sdb2"], []]
+    shell = [[args[0]] + args[1 + len(REPORT_OPTIONS):] for args in module.shell]
+    assert shell == [["lvcreate", "--yes", "-n", "data1", "-L", "512m", "data"],
+                     ["lvcreate", "--yes", "-n", "data2", "-L", "1g", "data"]]
+    assert [r["ok"] for r in result["phases"]["pvs"]["lvm"]] == [True, True]
+    assert [r["ok"] for r in result["phases"]["volumes"]["lvm"]] == [True, True]
+    assert ["/usr/sbin/udevadm", "settle", "--timeout=120"] in module.commands
+
+def test_apply_without_lvm_shell(fresh_host, monkeypatch):
+    module = FakeModule()
+    monkeypatch.setattr(storage_engine, "probe_devices", lambda module, paths: {p: {"is_exists": True, "filetype": "b"} for p in paths})
+
+    StorageEngine(module, PARTITIONS, "data", lvm_shell=False).run()
+
+    lvm = [cmd[1:] for cmd in module.commands if cmd[0] == "/usr/sbin/lvm"]
+    assert lvm == [["pvcreate", "/dev/sdb1", "/dev/sdb2"], ["vgcreate", "data", "/dev/sdb1", "/dev/sdb2"]]
+
+def test_failed_phase_keeps_finished_phases(fresh_host):
+    module = FakeModule(check_mode=True)
+    engine = StorageEngine(module, volumes=VOLUMES)
+
+    with pytest.raises(EngineError, match="Volume group 'data' not found") as e:
+        engine.run()
+
+    assert e.value.phase == "volumes"
+    assert list(engine.phases) == ["volumes"]
+
+def test_input_errors_are_raised_before_any_phase():
+    with pytest.raises(EngineError, match="expected 'other'") as e:
+        StorageEngine(FakeModule(), vg_name="other", volumes=VOLUMES)
+    assert e.value.phase == "input"
+
+    with pytest.raises(EngineError, match="'vg_name' is required"):
+        StorageEngine(FakeModule(), partitions=PARTITIONS)
+
+class GraphModule(FakeModule):
+    def __init__(self, failing=()):
+        super().__init__()
+        self.failing = set(failing)
+
+    def run_command(self, cmd, data=None, environ_update=None):
+        rc, out, err = super().run_command(cmd, data, environ_update)
+        if cmd[-1] in self.failing or any(arg in self.failing for arg in cmd):
+            return 5, "", "Volume group \"data\" has insufficient free space"
+        return rc, out, err
+
+    def atomic_move(self, src, dest):
+        import os
+        os.replace(src, dest)
+
+def graph_volumes(tmp_path):
+    volumes = [dict(v, mountpoint=str(tmp_path / v["name"])) if "mountpoint" in v else v for v in VOLUMES]
+    # before the '100%FREE' volume, which takes the space left
+    volumes.insert(1, {"name": "data3", "vg": "data", "size": "2g", "filesystem": "ext4", "mountpoint": str(tmp_path / "data3")})
+    return volumes
+
+def test_graph_dependencies(fresh_host):
+    volumes = graph_volumes(fresh_host)
+    engine = StorageEngine(FakeModule(check_mode=True), PARTITIONS, "data", volumes, fstab=str(fresh_host / "fstab"))
+
+    result = engine.run_graph()
+    graph = {op["name"]: op for op in result["phases"]["apply"]["graph"]}
+
+    assert "operations" not in result["phases"]["apply"]
+    assert graph["udev_settle"]["deps"] == ["partition:/dev/sdb"]
+    assert graph["lvm:pvcreate"]["deps"] == ["udev_settle"]
+    assert graph["lvm:vgcreate"]["deps"] == ["lvm:pvcreate"]
+    assert graph["lvcreate:/dev/data/data1"]["deps"] == ["lvm:vgcreate"]
+    assert graph["lvcreate:/dev/data/data3"] == {
+        "name": "lvcreate:/dev/data/data3", "deps": ["lvcreate:/dev/data/data1"], "cost": 1.0, "lock": "lvm",
+    }
+    assert graph["lvcreate:/dev/data/data2"]["deps"] == ["lvcreate:/dev/data/data3"]
+    assert graph["mkfs:/dev/data/data3"]["cost"] == 2048
+    target = str(fresh_host / "data3")
+    assert graph[f"mount:{target}"]["deps"] == [f"mkdir:{target}", "fstab", "mkfs:/dev/data/data3"]
+
+def test_graph_orders_nested_mountpoints(fresh_host, monkeypatch):
+    monkeypatch.setattr(storage_engine, "probe_devices", lambda module, paths: {p: {"is_exists": True, "filetype": "b"} for p in paths})
+    srv, data = str(fresh_host / "srv"), str(fresh_host / "srv" / "data")
+    volumes = [
+        {"name": "data1", "vg": "data", "size": "512m", "filesystem": "xfs", "mountpoint": data},
+        {"name": "data2", "vg": "data", "size": "1g", "filesystem": "xfs", "mountpoint": srv},
+    ]
+    module = GraphModule()
+    engine = StorageEngine(module, PARTITIONS, "data", volumes, fstab=str(fresh_host / "fstab"))
+
+    result = engine.run_graph(max_workers=4)
+    graph = {op["name"]: op for op in result["phases"]["apply"]["graph"]}
+
+    assert graph[f"mkdir:{srv}"]["deps"] == []
+    assert graph[f"mkdir:{data}"]["deps"] == [f"mount:{srv}"]
+    assert graph[f"mount:{data}"]["deps"] == [f"mkdir:{data}", f"mount:{srv}", "fstab", "mkfs:/dev/data/data1"]
+    mounts = [cmd[-1] for cmd in module.commands if cmd[0] == "/usr/sbin/mount"]
+    assert mounts == [srv, data]
+
+def test_graph_failure_stops_dependent_operations(fresh_host, monkeypatch):
+    monkeypatch.setattr(storage_engine, "probe_devices", lambda module, paths: {p: {"is_exists": True, "filetype": "b"} for p in paths})
+    volumes = graph_volumes(fresh_host)
+    module = GraphModule(failing={"data3"})
+    engine = StorageEngine(module, PARTITIONS, "data", volumes, fstab=str(fresh_host / "fstab"))
+
+    with pytest.raises(EngineError, match=r"1 of \d+ operations failed: lvcreate:/dev/data/data3") as e:
+        engine.run_graph(max_workers=4)
+
+    assert e.value.phase == "apply"
+    operations = engine.phases["apply"]["operations"]
+    target = str(fresh_host / "data3")
+    assert operations["mkfs:/dev/data/data3"] == {"status": "skipped", "blocked_by": "lvcreate:/dev/data/data3"}
+    assert operations["lvcreate:/dev/data/data2"] == {"status": "skipped", "blocked_by": "lvcreate:/dev/data/data3"}
+    assert operations[f"mount:{target}"]["status"] == "skipped"
+    assert operations[f"mkdir:{target}"]["status"] == "ok"
+    assert operations["mkfs:/dev/data/data1"]["status"] == "ok"
+    assert ["/usr/sbin/mkfs.xfs", "/dev/data/data1"] in module.commands
+    assert (fresh_host / "fstab").read_text().count("\n") == 2
+
+def test_graph_creates_volumes_in_input_order(fresh_host, monkeypatch):
+    monkeypatch.setattr(storage_engine, "probe_devices", lambda module, paths: {p: {"is_exists": True, "filetype": "b"} for p in paths})
+    volumes = [
+        {"name": "rest", "vg": "data", "size": "100%FREE", "filesystem": "xfs"},
+        {"name": "half", "vg": "data", "size": "50%FREE"},
+        {"name": "small", "vg": "data", "size": "1g", "filesystem": "ext4"},
+    ]
+    # the '%FREE' volumes have the largest mkfs cost but must not be created before the ones listed first
+    volumes = volumes[2:] + volumes[1:2] + volumes[:1]
+    module = GraphModule()
+    engine = StorageEngine(module, PARTITIONS, "data", volumes, fstab=str(fresh_host / "fstab"))
+
+    engine.run_graph(max_workers=4)
+
+    lvcreates = [cmd[4] for cmd in module.commands if cmd[:2] == ["/usr/sbin/lvm", "lvcreate"]]
+    assert lvcreates == ["small", "half", "rest"]
+
+def test_graph_plans_volumes_on_extended_group(fresh_host, monkeypatch):
+    monkeypatch.setattr(storage_engine, "probe_devices", lambda module, paths: {
+        p: {"is_exists": True, "filetype": "b"} if p.startswith("/dev/sd") else {"is_exists": False} for p in paths
+    })
+    existing = {"vg": [{"vg_name": "data", "vg_size": "1024.00m", "vg_free": "1024.00m", "vg_extent_size": "4.00m"}],
+                "pv": [{"pv_name": "/dev/sda1", "vg_name": "data", "pv_size": "1024.00m", "pv_free": "1024.00m"}],
+                "lv": [], "seg": []}
+    monkeypatch.setattr(storage_engine, "lvm_fullreport", lambda module, lvm, vgs: existing)
+    # neither fits into the 1 GiB the volume group has before the new partitions are added
+    volumes = [
+        {"name": "data1", "vg": "data", "size": "512m"},
+        {"name": "data2", "vg": "data", "size": "2g"},
+        {"name": "data3", "vg": "data", "size": "100%FREE", "filesystem": "xfs"},
+    ]
+    engine = StorageEngine(FakeModule(check_mode=True), PARTITIONS, "data", volumes, fstab=str(fresh_host / "fstab"))
+
+    result = engine.run_graph()
+
+    assert result["phases"]["pvs"]["commands"][-1] == ["vgextend", "data", "/dev/sdb1", "/dev/sdb2"]
+    assert [entry["action"] for entry in result["phases"]["volumes"]["plan"]] == ["create"] * 3
+    graph = {op["name"]: op for op in result["phases"]["apply"]["graph"]}
+    # '100%FREE' costs the free space of the group and of the new partitions on the 4 GiB disk
+    assert 5000 < graph["mkfs:/dev/data/data3"]["cost"] <= 5120
+
+    # sequential check mode plans the same way
+    engine = StorageEngine(FakeModule(check_mode=True), PARTITIONS, "data", volumes, fstab=str(fresh_host / "fstab"))
+    assert engine.run()["phases"]["volumes"]["plan"] == result["phases"]["volumes"]["plan"]
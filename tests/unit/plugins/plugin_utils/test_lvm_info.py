@@ -0,0 +1,53 @@
+import unittest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import LvmInfo, VolumeGroup
+
+class TestLvmInfo(unittest.TestCase):
+    def setUp(self):
+        self.raw = {
+            "pv": [
+                {"pv_name": "/dev/sda6", "vg_name": "data"},
+                {"pv_name": "/dev/sdb6", "vg_name": "data"},
+                {"pv_name": "/dev/sdc6", "vg_name": "other"},
+                {"pv_name": "/dev/sdd6", "vg_name": ""},
+            ],
+            "vg": [
+                {"vg_name": "data", "vg_free": "1024.00m"},
+                {"vg_name": "other", "vg_free": "0m"},
+            ],
+            "lv": [
+                {"lv_name": "data1", "vg_name": "data", "lv_size": "512.00m"},
+                {"lv_name": "data1", "vg_name": "other", "lv_size": "256.00m"},
+                {"lv_name": "data2", "vg_name": "data", "lv_size": "512.00m"},
+            ],
+        }
+        self.lvm = LvmInfo(self.raw)
+
+    def test_invalid_payload(self):
+        with self.assertRaisesRegex(AnsibleFilterError, "Expected LVM information 'lvm_info' to be a dictionary"):
+            LvmInfo("invalid")
+
+    def test_from_lvm_info_reuses_object(self):
+        self.assertIs(LvmInfo.from_lvm_info(self.lvm), self.lvm)
+
+    def test_lookups(self):
+        self.assertEqual(self.lvm.pv("/dev/sdb6")["vg_name"], "data")
+        self.assertIsNone(self.lvm.pv("/dev/sde6"))
+        self.assertEqual(self.lvm.vg("other")["vg_free"], "0m")
+        self.assertEqual(self.lvm.lv("other", "data1"), (1, self.raw["lv"][1]))
+        self.assertIsNone(self.lvm.lv("data", "data3"))
+
+    def test_group_members(self):
+        self.assertEqual(self.lvm.vg_pv_names("data"), ["/dev/sda6", "/dev/sdb6"])
+        self.assertEqual(self.lvm.vg_lv_names("data"), ["data1", "data2"])
+        self.assertEqual(self.lvm.vg_pv_names("missing"), [])
+
+    def test_volume_group_from_lvm_info(self):
+        vg = VolumeGroup.from_lvm_info("data", self.lvm)
+        self.assertTrue(vg.is_exists)
+        self.assertEqual(sorted(vg.pvs), ["/dev/sda6", "/dev/sdb6"])
+        self.assertEqual(vg.lvs["data1"].size, "512.00m")
+        self.assertIs(vg.lvm_info, self.lvm)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import pytest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.memo import canonical_hash, memoize
+from ansible_collections.aursu.lvm_setup.plugins.filter.partition_paths_system import partition_paths_system
+
+def test_canonical_hash():
+    assert canonical_hash({"a": 1, "b": [1, 2]}) == canonical_hash(dict(a=1, b=[1, 2]))
+    # results follow input order, so key order is significant
+    assert canonical_hash({"a": 1, "b": [1, 2]}) != canonical_hash({"b": [1, 2], "a": 1})
+    assert canonical_hash({"a": 1}) != canonical_hash({"a": True})
+    with pytest.raises(TypeError):
+        canonical_hash({"a": object()})
+
+def test_repeated_calls_are_cached():
+    calls = []
+
+    @memoize(maxsize=2)
+    def paths(disk, parts):
+        calls.append(disk)
+        return [f"{disk}{p['num']}" for p in parts]
+
+    assert paths("/dev/sda", [{"num": 1}]) == ["/dev/sda1"]
+    assert paths("/dev/sda", [{"num": 1}]) == ["/dev/sda1"]
+    assert calls == ["/dev/sda"]
+    assert paths.cache_info()["hits"] == 1
+
+    # results are copies; mutating one does not change the cache
+    paths("/dev/sda", [{"num": 1}]).append("/dev/sda2")
+    assert paths("/dev/sda", [{"num": 1}]) == ["/dev/sda1"]
+
+def test_eviction_of_least_recently_used():
+    calls = []
+
+    @memoize(maxsize=2)
+    def double(x):
+        calls.append(x)
+        return x * 2
+
+    double(1)
+    double(2)
+    double(1)
+    double(3)  # evicts 2
+    double(1)
+    double(2)
+    assert calls == [1, 2, 3, 2]
+    assert double.cache_info()["size"] == 2
+
+def test_errors_and_unhashable_arguments_are_not_cached():
+    calls = []
+
+    @memoize()
+    def check(value):
+        calls.append(value)
+        if value is None:
+            raise AnsibleFilterError("invalid")
+        return True
+
+    for _ in range(2):
+        with pytest.raises(AnsibleFilterError):
+            check(None)
+    marker = object()
+    check(marker)
+    check(marker)
+    assert calls == [None, None, marker, marker]
+
+def test_filters_are_memoized():
+    partition_paths_system.cache_clear()
+    partitions = {"/dev/sda": [{"num": 6, "size": "1g"}], "/dev/nvme0n1": [{"num": 1, "size": "1g"}]}
+    first = partition_paths_system(partitions)
+    assert partition_paths_system(dict(partitions)) == first
+    assert partition_paths_system(dict(reversed(list(partitions.items())))) == ",".join(reversed(first.split(",")))
+    assert partition_paths_system.cache_info() == {"hits": 1, "misses": 2, "size": 2, "maxsize": 256}
@@ -0,0 +1,95 @@
+import os
+import pytest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils import plan_cache
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.plan_cache import (
+    PlanCache,
+    all_skip,
+    cached_plan,
+    fingerprint,
+)
+from ansible_collections.aursu.lvm_setup.plugins.filter.validate_pvs import validate_pvs
+
+def test_fingerprint_ignores_volatile_fields():
+    state = {"pv": [{"pv_name": "/dev/sda5", "vg_name": "data"}], "changed": False, "invocation": {"x": 1}}
+    other = {"pv": [{"pv_name": "/dev/sda5", "vg_name": "data"}], "changed": True}
+    assert fingerprint("validate_pvs", state, ["/dev/sda5"]) == fingerprint("validate_pvs", other, ["/dev/sda5"])
+
+    dev = {"is_exists": True, "stat": {"rdev": 2053, "atime": 1.0, "mtime": 2.0}}
+    assert fingerprint("v", dev) == fingerprint("v", {"is_exists": True, "stat": {"rdev": 2053, "atime": 5.0}})
+
+def test_fingerprint_depends_on_state_and_kind():
+    state = {"pv": [{"pv_name": "/dev/sda5", "vg_name": "data"}]}
+    assert fingerprint("validate_pvs", state, ["/dev/sda5"]) != fingerprint("validate_pvs", state, ["/dev/sda6"])
+    assert fingerprint("validate_pvs", state) != fingerprint("validate_volumes", state)
+
+def test_lru_eviction(tmp_path):
+    cache = PlanCache(str(tmp_path), max_entries=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    os.utime(tmp_path / "a.json", (1, 1))
+    os.utime(tmp_path / "b.json", (2, 2))
+
+    # a hit makes "a" the most recently used entry
+    assert cache.get("a") == [1]
+    cache.put("c", [3])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1]
+    assert cache.get("c") == [3]
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = PlanCache(str(tmp_path))
+    (tmp_path / "a.json").write_text("{not json")
+    assert cache.get("a") is None
+    assert not (tmp_path / "a.json").exists()
+
+def test_cached_filter(tmp_path):
+    calls = []
+
+    @cached_plan("test")
+    def planner(state, paths):
+        calls.append(paths)
+        return [{"path": p, "action": "skip"} for p in paths]
+
+    assert planner({"pv": []}, ["/dev/sda5"], cache_dir=str(tmp_path)) == [{"path": "/dev/sda5", "action": "skip"}]
+    assert planner({"pv": [], "changed": True}, ["/dev/sda5"], cache_dir=str(tmp_path)) == [{"path": "/dev/sda5", "action": "skip"}]
+    assert planner({"pv": []}, ["/dev/sda6"], cache_dir=str(tmp_path))[0]["path"] == "/dev/sda6"
+    assert calls == [["/dev/sda5"], ["/dev/sda6"]]
+
+    # no cache directory: always planned
+    planner({"pv": []}, ["/dev/sda5"])
+    assert len(calls) == 3
+
+def test_plans_of_previous_version_are_not_reused(tmp_path, monkeypatch):
+    calls = []
+
+    @cached_plan("test")
+    def planner(state):
+        calls.append(plan_cache.CACHE_VERSION)
+        return {"name": "data1", "action": "skip", "version": plan_cache.CACHE_VERSION}
+
+    monkeypatch.setattr(plan_cache, "CACHE_VERSION", plan_cache.CACHE_VERSION - 1)
+    stale = planner({"lv": []}, cache_dir=str(tmp_path))
+    monkeypatch.undo()
+
+    assert planner({"lv": []}, cache_dir=str(tmp_path)) != stale
+    assert calls == [plan_cache.CACHE_VERSION - 1, plan_cache.CACHE_VERSION]
+
+def test_validate_pvs_cache(tmp_path):
+    lvm_info = {"pv": [{"pv_name": "/dev/sda5", "vg_name": "vg_main"}]}
+    first = validate_pvs(lvm_info, ["/dev/sda5"], "vg_main", cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert validate_pvs(lvm_info, ["/dev/sda5"], "vg_main", cache_dir=str(tmp_path)) == first
+
+    # failures are not cached
+    lvm_info = {"pv": [{"pv_name": "/dev/sda5", "vg_name": "other"}]}
+    with pytest.raises(AnsibleFilterError):
+        validate_pvs(lvm_info, ["/dev/sda5"], "vg_main", cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+def test_all_skip():
+    assert all_skip({"name": "data1", "action": "skip"})
+    assert all_skip({"/dev/sda": [{"num": 1, "action": "skip"}], "/dev/sdb": []})
+    assert not all_skip([{"path": "/dev/sda5", "action": "skip"}, {"path": "/dev/sdb5", "action": "add"}])
+    assert not all_skip({"/dev/sda": [{"num": 1, "action": "create"}]})
@@ -15,5 +15,22 @@ class TestDiskSetSize(unittest.TestCase):
     def test_prev_next_lookup(self):
         self.assertEqual(self.dev.prev_next_lookup(self.state, 1), (None, None))
 
+    def test_prev_next_lookup_neighbours(self):
+        parted_info = {
+            "disk": {"size": 8192.0, "dev": "/dev/sda"},
+            "partitions": [
+                {"num": 5, "begin": 4096.0, "end": 5120.0, "size": 1024.0},
+                {"num": 1, "begin": 1.0, "end": 1024.0, "size": 1023.0},
+                {"num": 3, "begin": 2048.0, "end": 3072.0, "size": 1024.0},
+            ]
+        }
+        state = Disk.from_parted(parted_info)
+        nums = lambda pair: tuple(p.num if p else None for p in pair)
+
+        self.assertEqual(nums(self.dev.prev_next_lookup(state, 2)), (1, 3))
+        self.assertEqual(nums(self.dev.prev_next_lookup(state, 3)), (1, 5))
+        self.assertEqual(nums(self.dev.prev_next_lookup(state, 6)), (5, None))
+        self.assertEqual(nums(self.dev.prev_next_lookup(state, 1)), (None, 3))
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from ansible_collections.aursu.lvm_setup.plugins.module_utils.size_utils import Size
 from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import Disk
 
 class TestDiskSetSize(unittest.TestCase):
@@ -11,7 +12,8 @@ class TestDiskSetSize(unittest.TestCase):
     
     def test_size(self):
         self.assertEqual(self.state._size, 4096.0)
-        self.assertEqual(self.state.size, 4096.0)
+        self.assertEqual(self.state.size, Size(4096 * 1024 * 1024))
+        self.assertEqual(self.state.size.mib, 4096.0)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import Disk, Partition
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import Device, LogicalVolume, PhysicalVolume
+
+
+class TestSlots(unittest.TestCase):
+    """Planning objects are slotted and keep no per-instance dictionary."""
+
+    def test_no_instance_dict(self):
+        objects = [
+            Partition({"num": 1, "size": 100}, idx=0, disk="/dev/sda"),
+            Disk("/dev/sda", [{"num": 1, "size": 100}]),
+            Device("/dev/sda1"),
+            PhysicalVolume("/dev/sda1"),
+            LogicalVolume({"name": "data1", "vg": "data", "size": "10g"}, 0),
+        ]
+        for obj in objects:
+            with self.subTest(cls=type(obj).__name__):
+                self.assertFalse(hasattr(obj, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    obj.unknown = True
+
+
+class TestLazyErrorContext(unittest.TestCase):
+    """Error context is built from the stored index, disk and unit when an error is raised."""
+
+    def test_partition_num(self):
+        with self.assertRaisesRegex(AnsibleFilterError, r"'num' must be an integer in partition #3 for disk '/dev/sdb'\. Got: x \(invalid literal"):
+            Partition({"num": "x"}, idx=2, disk="/dev/sdb")
+
+    def test_partition_missing_num(self):
+        with self.assertRaisesRegex(AnsibleFilterError, r"^Missing 'num' field\.$"):
+            Partition({})
+
+    def test_partition_begin(self):
+        part = Partition({"num": 1, "begin": "abc", "unit": "s"}, idx=0, disk="/dev/sda")
+        with self.assertRaisesRegex(
+            AnsibleFilterError, r"'begin' field to MiB for partition #1 for disk '/dev/sda'\. Got: abc in 's'"
+        ):
+            part.validate_begin()
+
+    def test_partition_size_explicit_context(self):
+        part = Partition({"num": 1, "size": -1}, idx=0, disk="/dev/sda")
+        with self.assertRaisesRegex(AnsibleFilterError, r"^Expected positive 'size' field in 'MiB' here\. Got: -1$"):
+            part._assert_size("size", part._size, part.size, context=" here")
+
+    def test_logical_volume(self):
+        with self.assertRaisesRegex(AnsibleFilterError, r"Missing 'size' \(and 'lv_size'\) field in logical volume #2\."):
+            LogicalVolume({"name": "data1", "vg": "data"}, 1)
+
+    def test_logical_volume_no_index(self):
+        with self.assertRaisesRegex(AnsibleFilterError, r"^Volume entry must be a dictionary\. Found: x$"):
+            LogicalVolume("x")
+
+
+if __name__ == '__main__':
+    unittest.main()
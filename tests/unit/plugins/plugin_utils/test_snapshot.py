@@ -0,0 +1,76 @@
+import unittest
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.disks_helpers import Disk, Partition
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.lvm_helpers import Device, LogicalVolume
+
+
+class TestDiskSnapshot(unittest.TestCase):
+    def setUp(self):
+        parted_info = {
+            "disk": {"size": 4096.0, "dev": "/dev/sda", "table": "gpt", "unit": "mib"},
+            "partitions": [
+                {"num": 1, "begin": 1.0, "end": 1025.0, "size": 1024.0},
+                {"num": 3, "begin": 2049.0, "end": 3073.0, "size": 1024.0},
+            ],
+        }
+        self.state = Disk.from_parted(parted_info)
+
+    def test_shares_partitions(self):
+        snap = self.state.snapshot()
+        self.assertIsNot(snap, self.state)
+        self.assertIs(snap.parts_by_num(1), self.state.parts_by_num(1))
+        self.assertEqual(snap.size, self.state.size)
+        self.assertEqual(snap.table, "gpt")
+        self.assertIsNone(snap.state)
+
+    def test_add_part_copies_on_write(self):
+        snap = self.state.snapshot()
+        snap.add_part(Partition({"num": 2, "begin": 1025.0, "end": 2049.0}, disk="/dev/sda"))
+
+        self.assertEqual([p.num for p in snap.sorted_parts()], [1, 2, 3])
+        self.assertEqual([p.num for p in self.state.sorted_parts()], [1, 3])
+        self.assertEqual(len(self.state.free_extents()), len(snap.free_extents()) + 1)
+
+    def test_original_write_does_not_leak(self):
+        snap = self.state.snapshot()
+        self.state.add_part(Partition({"num": 4}, disk="/dev/sda"))
+
+        self.assertEqual([p.num for p in snap.sorted_parts()], [1, 3])
+
+    def test_repeated_plan(self):
+        req = Disk("/dev/sda", [{"num": n, "size": 512.0} for n in (1, 2, 3, 4)])
+        req.set_state_disk(self.state)
+
+        first = req.plan()
+        self.assertEqual([p["action"] for p in first], ["skip", "create", "skip", "create"])
+        self.assertEqual(req.plan(), first)
+        self.assertEqual([p.num for p in req.state.sorted_parts()], [1, 3])
+        self.assertEqual([p.num for p in self.state.sorted_parts()], [1, 3])
+
+
+class TestLogicalVolumeSnapshot(unittest.TestCase):
+    def test_snapshot(self):
+        lv = LogicalVolume({"lv_name": "data1", "vg_name": "data", "lv_size": "10.00g"}, 0)
+        lv.attach_device(Device.from_dev_info("/dev/data/data1", {"is_exists": True, "blkid": {"type": "xfs"}}))
+        lv.state = LogicalVolume({"lv_name": "data1", "vg_name": "data", "lv_size": "10.00g"}, 0)
+
+        snap = lv.snapshot()
+        self.assertIsNot(snap, lv)
+        self.assertIsNone(snap.state)
+        self.assertIs(snap.raw_data, lv.raw_data)
+        self.assertEqual((snap.name, snap.vg, snap.size, snap.index), ("data1", "data", "10.00g", 0))
+        self.assertTrue(snap.is_exists)
+        self.assertIs(snap._device, lv._device)
+
+    def test_set_state(self):
+        req = LogicalVolume({"name": "data1", "vg": "data", "size": "10g", "filesystem": "xfs"}, 0)
+        state = LogicalVolume({"lv_name": "data1", "vg_name": "data", "lv_size": "10.00g"}, 0)
+        state.attach_device(Device.from_dev_info("/dev/data/data1", {"is_exists": True, "blkid": {"type": "xfs"}}))
+
+        req.set_state(state)
+        self.assertIsNot(req.state, state)
+        self.assertTrue(req.state.has_filesystem())
+        self.assertEqual(req.state.size, "10.00g")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from ansible.errors import AnsibleFilterError
+from ansible_collections.aursu.lvm_setup.plugins.plugin_utils.validation import ValidationErrors
+
+
+def fail(message):
+    raise AnsibleFilterError(message)
+
+
+class TestValidationErrors(unittest.TestCase):
+    def test_no_errors(self):
+        errors = ValidationErrors()
+        self.assertTrue(errors.collect(lambda: None))
+        self.assertFalse(errors)
+        self.assertIsNone(errors.report())
+        errors.raise_if_any()
+
+    def test_single_error(self):
+        errors = ValidationErrors()
+        self.assertFalse(errors.collect(fail, "broken"))
+        with self.assertRaisesRegex(AnsibleFilterError, r"^broken$"):
+            errors.raise_if_any()
+
+    def test_report(self):
+        errors = ValidationErrors("'volumes'")
+        errors.collect(fail, "first")
+        errors.add("second")
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors.messages, ["first", "second"])
+        self.assertEqual(errors.report(), "Found 2 errors in 'volumes':\n  - first\n  - second")
+
+    def test_other_exceptions_propagate(self):
+        errors = ValidationErrors()
+        with self.assertRaises(ValueError):
+            errors.collect(int, "x")
+
+
+if __name__ == '__main__':
+    unittest.main()